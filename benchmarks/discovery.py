@@ -0,0 +1,99 @@
+"""
+Measures how long it takes to find the test modules in a large tree of folders.
+
+Compares the old os.walk-based discovery (which listed each folder again to check
+whether it was a package, and called realpath and isfile on every file) with the
+current FileSystem-based one, with and without background scanning.
+
+Usage: python benchmarks/discovery.py
+"""
+import os
+import shutil
+import tempfile
+import time
+from contexts import discovery
+from contexts.core import TestRun, PluginComposite
+from contexts.plugins.identification import NameBasedIdentifier
+from contexts.plugin_interface import TEST_FOLDER, TEST_FILE
+
+
+def old_ispackage(directory):
+    return "__init__.py" in os.listdir(directory)
+
+
+def old_get_package_specification(directory):
+    current_parent = os.path.dirname(directory)
+    package_names = [os.path.basename(directory)]
+    while old_ispackage(current_parent):
+        dirpath, current_parent = current_parent, os.path.dirname(current_parent)
+        package_names.append(os.path.basename(dirpath))
+    return current_parent, '.'.join(reversed(package_names))
+
+
+def old_find_module_specs(directory, plugin_composite):
+    specs = []
+    for folder, dirnames, _ in os.walk(directory):
+        dirnames[:] = [d for d in dirnames
+                       if plugin_composite.identify_folder(os.path.realpath(os.path.join(folder, d))) is TEST_FOLDER]
+        if old_ispackage(folder):
+            folder = os.path.realpath(folder)
+            location, package_name = old_get_package_specification(folder)
+            prefix = package_name + '.'
+            specs.extend(discovery.get_parent_package_specs(location, package_name))
+        else:
+            location, prefix = folder, ''
+        for filename in os.listdir(folder):
+            full_path = os.path.realpath(os.path.join(folder, filename))
+            if not os.path.isfile(full_path) or filename == '__init__.py':
+                continue
+            if plugin_composite.identify_file(full_path) is TEST_FILE:
+                specs.append((location, prefix + os.path.splitext(filename)[0]))
+    return specs
+
+
+def make_tree(root, depth, width, files):
+    if depth == 0:
+        return
+    for i in range(width):
+        folder = os.path.join(root, 'test_package_{}'.format(i))
+        os.mkdir(folder)
+        open(os.path.join(folder, '__init__.py'), 'w').close()
+        for j in range(files):
+            open(os.path.join(folder, 'test_module_{}.py'.format(j)), 'w').close()
+        make_tree(folder, depth - 1, width, files)
+
+
+def measure(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        make_tree(root, depth=4, width=6, files=8)
+        plugin_composite = PluginComposite([NameBasedIdentifier()])
+
+        old = measure(lambda: old_find_module_specs(root, plugin_composite))
+        new = measure(lambda: TestRun(root, plugin_composite).find_module_specs(root))
+
+        def threaded():
+            test_run = TestRun(root, plugin_composite)
+            test_run.file_system = discovery.FileSystem(threads=8)
+            test_run.find_module_specs(root)
+        new_threaded = measure(threaded)
+
+        print("old:              {:.1f} ms".format(old * 1000))
+        print("new:              {:.1f} ms ({:.1f}x)".format(new * 1000, old / new))
+        print("new (8 threads):  {:.1f} ms ({:.1f}x)".format(new_threaded * 1000, old / new_threaded))
+        print("(threads help most on slow file systems, such as network mounts)")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures the overhead that Contexts adds to each assertion in a class with examples.
+
+Runs the same parametrised class with the old way of passing examples into test methods
+(which called inspect.signature on every call) and with the current one.
+
+Usage: python benchmarks/example_calls.py
+"""
+import inspect
+import time
+import types
+from unittest import mock
+from contexts import core
+from contexts.plugin_interface import NO_EXAMPLE
+from contexts.plugins.identification import NameBasedIdentifier
+
+
+def old_run_with_test_data(func, test_data):
+    sig = inspect.signature(func)
+    if test_data is not NO_EXAMPLE and sig.parameters:
+        if isinstance(test_data, tuple) and len(sig.parameters) == len(test_data):
+            func(*test_data)
+        else:
+            func(test_data)
+    else:
+        func()
+
+
+def old_step_run(step, instance, test_data):
+    old_run_with_test_data(types.MethodType(step.func, instance), test_data)
+
+
+class WhenAddingNumbers:
+    @classmethod
+    def examples(cls):
+        for i in range(2000):
+            yield (i, i + 1)
+
+    def establish(self, x, y):
+        self.x, self.y = x, y
+
+    def because_we_add_them(self):
+        self.result = self.x + self.y
+
+    def it_should_be_bigger_than_x(self, x, y):
+        assert self.result > x
+
+    def it_should_be_bigger_than_y(self, x, y):
+        assert self.result > y
+
+    def it_should_be_odd(self):
+        assert self.result % 2 == 1
+
+    def cleanup(self):
+        pass
+
+
+def time_per_assertion(repeat=5):
+    composite = core.PluginComposite([NameBasedIdentifier()])
+    assertion_count = 2000 * 3
+    best = float('inf')
+    for _ in range(repeat):
+        test_class = core.TestClass(WhenAddingNumbers, composite)
+        start = time.perf_counter()
+        test_class.run()
+        best = min(best, time.perf_counter() - start)
+    return best / assertion_count
+
+
+def main():
+    with mock.patch.object(core.Step, 'run', old_step_run):
+        old = time_per_assertion()
+    new = time_per_assertion()
+
+    print("old: {:.2f} us per assertion".format(old * 1e6))
+    print("new: {:.2f} us per assertion".format(new * 1e6))
+    print("speedup: {:.1f}x".format(old / new))
+
+
+if __name__ == "__main__":
+    main()
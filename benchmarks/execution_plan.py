@@ -0,0 +1,125 @@
+"""
+Measures the overhead that Contexts adds to each example of a test class with lots of examples.
+
+Compares the execution plan, which TestClass works out once per class, with the old approach
+of binding every method, building an Assertion (and an ExceptionHandler) for every assertion
+and calling process_assertion_list again for every example.
+
+Usage: python benchmarks/execution_plan.py
+"""
+import inspect
+import time
+import types
+from unittest import mock
+from contexts import core
+from contexts.plugins.identification import NameBasedIdentifier
+
+
+EXAMPLE_COUNT = 10000
+
+
+class OldAssertion(object):
+    def __init__(self, func, plugin_composite):
+        self.func = func
+        self.name = func.__name__
+        self.plugin_composite = plugin_composite
+        self.exception_handler = core.ExceptionHandler(self.plugin_composite)
+
+
+class OldContext(core.Context):
+    def __init__(self, instance, example, plan, exception_handler):
+        super().__init__(instance, example, plan, exception_handler)
+        unbound_assertions = [step.func for step in plan.assertions]
+        self.plugin_composite.process_assertion_list(instance.__class__, unbound_assertions)
+        self.setups = bind_methods([step.func for step in plan.setups], instance)
+        self.action = types.MethodType(plan.action.func, instance)
+        self.assertions = [OldAssertion(f, self.plugin_composite) for f in bind_methods(unbound_assertions, instance)]
+        self.teardowns = bind_methods([step.func for step in plan.teardowns], instance)
+
+    def steps(self):
+        cls = self.instance.__class__
+        with self.exception_handler.run_context(self):
+            try:
+                for setup in self.setups:
+                    run_with_test_data(setup, self.test_data)
+                self.plugin_composite.action_started(cls, self.example)
+                run_with_test_data(self.action, self.test_data)
+                for assertion in self.assertions:
+                    with assertion.exception_handler.run_assertion(self, assertion.func):
+                        run_with_test_data(assertion.func, self.test_data)
+            finally:
+                self.plugin_composite.teardown_started(cls, self.example)
+                for teardown in self.teardowns:
+                    run_with_test_data(teardown, self.test_data)
+        yield from ()
+
+
+parameter_counts = {}
+
+
+def bind_methods(funcs, instance):
+    return [types.MethodType(func, instance) for func in funcs]
+
+
+def run_with_test_data(func, test_data):
+    try:
+        parameter_count = parameter_counts[func.__func__]
+    except KeyError:
+        parameter_count = parameter_counts[func.__func__] = len(inspect.signature(func).parameters)
+    if not parameter_count:
+        func()
+    elif isinstance(test_data, tuple) and parameter_count == len(test_data):
+        func(*test_data)
+    else:
+        func(test_data)
+
+
+class WhenMultiplyingNumbers:
+    @classmethod
+    def examples(cls):
+        for i in range(EXAMPLE_COUNT):
+            yield (i, i + 1)
+
+    def establish(self, x, y):
+        self.x, self.y = x, y
+
+    def because_we_multiply_them(self):
+        self.result = self.x * self.y
+
+    def it_should_be_at_least_x(self, x, y):
+        assert self.result >= x
+
+    def it_should_be_at_least_y(self, x, y):
+        assert self.result >= y
+
+    def it_should_be_even(self):
+        assert self.result % 2 == 0
+
+    def cleanup(self):
+        pass
+
+
+def time_per_example(repeat=5):
+    composite = core.PluginComposite([NameBasedIdentifier()])
+    best = float('inf')
+    for _ in range(repeat):
+        test_class = core.TestClass(WhenMultiplyingNumbers, composite)
+        start = time.perf_counter()
+        test_class.run()
+        best = min(best, time.perf_counter() - start)
+    return best / EXAMPLE_COUNT
+
+
+def main():
+    with mock.patch.object(core, 'Context', OldContext):
+        old = time_per_example()
+    new = time_per_example()
+
+    print("{} examples".format(EXAMPLE_COUNT))
+    print("old: {:.2f} us per example".format(old * 1e6))
+    print("new: {:.2f} us per example".format(new * 1e6))
+    print("speedup: {:.1f}x".format(old / new))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures the cost of NameBasedIdentifier.identify_method.
+
+Compares the memoised classifier with the old approach of splitting
+the name up (twice) and searching every keyword set on each call.
+
+Usage: python benchmarks/method_identification.py
+"""
+import re
+import timeit
+from contexts.plugins.identification import NameBasedIdentifier
+from contexts.plugins.identification import example_words, setup_words, action_words, assertion_words, cleanup_words
+from contexts.plugin_interface import EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN
+
+
+def old_cleverly_get_words(string):
+    regex = re.compile(r'(_|\.|{}|{}|{})'.format(
+        r'(?<=[^A-Z])(?=[A-Z])',
+        r'(?<=[A-Z])(?=[A-Z][a-z])',
+        r'(?<=[A-Za-z])(?=[^A-Za-z])'
+    ))
+    return [w for w in regex.sub(' ', string).split(' ') if w]
+
+
+def old_get_lowercase_words(string):
+    return (s.lower() for s in old_cleverly_get_words(string))
+
+
+def old_assert_not_ambiguous(name, keywords):
+    all_keyword_sets = {example_words, setup_words, action_words, assertion_words, cleanup_words}
+    all_keyword_sets.remove(keywords)
+    for method_word in old_get_lowercase_words(name):
+        for keyword in all_keyword_sets:
+            if method_word in keyword:
+                raise ValueError(name)
+
+
+def old_identify_method(method):
+    d = {
+        example_words: EXAMPLES,
+        setup_words: SETUP,
+        action_words: ACTION,
+        assertion_words: ASSERTION,
+        cleanup_words: TEARDOWN
+    }
+    name = method.__name__
+    for word in old_get_lowercase_words(name):
+        for keywords in d:
+            if word in keywords:
+                old_assert_not_ambiguous(name, keywords)
+                return d[keywords]
+
+
+def establish_that_there_is_a_thing(self):
+    pass
+
+
+def because_we_do_something_to_the_thing(self):
+    pass
+
+
+def it_should_have_changed_the_thing(self):
+    pass
+
+
+def a_helper_method_with_a_long_name(self):
+    pass
+
+
+def main(number=100000):
+    identifier = NameBasedIdentifier()
+    print("{:<36} {:>14} {:>14} {:>8}".format("method", "old (ns/call)", "new (ns/call)", "speedup"))
+    for method in [establish_that_there_is_a_thing, because_we_do_something_to_the_thing,
+                   it_should_have_changed_the_thing, a_helper_method_with_a_long_name]:
+        old_time = min(timeit.repeat(lambda: old_identify_method(method), number=number, repeat=3))
+        new_time = min(timeit.repeat(lambda: identifier.identify_method(method), number=number, repeat=3))
+
+        print("{:<36} {:>14.0f} {:>14.0f} {:>7.1f}x".format(
+            method.__name__,
+            old_time / number * 1e9,
+            new_time / number * 1e9,
+            old_time / new_time))
+
+
+if __name__ == "__main__":
+    main()
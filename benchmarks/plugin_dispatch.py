@@ -0,0 +1,74 @@
+"""
+Measures the cost of calling a plugin hook through PluginComposite.
+
+Compares the precomputed dispatch tables with the old approach of
+looking up the hook on every plugin each time it's called.
+
+Usage: python benchmarks/plugin_dispatch.py
+"""
+import timeit
+from contexts.core import PluginComposite
+from contexts.plugin_interface import PluginInterface
+
+
+class OldPluginComposite(object):
+    def __init__(self, plugins):
+        self.plugins = plugins
+
+    def __getattr__(self, name):
+        if name not in PluginInterface.__dict__:
+            raise AttributeError('The method {} is not part of the plugin interface'.format(name))
+
+        def plugin_method(*args, **kwargs):
+            for plugin in self.plugins:
+                reply = getattr(plugin, name, lambda *_: None)(*args, **kwargs)
+                if reply is not None:
+                    return reply
+        return plugin_method
+
+
+class UninterestedPlugin(object):
+    def identify_method(self, func):
+        pass
+
+
+class InheritingPlugin(PluginInterface):
+    def context_started(self, cls, example):
+        pass
+
+
+class InterestedPlugin(object):
+    def assertion_passed(self, func):
+        pass
+
+
+def make_plugins(total, interested):
+    plugins = [InterestedPlugin() for _ in range(interested)]
+    for i in range(total - interested):
+        plugins.append(UninterestedPlugin() if i % 2 else InheritingPlugin())
+    return plugins
+
+
+def func():
+    pass
+
+
+def main(number=200000):
+    print("{:>8} {:>11} {:>14} {:>14} {:>8}".format("plugins", "interested", "old (ns/call)", "new (ns/call)", "speedup"))
+    for total, interested in [(5, 1), (20, 1), (20, 3), (40, 3)]:
+        plugins = make_plugins(total, interested)
+        old = OldPluginComposite(plugins)
+        new = PluginComposite(plugins)
+
+        old_time = min(timeit.repeat(lambda: old.assertion_passed(func), number=number, repeat=3))
+        new_time = min(timeit.repeat(lambda: new.assertion_passed(func), number=number, repeat=3))
+
+        print("{:>8} {:>11} {:>14.0f} {:>14.0f} {:>7.1f}x".format(
+            total, interested,
+            old_time / number * 1e9,
+            new_time / number * 1e9,
+            old_time / new_time))
+
+
+if __name__ == "__main__":
+    main()
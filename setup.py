@@ -5,7 +5,18 @@ builtin_plugins = [
     'CommandLineSupplier = contexts.plugins.test_target_suppliers:CommandLineSupplier',
     'ExitCodeReporter = contexts.plugins.reporting:ExitCodeReporter',
     'ArgvForwarder = contexts.plugins.argv_forwarder:ArgvForwarder',
+    'Batcher = contexts.plugins.batching:Batcher',
+    'ExampleSampler = contexts.plugins.sampling:ExampleSampler',
+    'FolderScanner = contexts.plugins.scanning:FolderScanner',
+    'ServerOptions = contexts.plugins.serving:ServerOptions',
+    'Sharder = contexts.plugins.sharding:Sharder',
     'Shuffler = contexts.plugins.shuffling:Shuffler',
+    'ResultCache = contexts.plugins.result_cache:ResultCache',
+    'DependencyTracker = contexts.plugins.dependencies:DependencyTracker',
+    'ParallelRunner = contexts.plugins.parallel:ParallelRunner',
+    'EventLoopProvider = contexts.plugins.event_loop:EventLoopProvider',
+    'Watcher = contexts.plugins.watching:Watcher',
+    'TimeLimiter = contexts.plugins.timeouts:TimeLimiter',
     'Importer = contexts.plugins.importing:Importer',
     'AssertionRewritingImporter = contexts.plugins.importing.assertion_rewriting:AssertionRewritingImporter',
     'DecoratorBasedIdentifier = contexts.plugins.identification.decorators:DecoratorBasedIdentifier',
@@ -22,6 +33,9 @@ builtin_plugins = [
     'FinalCountsReporter = contexts.plugins.reporting.cli:FinalCountsReporter',
     'TimedReporter = contexts.plugins.reporting.cli:TimedReporter',
     'XmlReporter = contexts.plugins.reporting.xml:XmlReporter',
+    'DurationsReporter = contexts.plugins.reporting.durations:DurationsReporter',
+    'StartupProfiler = contexts.plugins.profiling:StartupProfiler',
+    'Profiler = contexts.plugins.profiling:Profiler',
 ]
 
 
@@ -35,6 +49,7 @@ setup(
     long_description="""See the Github project page (https://github.com/benjamin-hodgson/Contexts) for more information.""",
     package_dir={'': 'src'},
     packages=find_packages('src'),
+    python_requires=">=3.7",
     install_requires=["setuptools >= 1.0"],
     extras_require={'colour': ["colorama >= 0.2.7"]},
     entry_points={
@@ -44,9 +59,9 @@ setup(
     classifiers=[
         "Development Status :: 4 - Beta",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 3.3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
+        "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: 3 :: Only",
+        "Programming Language :: Python :: 3.7",
         "License :: OSI Approved :: MIT License",
         "Intended Audience :: Developers",
         "Intended Audience :: Information Technology",
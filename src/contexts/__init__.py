@@ -2,14 +2,19 @@ import sys
 from . import core
 from .plugin_discovery import load_plugins
 from .tools import catch, set_trace, time
-from .plugins.identification.decorators import context, spec, scenario, ignored, examples, setup, action, assertion, teardown
+from .plugins.identification.decorators import (
+    context, spec, scenario, ignored, examples, setup, action, assertion, teardown, shared_setup, shared_teardown
+)
+from .plugins.batching import batched
+from .plugins.timeouts import timeout
 from .plugins.test_target_suppliers import ObjectSupplier
 
 
 __all__ = [
     'run', 'main', 'run_with_plugins',
     'catch', 'set_trace', 'time',
-    'context', 'spec', 'scenario', 'ignored', 'examples', 'setup', 'action', 'assertion', 'teardown'
+    'context', 'spec', 'scenario', 'ignored', 'examples', 'setup', 'action', 'assertion', 'teardown',
+    'shared_setup', 'shared_teardown', 'batched', 'timeout'
 ]
 
 
@@ -56,5 +61,9 @@ def run_with_plugins(plugin_list):
 
     test_run = core.TestRun(to_run, composite)
     test_run.run()
+    # plugins may keep the test runner going (eg, to run the tests again when a file changes)
+    while composite.wait_to_run_again() is True:
+        test_run = core.TestRun(to_run, composite)
+        test_run.run()
 
     return composite.get_exit_code()
@@ -1,5 +1,6 @@
 import sys
 from .plugin_discovery import load_plugins
+from .plugins.serving import parse_server_options
 from . import run_with_plugins
 
 
@@ -15,14 +16,28 @@ def cmd():
     else:
         colorama.init()
 
+    # the daemon module imports socket, which most test runs don't need
+    server_options, argv = parse_server_options(sys.argv[1:])
+    if server_options.serve:
+        from . import daemon
+        sys.exit(daemon.serve(daemon.get_socket_path()))
+    if server_options.client:
+        from . import daemon
+        sys.exit(daemon.run_client(daemon.get_socket_path(), argv))
+
     plugin_list = load_plugins()
     exit_code = run_with_plugins(plugin_list)
     sys.exit(exit_code)
 
 
 def print_version():
-    import pkg_resources
-    version = pkg_resources.require('contexts')[0].version
+    try:
+        from importlib.metadata import version as get_version
+    except ImportError:
+        import pkg_resources
+        version = pkg_resources.require('contexts')[0].version
+    else:
+        version = get_version('contexts')
     py_version = '.'.join(str(i) for i in sys.version_info[0:3])
 
     print("Contexts version " + version)
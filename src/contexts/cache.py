@@ -0,0 +1,32 @@
+"""
+The files which Contexts keeps between test runs (such as the results of the last run,
+or what was in each test folder), which live in the cache folder unless told otherwise.
+"""
+import json
+import os
+
+
+DEFAULT_CACHE_DIR = '.contexts-cache'
+
+
+def save_json(path, data):
+    """
+    Write `data` to `path` as JSON. The file is replaced in one go,
+    so a test run which gets interrupted (or another one running at the same time) never leaves half a file.
+    """
+    # tempfile is slow to import, so it waits until something gets saved (after the tests have run)
+    import tempfile
+    folder = os.path.dirname(path) or '.'
+    try:
+        os.makedirs(folder, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=folder)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'), sort_keys=True)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError:
+        # the cache only saves time, so not being able to write it shouldn't fail the test run
+        pass
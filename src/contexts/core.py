@@ -1,10 +1,20 @@
+import collections.abc
+import contextvars
 import inspect
 import os
+import signal
+import sys
+import threading
 import types
+import weakref
 from contextlib import contextmanager
+from io import StringIO
 from . import discovery
 from . import errors
-from .plugin_interface import PluginInterface, TEST_FOLDER, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, NO_EXAMPLE
+from . import timing
+from .plugin_interface import (
+    PluginInterface, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, SHARED_SETUP, SHARED_TEARDOWN, NO_EXAMPLE
+)
 
 
 class TestRun(object):
@@ -12,25 +22,38 @@ class TestRun(object):
         self.source = source
         self.plugin_composite = plugin_composite
         self.exception_handler = ExceptionHandler(self.plugin_composite)
+        self.file_system = discovery.FileSystem(get_discovery_threads(self.plugin_composite))
 
     def run(self):
         with self.exception_handler.run_test_run(self):
             if isinstance(self.source, type):
                 test_class = TestClass(self.source, self.plugin_composite)
                 test_class.run()
+            elif isinstance(self.source, str) and os.path.isdir(self.source):
+                self.run_folder(self.source)
             else:
-                modules = self.import_modules()
-                self.plugin_composite.process_module_list(modules)
-                for module in modules:
-                    suite = Suite(module, self.plugin_composite)
-                    suite.run()
+                self.run_suites(self.import_modules())
+
+    def run_folder(self, directory):
+        specs = self.find_module_specs(directory)
+        # plugins may leave out modules before they're imported (eg, to run a slice of them on each CI machine)
+        self.plugin_composite.process_module_specs(specs)
+        # plugins may take over importing and running the modules (eg, to run them in parallel)
+        if self.plugin_composite.run_modules(specs, self.plugin_composite) is not True:
+            self.run_suites(self.import_module_specs(specs))
+
+    def run_suites(self, modules):
+        self.plugin_composite.process_module_list(modules)
+        for module in modules:
+            suite = Suite(module, self.plugin_composite)
+            suite.run()
 
     def import_modules(self):
         if isinstance(self.source, types.ModuleType):
             return [self.source]
         if os.path.isfile(self.source):
             folder, filename = os.path.split(self.source)
-            importer = discovery.create_importer(folder, self.plugin_composite, self.exception_handler)
+            importer = discovery.create_importer(folder, self.plugin_composite, self.exception_handler, self.file_system)
             module = importer.import_file(filename)
             if module is None:
                 return []
@@ -39,25 +62,21 @@ class TestRun(object):
             return self.import_modules_from_folder(self.source)
 
     def import_modules_from_folder(self, directory):
-        module_list = discovery.ModuleList(self.plugin_composite, self.exception_handler)
+        return self.import_module_specs(self.find_module_specs(directory))
 
-        for folder, dirnames, _ in os.walk(directory):
-            self.remove_non_test_folders(folder, dirnames)
-            importer = discovery.create_importer(folder, self.plugin_composite, self.exception_handler)
-            for folder, filename in importer.module_specs():
-                module_list.add(folder, filename)
+    def find_module_specs(self, directory):
+        specs = []
+        for folder in self.file_system.walk_test_folders(directory, self.plugin_composite):
+            importer = discovery.create_importer(folder, self.plugin_composite, self.exception_handler, self.file_system)
+            specs.extend(importer.module_specs())
+        return specs
 
+    def import_module_specs(self, specs):
+        module_list = discovery.ModuleList(self.plugin_composite, self.exception_handler)
+        for folder, module_name in specs:
+            module_list.add(folder, module_name)
         return [m for m in module_list.modules if m is not None]
 
-    def remove_non_test_folders(self, parent, dirnames):
-        replacement = []
-        for dirname in dirnames:
-            full_path = os.path.realpath(os.path.join(parent, dirname))
-            reply = self.plugin_composite.identify_folder(full_path)
-            if reply is TEST_FOLDER:
-                replacement.append(dirname)
-        dirnames[:] = replacement
-
 
 class Suite(object):
     def __init__(self, module, plugin_composite):
@@ -68,12 +87,30 @@ class Suite(object):
 
         self.classes = self.get_classes()
         self.plugin_composite.process_class_list(self.module, self.classes)
+        self.shared_setups, self.shared_teardowns = self.get_shared_fixtures()
+        self.concurrency = get_concurrency(self.plugin_composite) if len(self.classes) > 1 else 1
 
     def run(self):
         with self.exception_handler.run_suite(self):
-            for cls in self.classes:
-                test_class = TestClass(cls, self.plugin_composite)
-                test_class.run()
+            # don't bother setting up the module's fixtures if there's nothing to use them
+            if not self.classes:
+                return
+            with self.exception_handler.run_module_fixtures(self):
+                try:
+                    drive(run_shared_fixtures(self.shared_setups), self.plugin_composite)
+                    if self.concurrency > 1:
+                        run_coroutine(run_concurrently(self.classes, self.run_class_alone, self.concurrency), self.plugin_composite)
+                    else:
+                        for cls in self.classes:
+                            test_class = TestClass(cls, self.plugin_composite)
+                            test_class.run()
+                finally:
+                    drive(run_shared_fixtures(self.shared_teardowns), self.plugin_composite)
+
+    async def run_class_alone(self, cls):
+        events = EventBuffer()
+        test_class = TestClass(cls, self.plugin_composite, ExceptionHandler(events), concurrent=True)
+        await run_buffered(test_class.steps(), events, self.plugin_composite, test_class.timeout)
 
     def get_classes(self):
         classes = []
@@ -83,60 +120,142 @@ class Suite(object):
                 classes.append(cls)
         return classes
 
+    def get_shared_fixtures(self):
+        setups = []
+        teardowns = []
+        for name, func in inspect.getmembers(self.module, inspect.isfunction):
+            # functions imported from elsewhere belong to the module they came from
+            if func.__module__ != self.name or isprivate(name):
+                continue
+            try:
+                response = self.plugin_composite.identify_method(func)
+            except errors.MethodNamingError:
+                # most functions in a test module are helpers, which can be called whatever you like
+                continue
+            if response is SHARED_SETUP:
+                setups.append(func)
+            elif response is SHARED_TEARDOWN:
+                teardowns.append(func)
+        return setups, teardowns
+
 
 class TestClass(object):
-    def __init__(self, cls, plugin_composite):
+    def __init__(self, cls, plugin_composite, exception_handler=None, concurrent=False):
         self.cls = cls
         self.plugin_composite = plugin_composite
-        self.exception_handler = ExceptionHandler(self.plugin_composite)
+        # the plugins hear about the test run through the exception handler,
+        # which may be buffering up the hooks while other classes run concurrently
+        self.exception_handler = exception_handler or ExceptionHandler(self.plugin_composite)
+        self.concurrent = concurrent
+        self.timeout = get_timeout(self.plugin_composite, cls)
 
         self.examples_method = None
         self.unbound_setups = []
         self.unbound_action = None
         self.unbound_assertions = []
         self.unbound_teardowns = []
+        self.shared_setups = []
+        self.shared_teardowns = []
 
         for superclass in reversed(inspect.getmro(cls)):
             bottom_of_tree = (superclass is cls)
             self.load_special_methods_from_class(superclass, bottom_of_tree)
         self.unbound_teardowns.reverse()
+        self.shared_teardowns.reverse()
 
+        self.parametrised = self.examples_method is not None
         if self.examples_method is None:
             self.examples_method = lambda: None
         if self.unbound_action is None:
             self.unbound_action = lambda self: None
 
     def run(self):
+        drive(self.steps(), self.plugin_composite)
+
+    def steps(self):
         if not self.unbound_assertions:
             return
 
         with self.exception_handler.run_class(self):
-            for example in self.get_examples():
-                context = Context(
-                    self.cls(), example,
-                    self.unbound_setups,
-                    self.unbound_action,
-                    self.unbound_assertions,
-                    self.unbound_teardowns,
-                    self.plugin_composite
-                )
-                context.run()
+            try:
+                yield from run_shared_fixtures(self.shared_setups, self.cls)
+                concurrency = get_concurrency(self.plugin_composite) if self.parametrised else 1
+                plan = self.make_plan(self.concurrent or concurrency > 1)
+                examples = self.get_examples()
+                if concurrency > 1:
+                    yield run_concurrently(examples, lambda example: self.run_example_alone(example, plan), concurrency)
+                else:
+                    for example in examples:
+                        yield from self.run_example(example, plan, self.exception_handler)
+            finally:
+                yield from run_shared_fixtures(self.shared_teardowns, self.cls)
+
+    def make_plan(self, concurrent):
+        self.plugin_composite.process_assertion_list(self.cls, self.unbound_assertions)
+        watchdog = NO_WATCHDOG if self.timeout is None else Watchdog(self.timeout)
+        return ExecutionPlan(
+            self.unbound_setups, self.unbound_action, self.unbound_assertions, self.unbound_teardowns, watchdog, concurrent
+        )
+
+    def run_example(self, example, plan, exception_handler):
+        if not isinstance(example, Batch) or len(example) == 1:
+            yield from Context(self.cls(), example, plan, exception_handler).steps()
+            return
+        # if the batch fails, the plugins hear about the rows which failed instead of the batch,
+        # so they don't hear about the batch until we know whether it passed
+        plugin_composite = exception_handler.plugin_composite
+        events = EventBuffer()
+        context = Context(self.cls(), example, plan, ExceptionHandler(events))
+        try:
+            with capturing_output(events):
+                yield from context.steps()
+        except BaseException:
+            events.replay(plugin_composite)
+            raise
+        if not context.failed:
+            events.replay(plugin_composite)
+            return
+        any_rows_failed = yield from self.run_rows(example, plan, plugin_composite)
+        if not any_rows_failed:
+            # the failure belongs to the batch as a whole
+            events.replay(plugin_composite)
+
+    async def run_example_alone(self, example, plan):
+        events = EventBuffer()
+        steps = self.run_example(example, plan, ExceptionHandler(events))
+        await run_buffered(steps, events, self.exception_handler.plugin_composite, self.timeout)
+
+    def run_rows(self, batch, plan, plugin_composite):
+        # Run the rows of a failed batch one at a time, to find out which of them failed.
+        # The plugins only hear about the rows that failed
+        any_failed = False
+        for row in batch.rows():
+            events = EventBuffer()
+            context = Context(self.cls(), row, plan, ExceptionHandler(events))
+            with capturing_output(events):
+                yield from context.steps()
+            if context.failed:
+                events.replay(plugin_composite)
+                any_failed = True
+        return any_failed
 
     def get_examples(self):
         examples = self.examples_method()
-        return examples if examples is not None else [NO_EXAMPLE]
+        if examples is None:
+            return [NO_EXAMPLE]
+        return self.plugin_composite.process_examples(self.cls, examples)
 
     def load_special_methods_from_class(self, cls, bottom_of_tree):
         # there should be one of each of these per class,
         # but there may be more than one in the inheritance tree
         class_setup = None
         class_teardown = None
+        class_shared_setup = None
+        class_shared_teardown = None
 
-        for name in cls.__dict__:
-            val = getattr(cls, name)
-
-            if callable(val) and not isprivate(name):
-                response = self.plugin_composite.identify_method(val)
+        for name, response in classify_methods(cls, self.plugin_composite):
+            if response is not None:
+                val = getattr(cls, name)
 
                 if response is EXAMPLES and bottom_of_tree:
                     assert_not_too_many_special_methods(self.examples_method, cls, val)
@@ -154,12 +273,57 @@ class TestClass(object):
                     assert_not_too_many_special_methods(class_teardown, cls, val)
                     class_teardown = val
                     self.unbound_teardowns.append(val)
+                elif response is SHARED_SETUP:
+                    assert_classmethod(cls, val)
+                    assert_not_too_many_special_methods(class_shared_setup, cls, val)
+                    class_shared_setup = val
+                    self.shared_setups.append(unbind(val))
+                elif response is SHARED_TEARDOWN:
+                    assert_classmethod(cls, val)
+                    assert_not_too_many_special_methods(class_shared_teardown, cls, val)
+                    class_shared_teardown = val
+                    self.shared_teardowns.append(unbind(val))
+
+
+def classify_methods(cls, plugin_composite):
+    # the same base classes tend to turn up in lots of test classes,
+    # so remember what the plugins said about them for the rest of the run
+    cache = plugin_composite.method_classifications
+    if cls not in cache:
+        classifications = []
+        for name in cls.__dict__:
+            val = getattr(cls, name)
+            if callable(val) and not isprivate(name):
+                classifications.append((name, plugin_composite.identify_method(val)))
+        cache[cls] = tuple(classifications)
+    return cache[cls]
 
 
 def isprivate(name):
     return name.startswith('_')
 
 
+def assert_classmethod(cls, method):
+    # shared fixtures are run before there are any instances of the class
+    if not (isinstance(method, types.MethodType) and isinstance(method.__self__, type)):
+        msg = "Context {} has a shared fixture which isn't a classmethod:\n".format(cls.__qualname__)
+        msg += method.__name__
+        raise errors.NotAClassMethodError(msg)
+
+
+def unbind(method):
+    # shared fixtures are classmethods, but a classmethod inherited from a superclass
+    # has to be run against the test class, not the superclass it was bound to
+    return method.__func__ if isinstance(method, types.MethodType) else method
+
+
+def run_shared_fixtures(funcs, *args):
+    for func in funcs:
+        result = func(*args)
+        if inspect.isawaitable(result):
+            yield result
+
+
 def assert_not_too_many_special_methods(previously_found, cls, just_found):
     if previously_found is not None:
         msg = "Context {} has multiple methods of the same type:\n".format(cls.__qualname__)
@@ -167,77 +331,424 @@ def assert_not_too_many_special_methods(previously_found, cls, just_found):
         raise errors.TooManySpecialMethodsError(msg)
 
 
-# This class and its relationship to TestClass is becoming awkward - figure out how best to split them up
+class Batch(object):
+    """
+    A chunk of the examples of a batched test class, which gets run as a single context.
+    The test methods are passed ``collate(examples)``.
+    """
+    def __init__(self, start, examples, collate):
+        self.start = start
+        self.examples = examples
+        self.collate = collate
+        self.data = collate(examples)
+
+    def rows(self):
+        for i, example in enumerate(self.examples):
+            yield Batch(self.start + i, [example], self.collate)
+
+    def __len__(self):
+        return len(self.examples)
+
+    def __str__(self):
+        if len(self.examples) == 1:
+            return 'row {}: {!r}'.format(self.start, self.examples[0])
+        return 'rows {}-{}'.format(self.start, self.start + len(self.examples) - 1)
+
+    __repr__ = __str__
+
+
+class EventBuffer(object):
+    """
+    Stands in for the plugin composite, and holds on to the hooks it was called with
+    so they can be passed on to the plugins later (or not at all).
+    While the events are being buffered, anything the tests print can be held on to as well
+    (see capturing_output), so that it gets replayed in between the right events.
+    """
+    def __init__(self):
+        self.events = []
+        self.stdout = StringIO()
+        self.stderr = StringIO()
+
+    def __getattr__(self, name):
+        def record(*args):
+            # the plugins are told when each event really happened, not when they hear about it
+            self.events.append((name, args, timing.now(), pop_buffer(self.stdout), pop_buffer(self.stderr)))
+        return record
+
+    def replay(self, plugin_composite):
+        for name, args, timestamp, stdout, stderr in self.events:
+            # write the output where it would have gone if the test had run on its own,
+            # so that the stdout-capturing plugins can deal with it
+            if stdout:
+                sys.stdout.write(stdout)
+            if stderr:
+                sys.stderr.write(stderr)
+            with timing.replaying(timestamp):
+                getattr(plugin_composite, name)(*args)
+
+
+def pop_buffer(buffer):
+    value = buffer.getvalue()
+    if value:
+        buffer.seek(0)
+        buffer.truncate()
+    return value
+
+
+# the EventBuffer belonging to whichever test is running in the current asyncio task
+current_event_buffer = contextvars.ContextVar('current_event_buffer', default=None)
+
+
+class RoutedOutput(object):
+    """
+    Stands in for sys.stdout or sys.stderr while tests run concurrently,
+    and sends what each test writes to its own EventBuffer.
+    """
+    def __init__(self, name, real_stream):
+        self.name = name
+        self.real_stream = real_stream
+        self.users = 0
+
+    def write(self, string):
+        return self.current_stream().write(string)
+
+    def flush(self):
+        self.current_stream().flush()
+
+    def current_stream(self):
+        events = current_event_buffer.get()
+        return self.real_stream if events is None else getattr(events, self.name)
+
+    def __getattr__(self, name):
+        return getattr(self.real_stream, name)
+
+
+@contextmanager
+def capturing_output(events):
+    routers = []
+    for name in ('stdout', 'stderr'):
+        stream = getattr(sys, name)
+        if not isinstance(stream, RoutedOutput):
+            stream = RoutedOutput(name, stream)
+            setattr(sys, name, stream)
+        stream.users += 1
+        routers.append(stream)
+    token = current_event_buffer.set(events)
+    try:
+        yield
+    finally:
+        current_event_buffer.reset(token)
+        for router in routers:
+            router.users -= 1
+            if router.users == 0 and getattr(sys, router.name) is router:
+                setattr(sys, router.name, router.real_stream)
+
+
+class ExecutionPlan(object):
+    """
+    The parts of running a test class which are the same for every example,
+    worked out once per class instead of once per context.
+    """
+    def __init__(self, unbound_setups, unbound_action, unbound_assertions, unbound_teardowns, watchdog, concurrent=False):
+        self.setups = [Step(f) for f in unbound_setups]
+        self.action = Step(unbound_action)
+        self.assertions = [Step(f) for f in unbound_assertions]
+        self.teardowns = [Step(f) for f in unbound_teardowns]
+        self.watchdog = watchdog
+        self.concurrent = concurrent
+
+
+class Step(object):
+    """
+    An unbound test method. It's only bound to an instance of the test class when it gets run.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.parameter_count = None
+
+    def run(self, instance, test_data):
+        if test_data is NO_EXAMPLE:
+            return self.func(instance)
+
+        if self.parameter_count is None:
+            self.parameter_count = count_parameters(self.func)
+        if not self.parameter_count:
+            return self.func(instance)
+        elif isinstance(test_data, tuple) and self.parameter_count == len(test_data):
+            return self.func(instance, *test_data)
+        else:
+            return self.func(instance, test_data)
+
+
+class Watchdog(object):
+    """
+    Interrupts a test which runs for longer than its time limit, by raising TestTimeoutError in it.
+
+    In the main thread this uses SIGALRM, which also interrupts blocking system calls
+    (such as a read from a socket). Elsewhere a timer thread raises the exception in the test's thread,
+    which only happens once the test gets back to running Python code.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.armed = False
+        self.timer = None
+        self.previous_handler = None
+        self.lock = threading.Lock()
+        self.interrupted = False
+
+    def __enter__(self):
+        self.armed = True
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            self.previous_handler = signal.signal(signal.SIGALRM, self.alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        else:
+            self.interrupted = False
+            self.timer = threading.Timer(self.seconds, self.interrupt, (threading.get_ident(),))
+            self.timer.daemon = True
+            self.timer.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # the alarm may already be on its way, but it won't do anything now
+        with self.lock:
+            self.armed = False
+        if self.timer is None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous_handler)
+        else:
+            self.timer.cancel()
+            self.timer = None
+            if self.interrupted:
+                # the test may have finished before the exception reached it.
+                # Take it back, so that it doesn't go off in whatever runs next
+                take_back_async_exception()
+
+    def alarm(self, signum, frame):
+        if self.armed:
+            raise errors.TestTimeoutError(timeout_message(self.seconds))
+
+    def interrupt(self, thread_id):
+        import ctypes
+        with self.lock:
+            if self.armed:
+                self.interrupted = True
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(errors.TestTimeoutError))
+
+
+class TakenBack(BaseException):
+    pass
+
+
+def take_back_async_exception():
+    # Clearing the exception (by setting it to NULL) would leave the interpreter
+    # checking for it before every instruction. Instead we swap it for one of our own,
+    # and let it go off here, where we can catch it
+    import ctypes
+    try:
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(threading.get_ident()), ctypes.py_object(TakenBack))
+        checkpoint()
+    except TakenBack:
+        pass
+
+
+def checkpoint():
+    # asynchronous exceptions go off when a function is called
+    pass
+
+
+class NoWatchdog(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NO_WATCHDOG = NoWatchdog()
+
+
+def timeout_message(seconds):
+    return "Timed out after {} seconds".format(seconds)
+
+
 class Context(object):
-    def __init__(self, instance, example,
-                 unbound_setups, unbound_action, unbound_assertions, unbound_teardowns,
-                 plugin_composite):
-        self.plugin_composite = plugin_composite
-        self.exception_handler = ExceptionHandler(self.plugin_composite)
+    def __init__(self, instance, example, plan, exception_handler):
+        self.exception_handler = exception_handler
+        self.plugin_composite = exception_handler.plugin_composite
 
         self.instance = instance
         self.example = example
+        self.test_data = example.data if isinstance(example, Batch) else example
         self.name = instance.__class__.__name__
-
-        self.plugin_composite.process_assertion_list(self.instance.__class__, unbound_assertions)
-        bound_assertions = bind_methods(unbound_assertions, self.instance)
-
-        # Refactoring hint: Maybe these method attributes belong in an extracted class
-        self.setups = bind_methods(unbound_setups, self.instance)
-        self.action = types.MethodType(unbound_action, self.instance)
-        self.assertions = [Assertion(f, self.plugin_composite) for f in bound_assertions]
-        self.teardowns = bind_methods(unbound_teardowns, self.instance)
+        self.plan = plan
+        self.failed = False
 
     def run(self):
+        drive(self.steps(), self.plugin_composite)
+
+    def steps(self):
+        # A generator, which yields the coroutines returned by async test methods
+        # for the caller to run on the event loop (or to await)
+        cls = self.instance.__class__
+        instance = self.instance
+        test_data = self.test_data
+        # the setup and action share a time limit, and each assertion and the teardown get their own
+        # async methods are spotted by what they return, so that decorated ones get awaited too.
+        # most methods return None, which isawaitable is slow to rule out
+        watchdog = self.plan.watchdog
         with self.exception_handler.run_context(self):
             try:
-                self.run_setup()
-                self.run_action()
-                self.run_assertions()
+                with watchdog:
+                    for setup in self.plan.setups:
+                        result = setup.run(instance, test_data)
+                        if result is not None and inspect.isawaitable(result):
+                            yield from self.wait_for(result)
+                    self.plugin_composite.action_started(cls, self.example)
+                    result = self.plan.action.run(instance, test_data)
+                    if result is not None and inspect.isawaitable(result):
+                        yield from self.wait_for(result)
+                for assertion in self.plan.assertions:
+                    # plugins get told about the assertion as a bound method
+                    with self.exception_handler.run_assertion(self, types.MethodType(assertion.func, instance)):
+                        with watchdog:
+                            result = assertion.run(instance, test_data)
+                            if result is not None and inspect.isawaitable(result):
+                                yield from self.wait_for(result)
             finally:
-                self.run_teardown()
+                self.plugin_composite.teardown_started(cls, self.example)
+                with watchdog:
+                    for teardown in self.plan.teardowns:
+                        result = teardown.run(instance, test_data)
+                        if result is not None and inspect.isawaitable(result):
+                            yield from self.wait_for(result)
+
+    def wait_for(self, awaitable):
+        if not self.plan.concurrent:
+            yield awaitable
+            return
+        # While this test waits, other tests take their turn on the event loop (and in the watchdog).
+        # The watchdog is only armed while this test has the thread to itself,
+        # and drive_async keeps an eye on how long the waiting takes
+        self.plan.watchdog.__exit__(None, None, None)
+        try:
+            yield awaitable
+        finally:
+            self.plan.watchdog.__enter__()
 
-    def run_setup(self):
-        for setup in self.setups:
-            run_with_test_data(setup, self.example)
 
-    def run_action(self):
-        run_with_test_data(self.action, self.example)
+def count_parameters(func):
+    # the number of parameters the method takes apart from self
+    return len(inspect.signature(types.MethodType(func, UNBOUND)).parameters)
 
-    def run_assertions(self):
-        for assertion in self.assertions:
-            assertion.run(self.example)
 
-    def run_teardown(self):
-        for teardown in self.teardowns:
-            run_with_test_data(teardown, self.example)
+UNBOUND = object()
 
 
-def bind_methods(funcs, instance):
-    return [types.MethodType(func, instance) for func in funcs]
+def drive(steps, plugin_composite):
+    """
+    Run a generator of steps (see Context.steps), running the coroutines it yields on the event loop
+    and throwing any exceptions they raise back into it.
+    """
+    error = None
+    while True:
+        try:
+            coroutine = steps.send(None) if error is None else steps.throw(error)
+        except StopIteration:
+            return
+        try:
+            run_coroutine(coroutine, plugin_composite)
+            error = None
+        except Exception as e:
+            error = e
 
 
-class Assertion(object):
-    def __init__(self, func, plugin_composite):
-        self.func = func
-        self.name = func.__name__
-        self.plugin_composite = plugin_composite
-        self.exception_handler = ExceptionHandler(self.plugin_composite)
+async def drive_async(steps, timeout=None):
+    """
+    The same as drive, for when the steps are being run by a task on the event loop.
+    Gives up on any coroutine which takes longer than `timeout` seconds.
+    """
+    error = None
+    while True:
+        try:
+            coroutine = steps.send(None) if error is None else steps.throw(error)
+        except StopIteration:
+            return
+        try:
+            if timeout is None:
+                await coroutine
+            else:
+                await wait_with_timeout(coroutine, timeout)
+            error = None
+        except Exception as e:
+            error = e
 
-    def run(self, test_data):
-        with self.exception_handler.run_assertion(self):
-            run_with_test_data(self.func, test_data)
 
+async def wait_with_timeout(coroutine, timeout):
+    import asyncio
+    try:
+        await asyncio.wait_for(coroutine, timeout)
+    except asyncio.TimeoutError:
+        raise errors.TestTimeoutError(timeout_message(timeout)) from None
 
-def run_with_test_data(func, test_data):
-    sig = inspect.signature(func)
-    if test_data is not NO_EXAMPLE and sig.parameters:
-        if isinstance(test_data, tuple) and len(sig.parameters) == len(test_data):
-            func(*test_data)
-        else:
-            func(test_data)
-    else:
-        func()
+
+def run_coroutine(coroutine, plugin_composite):
+    # most test runs have no async tests in them, so asyncio only gets imported when it's needed
+    import asyncio
+    loop = plugin_composite.get_event_loop()
+    if not isinstance(loop, asyncio.AbstractEventLoop):
+        return asyncio.run(coroutine)
+    task = asyncio.ensure_future(coroutine, loop=loop)
+    try:
+        return loop.run_until_complete(task)
+    except BaseException:
+        # if the watchdog interrupted the loop, the test's task is still waiting for something
+        task.cancel()
+        raise
+
+
+async def run_concurrently(items, run_one, concurrency):
+    # The workers share one iterator, so the items (which may never end) are only read when they're needed
+    import asyncio
+    iterator = iter(items)
+
+    async def worker():
+        for item in iterator:
+            await run_one(item)
+    results = await asyncio.gather(*(worker() for _ in range(concurrency)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def run_buffered(steps, events, plugin_composite, timeout):
+    # the plugins hear about everything at once when it's finished,
+    # so the hooks (and the output) of things which ran concurrently don't get interleaved
+    try:
+        with capturing_output(events):
+            await drive_async(steps, timeout)
+    finally:
+        events.replay(plugin_composite)
+
+
+def get_discovery_threads(plugin_composite):
+    threads = plugin_composite.get_discovery_threads()
+    if isinstance(threads, int) and threads > 1:
+        return threads
+    return 1
+
+
+def get_timeout(plugin_composite, cls):
+    timeout = plugin_composite.get_timeout(cls)
+    if isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and timeout > 0:
+        return timeout
+    return None
+
+
+def get_concurrency(plugin_composite):
+    concurrency = plugin_composite.get_concurrency()
+    if isinstance(concurrency, int) and concurrency > 1:
+        return concurrency
+    return 1
 
 
 class ExceptionHandler(object):
@@ -266,6 +777,13 @@ class ExceptionHandler(object):
         yield
         self.plugin_composite.suite_ended(suite.module)
 
+    @contextmanager
+    def run_module_fixtures(self, suite):
+        try:
+            yield
+        except Exception as e:
+            self.plugin_composite.unexpected_error(e)
+
     @contextmanager
     def run_class(self, test_class):
         self.plugin_composite.test_class_started(test_class.cls)
@@ -282,34 +800,78 @@ class ExceptionHandler(object):
         try:
             yield
         except Exception as e:
+            context.failed = True
             self.plugin_composite.context_errored(context.instance.__class__, context.example, e)
         else:
             self.plugin_composite.context_ended(context.instance.__class__, context.example)
 
     @contextmanager
-    def run_assertion(self, assertion):
-        self.plugin_composite.assertion_started(assertion.func)
+    def run_assertion(self, context, func):
+        self.plugin_composite.assertion_started(func)
         try:
             yield
         except AssertionError as e:
-            self.plugin_composite.assertion_failed(assertion.func, e)
+            context.failed = True
+            self.plugin_composite.assertion_failed(func, e)
         except Exception as e:
-            self.plugin_composite.assertion_errored(assertion.func, e)
+            context.failed = True
+            self.plugin_composite.assertion_errored(func, e)
         else:
-            self.plugin_composite.assertion_passed(assertion.func)
+            self.plugin_composite.assertion_passed(func)
 
 
 class PluginComposite(object):
     def __init__(self, plugins):
         self.plugins = plugins
+        self.method_classifications = weakref.WeakKeyDictionary()
+        # Hooks get called several times per assertion, so work out up front which plugins implement each one
+        # Replies are passed back untouched, so wherever a reply gets used, a reply of the wrong type
+        # (or an out-of-range value) is ignored, as if the plugin had returned None
+        for name in HOOK_NAMES:
+            methods = tuple(m for m in (getattr(p, name, None) for p in plugins) if implements_hook(m, name))
+            make_method = make_pipeline_method if name in PIPELINE_HOOK_NAMES else make_plugin_method
+            setattr(self, name, make_method(methods))
 
     def __getattr__(self, name):
-        if name not in PluginInterface.__dict__:  # not expecting this to happen
-            raise AttributeError('The method {} is not part of the plugin interface'.format(name))
-
-        def plugin_method(*args, **kwargs):
-            for plugin in self.plugins:
-                reply = getattr(plugin, name, lambda *_: None)(*args, **kwargs)
-                if reply is not None:
-                    return reply
-        return plugin_method
+        # not expecting this to happen
+        raise AttributeError('The method {} is not part of the plugin interface'.format(name))
+
+
+HOOK_NAMES = tuple(name for name, value in PluginInterface.__dict__.items() if inspect.isfunction(value))
+# each plugin gets passed what the plugin before it returned, rather than the first reply winning
+PIPELINE_HOOK_NAMES = frozenset(['process_examples'])
+
+
+def implements_hook(method, name):
+    # methods inherited from PluginInterface do nothing, so there's no need to call them
+    if method is None or method is do_nothing:
+        return False
+    return getattr(method, '__func__', None) is not PluginInterface.__dict__[name]
+
+
+def make_plugin_method(methods):
+    if not methods:
+        return do_nothing
+    if len(methods) == 1:
+        return methods[0]
+
+    def plugin_method(*args, **kwargs):
+        for method in methods:
+            reply = method(*args, **kwargs)
+            if reply is not None:
+                return reply
+    return plugin_method
+
+
+def make_pipeline_method(methods):
+    def pipeline_method(cls, value):
+        for method in methods:
+            reply = method(cls, value)
+            if isinstance(reply, collections.abc.Iterable):
+                value = reply
+        return value
+    return pipeline_method
+
+
+def do_nothing(*args, **kwargs):
+    pass
@@ -0,0 +1,222 @@
+"""
+A test server which stays running between test runs, so that plugins and libraries only get imported once,
+and a thin client which asks it to run some tests.
+
+The client sends the server its command-line arguments, working directory and environment variables,
+along with its stdin, stdout and stderr (over a Unix socket, which can pass file descriptors between processes).
+The server runs the tests with those in place of its own, so the output goes straight to the client's terminal,
+and sends back the exit code.
+
+Passing file descriptors needs socket.send_fds and socket.recv_fds, which are new in Python 3.9.
+"""
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from contextlib import suppress
+from . import run_with_plugins
+from .plugin_discovery import load_plugins
+from .cache import DEFAULT_CACHE_DIR
+
+
+MAX_REQUEST_SIZE = 1024 * 1024
+
+
+def get_socket_path():
+    return os.path.abspath(os.environ.get('CONTEXTS_SOCKET', os.path.join(DEFAULT_CACHE_DIR, 'daemon.sock')))
+
+
+def is_supported():
+    return hasattr(socket, 'send_fds') and hasattr(socket, 'AF_UNIX')
+
+
+UNSUPPORTED_MESSAGE = "The test server needs Python 3.9 or later, on a system with Unix sockets"
+
+
+def serve(path):
+    if not is_supported():
+        print(UNSUPPORTED_MESSAGE, file=sys.stderr)
+        return 1
+    if is_listening(path):
+        print("A test server is already running on {}".format(path), file=sys.stderr)
+        return 1
+    with suppress(FileNotFoundError):
+        os.unlink(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    previous_handler = signal.signal(signal.SIGTERM, stop)
+    print("Running tests for clients of {} (press Ctrl+C to stop)".format(path), flush=True)
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                handle(connection)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        server.close()
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+def stop(signum, frame):
+    # not SystemExit - a test run catches that, in case a test (or argparse) exits
+    raise KeyboardInterrupt
+
+
+def handle(connection):
+    message, fds, _, _ = socket.recv_fds(connection, MAX_REQUEST_SIZE, 3)
+    try:
+        request = json.loads(message.decode())
+        with TestRunEnvironment(request['cwd'], request['env'], fds):
+            exit_code = run_tests(request['argv'])
+        connection.sendall(str(exit_code).encode())
+    except (ValueError, KeyError, OSError):
+        pass
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def run_tests(argv):
+    try:
+        return run_with_plugins(load_plugins(argv))
+    except SystemExit as e:
+        # eg, --help or a bad argument
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+class TestRunEnvironment(object):
+    """
+    Sets the scene for a client's test run - its working directory, environment variables, stdin, stdout and stderr -
+    and afterwards forgets the test modules (and the code they imported) so that the next run imports them again.
+    Libraries stay imported.
+    """
+    def __init__(self, cwd, env, fds):
+        self.cwd = cwd
+        self.env = env
+        self.fds = fds
+
+    def __enter__(self):
+        self.previous_cwd = os.getcwd()
+        self.previous_path = list(sys.path)
+        self.previous_modules = set(sys.modules)
+        self.previous_env = dict(os.environ)
+        flush()
+        self.saved_fds = [os.dup(fd) for fd in range(len(self.fds))]
+        for fd, client_fd in enumerate(self.fds):
+            os.dup2(client_fd, fd)
+        os.chdir(self.cwd)
+        replace_environ(self.env)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        flush()
+        for fd, saved_fd in enumerate(self.saved_fds):
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+        os.chdir(self.previous_cwd)
+        replace_environ(self.previous_env)
+        sys.path[:] = self.previous_path
+        forgotten = set()
+        for name in set(sys.modules) - self.previous_modules:
+            if not stays_imported(name, sys.modules[name]):
+                del sys.modules[name]
+                forgotten.add(name)
+        forget_registrations(forgotten)
+
+
+def replace_environ(env):
+    os.environ.clear()
+    os.environ.update(env)
+
+
+def forget_registrations(module_names):
+    """
+    The decorators remember the classes and functions they were applied to in class-level registries,
+    which would otherwise keep every version of every test module alive for as long as the server runs.
+    """
+    from .plugins import parallel
+    from .plugins.batching import Batcher
+    from .plugins.identification.decorators import DecoratorBasedIdentifier
+    from .plugins.timeouts import TimeLimiter
+
+    def forgotten(obj):
+        return getattr(obj, '__module__', None) in module_names
+
+    for items in DecoratorBasedIdentifier.decorated_items.values():
+        items.difference_update([item for item in items if forgotten(item)])
+    for registry in (Batcher.batched_classes, TimeLimiter.limited_classes):
+        for cls in [cls for cls in registry if forgotten(cls)]:
+            del registry[cls]
+    # these are only stand-ins for objects from other processes, which get made again when they're needed
+    parallel.restored_objects.clear()
+
+
+def stays_imported(name, module):
+    from .plugins.dependencies import get_library_folders
+    if name == 'contexts' or name.startswith('contexts.'):
+        return True
+    filename = getattr(module, '__file__', None)
+    return filename is None or os.path.realpath(filename).startswith(get_library_folders())
+
+
+def flush():
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def run_client(path, argv):
+    """
+    Ask the test server to run the tests, and return its exit code.
+    If there's no server, run the tests in this process.
+    """
+    if not is_supported():
+        print(UNSUPPORTED_MESSAGE + "; running the tests here", file=sys.stderr, flush=True)
+        return run_tests(argv)
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        print("No test server is running on {}; running the tests here".format(path), file=sys.stderr, flush=True)
+        return run_tests(argv)
+
+    with connection:
+        flush()
+        request = json.dumps({'argv': argv, 'cwd': os.getcwd(), 'env': dict(os.environ)}).encode()
+        socket.send_fds(connection, [request], [0, 1, 2])
+        reply = b''
+        while True:
+            data = connection.recv(1024)
+            if not data:
+                break
+            reply += data
+    try:
+        return int(reply)
+    except ValueError:
+        print("The test server stopped before the test run finished", file=sys.stderr)
+        return 1
+
+
+def is_listening(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(path)
+        except OSError:
+            return False
+        return True
@@ -1,26 +1,33 @@
 import os
 from collections import namedtuple
-from .plugin_interface import TEST_FILE
+from .plugin_interface import TEST_FILE, TEST_FOLDER
 
 
 PackageSpecification = namedtuple('PackageSpecification', ['parent_folder', 'package_name'])
 ModuleSpecification = namedtuple('ModuleSpecification', ['parent_folder', 'module_name'])
 
 
-def create_importer(folder, plugin_composite, exception_handler):
-    if ispackage(folder):
-        return PackageModuleImporter(folder, plugin_composite, exception_handler)
+def create_importer(folder, plugin_composite, exception_handler, file_system=None):
+    if file_system is None:
+        file_system = FileSystem()
+    if file_system.ispackage(folder):
+        return PackageModuleImporter(folder, plugin_composite, exception_handler, file_system)
     else:
-        return FolderModuleImporter(folder, plugin_composite, exception_handler)
+        return FolderModuleImporter(folder, plugin_composite, exception_handler, file_system)
 
 
 class Importer(object):
     def get_file_details(self):
         specs = []
-        for filename in os.listdir(self.directory):
-            full_path = os.path.realpath(os.path.join(self.directory, filename))
-            if not os.path.isfile(full_path) or filename == '__init__.py':
+        listing = self.file_system.listing(self.directory)
+        real_directory = self.file_system.realpath(self.directory)
+        for filename in listing.files:
+            if filename == '__init__.py':
                 continue
+            if filename in listing.links:
+                full_path = os.path.realpath(os.path.join(self.directory, filename))
+            else:
+                full_path = os.path.join(real_directory, filename)
             if self.plugin_composite.identify_file(full_path) is TEST_FILE:
                 module_name = self.module_prefix + remove_extension(filename)
                 specs.append(ModuleSpecification(self.location, module_name))
@@ -28,12 +35,13 @@ class Importer(object):
 
 
 class FolderModuleImporter(Importer):
-    def __init__(self, directory, plugin_composite, exception_handler):
+    def __init__(self, directory, plugin_composite, exception_handler, file_system):
         self.directory = directory
         self.location = self.directory
         self.module_prefix = ''
         self.plugin_composite = plugin_composite
         self.exception_handler = exception_handler
+        self.file_system = file_system
 
     def module_specs(self):
         return self.get_file_details()
@@ -45,15 +53,16 @@ class FolderModuleImporter(Importer):
 
 
 class PackageModuleImporter(Importer):
-    def __init__(self, directory, plugin_composite, exception_handler):
-        directory = os.path.realpath(directory)
-        self.package_spec = get_package_specification(directory)
+    def __init__(self, directory, plugin_composite, exception_handler, file_system):
+        directory = file_system.realpath(directory)
+        self.package_spec = file_system.get_package_specification(directory)
 
         self.directory = directory
         self.location = self.package_spec[0]
         self.module_prefix = self.package_spec[1] + '.'
         self.plugin_composite = plugin_composite
         self.exception_handler = exception_handler
+        self.file_system = file_system
 
     def module_specs(self):
         return get_parent_package_specs(*self.package_spec) + self.get_file_details()
@@ -103,20 +112,118 @@ class ModuleList(object):
 
 
 def get_package_specification(directory):
-    current_parent = os.path.dirname(directory)
-    package_names = [os.path.basename(directory)]
-
-    while ispackage(current_parent):
-        dirpath, current_parent = current_parent, os.path.dirname(current_parent)
-        package_names.append(os.path.basename(dirpath))
-
-    full_package_name = '.'.join(reversed(package_names))
-    return PackageSpecification(current_parent, full_package_name)
+    return FileSystem().get_package_specification(directory)
 
 
 def ispackage(directory):
-    return "__init__.py" in os.listdir(directory)
+    return FileSystem().ispackage(directory)
 
 
 def remove_extension(filename):
     return os.path.splitext(filename)[0]
+
+
+Listing = namedtuple('Listing', ['names', 'files', 'folders', 'links'])
+
+
+class FileSystem(object):
+    """
+    Remembers what's in each folder, so that discovery only has to look at each folder once.
+    One of these lasts for the whole test run.
+    """
+    def __init__(self, threads=1):
+        self.threads = threads
+        self.listings = {}
+        self.realpaths = {}
+        self.package_specs = {}
+
+    def listing(self, directory):
+        # the same folder may be asked about by different paths (eg, a relative one and its realpath)
+        directory = self.realpath(directory)
+        if directory not in self.listings:
+            self.listings[directory] = scan(directory)
+        return self.listings[directory]
+
+    def realpath(self, directory):
+        if directory not in self.realpaths:
+            self.realpaths[directory] = os.path.realpath(directory)
+        return self.realpaths[directory]
+
+    def ispackage(self, directory):
+        return "__init__.py" in self.listing(directory).names
+
+    def get_package_specification(self, directory):
+        if directory not in self.package_specs:
+            current_parent = os.path.dirname(directory)
+            package_names = [os.path.basename(directory)]
+
+            while self.ispackage(current_parent):
+                dirpath, current_parent = current_parent, os.path.dirname(current_parent)
+                package_names.append(os.path.basename(dirpath))
+
+            full_package_name = '.'.join(reversed(package_names))
+            self.package_specs[directory] = PackageSpecification(current_parent, full_package_name)
+        return self.package_specs[directory]
+
+    def walk_test_folders(self, directory, plugin_composite):
+        """
+        Yield `directory` and each of the test folders inside it, top-down, in the same order as os.walk.
+        Folders which the plugins don't identify as test folders are neither yielded nor scanned.
+        If there's more than one thread, the subfolders of each folder get scanned in the background
+        while the walk carries on, which helps a lot on slow (eg, network) file systems.
+        """
+        if self.threads <= 1:
+            yield from self.walk(directory, plugin_composite, None)
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(self.threads) as executor:
+            yield from self.walk(directory, plugin_composite, executor)
+
+    def walk(self, directory, plugin_composite, executor):
+        yield directory
+        subfolders = []
+        real_directory = self.realpath(directory)
+        for name in self.listing(directory).folders:
+            path = os.path.join(directory, name)
+            # symlinks don't appear in the list of folders, so there's no need to call realpath
+            self.realpaths.setdefault(path, os.path.join(real_directory, name))
+            if plugin_composite.identify_folder(self.realpaths[path]) is TEST_FOLDER:
+                subfolders.append(path)
+
+        if executor is not None:
+            real_paths = [self.realpaths[path] for path in subfolders]
+            for real_path in real_paths:
+                if real_path not in self.listings:
+                    self.listings[real_path] = executor.submit(scan, real_path)
+            for real_path in real_paths:
+                listing = self.listings[real_path]
+                if not isinstance(listing, Listing):
+                    self.listings[real_path] = listing.result()
+
+        for path in subfolders:
+            yield from self.walk(path, plugin_composite, executor)
+
+
+def scan(directory):
+    names = []
+    files = []
+    folders = []
+    links = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                names.append(entry.name)
+                try:
+                    if entry.is_symlink():
+                        links.add(entry.name)
+                    if entry.is_dir():
+                        # like os.walk, we don't follow symlinks to folders
+                        if entry.name not in links:
+                            folders.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return Listing(frozenset(names), files, folders, links)
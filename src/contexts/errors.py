@@ -4,3 +4,15 @@ class MethodNamingError(Exception):
 
 class TooManySpecialMethodsError(Exception):
     pass
+
+
+class NotAClassMethodError(Exception):
+    pass
+
+
+class TestTimeoutError(Exception):
+    pass
+
+
+class UsageError(Exception):
+    pass
@@ -3,29 +3,56 @@ import inspect
 import itertools
 import os
 import sys
-import pkg_resources
+import time
+from . import errors
 
 
-def load_plugins():
+#: How long (in seconds) each stage of the last call to load_plugins took.
+load_timings = {}
+
+
+def load_plugins(argv=None):
+    load_timings.clear()
+    lap = make_stopwatch()
+
     plugin_loader = PluginLoader()
 
     parser = argparse.ArgumentParser()
 
     plugin_loader.load_plugins()
+    load_timings['plugin discovery'] = lap()
     plugin_loader.setup_parser(parser)
 
-    args = parser.parse_args(sys.argv[1:])
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    load_timings['argument parsing'] = lap()
 
-    plugin_loader.initialise_plugins(args)
+    try:
+        plugin_loader.initialise_plugins(args)
+    except errors.UsageError as e:
+        # the same as what happens when an argument doesn't parse
+        parser.error(str(e))
+    load_timings['initialise'] = lap()
     plugin_loader.cross_pollinate()
+    load_timings['cross_pollinate'] = lap()
 
     return plugin_loader.to_list()
 
 
+def make_stopwatch():
+    last = time.perf_counter()
+
+    def lap():
+        nonlocal last
+        now = time.perf_counter()
+        elapsed, last = now - last, now
+        return elapsed
+    return lap
+
+
 class PluginLoader(object):
     def load_plugins(self):
         builder = PluginListBuilder()
-        for entry_point in pkg_resources.iter_entry_points('contexts.plugins'):
+        for entry_point in iter_entry_points('contexts.plugins'):
             cls = entry_point.load()
             builder.add(cls)
 
@@ -64,6 +91,21 @@ class PluginLoader(object):
         return self.plugins
 
 
+def iter_entry_points(group):
+    # pkg_resources scans every installed distribution when it's imported,
+    # which takes longer than running a small test file, so we avoid it where we can
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        import pkg_resources
+        return pkg_resources.iter_entry_points(group)
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, 'select'):
+        return all_entry_points.select(group=group)
+    return all_entry_points.get(group, [])
+
+
 def activate_plugin(cls):
     try:
         sig = inspect.signature(cls)
@@ -39,6 +39,9 @@ class PluginInterface(object):
 
         :return: A boolean. Returning ``True`` will cause the plugin to be added to the list of plugins
             for this test run. Returning ``False`` will prevent this.
+        :raises contexts.errors.UsageError: if the arguments don't make sense together
+            (eg, two options which can't be used at the same time). The test run stops
+            with a usage message, in the same way as it does for an argument which can't be parsed.
         """
     def request_plugins(self):
         """
@@ -106,6 +109,23 @@ class PluginInterface(object):
         """
         Called when a test context completes its run.
 
+        :param cls: The class object of the test being run.
+        :param example: The current example, which may be :const:`~contexts.plugin_interface.NO_EXAMPLE`
+            if it is not a parametrised test.
+        """
+    def action_started(self, cls, example):
+        """
+        Called when a test context has finished its setup and is about to run its action.
+
+        :param cls: The class object of the test being run.
+        :param example: The current example, which may be :const:`~contexts.plugin_interface.NO_EXAMPLE`
+            if it is not a parametrised test.
+        """
+    def teardown_started(self, cls, example):
+        """
+        Called when a test context is about to run its teardown.
+        This happens even if the setup, action or assertions raised an exception.
+
         :param cls: The class object of the test being run.
         :param example: The current example, which may be :const:`~contexts.plugin_interface.NO_EXAMPLE`
             if it is not a parametrised test.
@@ -165,6 +185,15 @@ class PluginInterface(object):
             * a folder path as a string - the test runner will run the identified files and subfolders in this folder.
             * ``None`` - the plugin doesn't want to choose what to run.
         """
+    def get_discovery_threads(self):
+        """
+        Called at the start of a test run, to find out how many threads the test runner
+        should read the test folders with.
+
+        This method should return one of:
+            * An integer
+            * ``None``, if you do not want to override the default behaviour (reading them one at a time).
+        """
     def identify_folder(self, folder):
         """
         Called when the test runner encounters a folder and wants to know if it should
@@ -185,6 +214,7 @@ class PluginInterface(object):
 
         This method should return one of:
             * :const:`~contexts.plugin_interface.TEST_FILE` - plugin wishes the file to be imported and run as a test file
+            * :const:`~contexts.plugin_interface.IGNORED` - plugin wishes the file to be skipped, even if later plugins would identify it
             * ``None`` - plugin does not wish to identify the file (though other plugins may still cause it to be run)
         """
     def identify_class(self, cls):
@@ -200,10 +230,12 @@ class PluginInterface(object):
         """
     def identify_method(self, func):
         """
-        Called when the test runner encounters a method on a test class and wants to
-        know if it should run the method.
+        Called when the test runner encounters a method on a test class (or a function in a test module)
+        and wants to know if it should run it.
 
         When a test class has a superclass, all the superclass's methods will be passed in first.
+        Each class's methods are only identified once per test run, even if the class
+        is a superclass of several test classes.
 
         :param func: The unbound method (or bound classmethod) which the test runner wants to be identified
 
@@ -214,9 +246,20 @@ class PluginInterface(object):
             * :const:`~contexts.plugin_interface.ACTION` - plugin wishes the method to be treated as a 'because'
             * :const:`~contexts.plugin_interface.ASSERTION` - plugin wishes the method to be treated as an assertion method
             * :const:`~contexts.plugin_interface.TEARDOWN` - plugin wishes the method to be treated as a teardown method
+            * :const:`~contexts.plugin_interface.SHARED_SETUP` - plugin wishes the method to be run once before
+              all the examples of the class (or, for a function in a test module, before all the classes in the module)
+            * :const:`~contexts.plugin_interface.SHARED_TEARDOWN` - plugin wishes the method to be run once after
+              all the examples of the class (or, for a function in a test module, after all the classes in the module)
             * ``None`` - plugin does not wish to identify the method (though other plugins may still cause it to be run)
         """
 
+    def process_module_specs(self, specifications):
+        """
+        A hook to change (or examine) the list of test modules found in a folder, before any of them are imported.
+        Plugins may modify the list in-place by adding or removing specifications.
+
+        :param specifications: A list of ``(location, name)`` pairs, as for :meth:`run_modules`.
+        """
     def process_module_list(self, modules):
         """
         A hook to change (or examine) the list of modules which will be run with the full list of found modules.
@@ -232,6 +275,19 @@ class PluginInterface(object):
         :param module: The Python module in which the classes were found (an instance of :class:`types.ModuleType`).
         :param classes: A list of classes found in that module.
         """
+    def process_examples(self, cls, examples):
+        """
+        A hook to change (or examine) the examples of a parametrised test class.
+        The examples may be a generator which never ends, so plugins should avoid
+        reading all of them into memory.
+
+        :param cls: The test class which the examples are for.
+        :param examples: An iterable of examples, as returned by the class's examples method.
+
+        This method should return one of:
+            * An iterable of examples to use instead, which will be passed on to the next plugin
+            * ``None`` - plugin does not wish to change the examples
+        """
     def process_assertion_list(self, cls, functions):
         """
         A hook to change (or examine) the list of (unbound) assertion methods found in a class.
@@ -254,6 +310,62 @@ class PluginInterface(object):
                 This may be a reference to an existing module, or a "fake" generated module.
             * ``None``, if the plugin is not able to import the module.
         """
+    def run_modules(self, specifications, plugin_composite):
+        """
+        Called when the test runner has found the modules in a folder, before it imports and runs them.
+        Plugins may use this hook to take over importing and running the modules (for example,
+        to run them in parallel). Progress must still be reported using the usual hooks.
+
+        :param specifications: A list of ``(location, name)`` pairs, in the order in which the
+            test runner would import them. ``location`` and ``name`` are as for :meth:`import_module`.
+        :param plugin_composite: An object which calls each hook on every active plugin in turn,
+            in the same way as the test runner does.
+
+        This method should return one of:
+            * ``True``, if the plugin has run the modules.
+            * ``None``, if the test runner should import and run the modules as usual.
+        """
+    def get_event_loop(self):
+        """
+        Called when the test runner needs to run a coroutine (from an ``async def`` test method).
+
+        This method should return one of:
+            * An :class:`asyncio event loop <asyncio.AbstractEventLoop>` to run the coroutine on.
+            * ``None``, if you do not want to provide the event loop.
+        """
+    def get_concurrency(self):
+        """
+        Called before the test runner runs the test classes of a module (or the examples of
+        a parametrised test class), to find out how many of them it may run at once on the event loop.
+        The hooks of things which run concurrently are called once they have finished,
+        so they don't get interleaved.
+
+        This method should return one of:
+            * An integer
+            * ``None``, if you do not want to override the default behaviour (running one at a time).
+        """
+
+    def get_timeout(self, cls):
+        """
+        Called when the test runner is about to run a test class, to find out how many seconds
+        each part of a test (the setup and action, each assertion, and the teardown) may run for
+        before it is interrupted with a TestTimeoutError.
+
+        This method should return one of:
+            * A number of seconds
+            * ``None``, if you do not want to override the default behaviour (no time limit).
+        """
+
+    def wait_to_run_again(self):
+        """
+        Called when a test run has finished, before the test runner exits.
+        Plugins may use this hook to keep the test runner going (for example, to run the tests
+        again when a file changes), by waiting until the tests should be run again.
+
+        This method should return one of:
+            * ``True``, if the tests should be run again. The plugins are not loaded or initialised again.
+            * ``None``, if you do not want to override the default behaviour (exiting).
+        """
 
     def get_exit_code(self):
         """
@@ -271,7 +383,7 @@ TEST_FOLDER = type("_TestFolder", (), {})()
 TEST_FILE = type("_TestFile", (), {})()
 #: Returned by plugins to indicate that a class is a test class.
 CONTEXT = type("_Context", (), {})()
-#: Returned by plugins to indicate that a method is ignored by Contexts.
+#: Returned by plugins to indicate that a file or method is ignored by Contexts.
 IGNORED = type("_Ignored", (), {})()
 #: Returned by plugins to indicate that a method is an Examples method.
 EXAMPLES = type("_Examples", (), {})()
@@ -283,5 +395,11 @@ ACTION = type("_Action", (), {})()
 ASSERTION = type("_Assertion", (), {})()
 #: Returned by plugins to indicate that a method is a teardown method.
 TEARDOWN = type("_Teardown", (), {})()
+#: Returned by plugins to indicate that a method is a shared setup method,
+#: to be run once for the whole test class (or test module).
+SHARED_SETUP = type("_SharedSetup", (), {})()
+#: Returned by plugins to indicate that a method is a shared teardown method,
+#: to be run once for the whole test class (or test module).
+SHARED_TEARDOWN = type("_SharedTeardown", (), {})()
 #: Passed to plugins when a class is not a parametrised test.
 NO_EXAMPLE = type("_NoExample", (), {})()
@@ -1,10 +1,12 @@
 import re
 
 
+word_boundary_re = re.compile(r'(_|\.|{}|{}|{})'.format(
+    r'(?<=[^A-Z])(?=[A-Z])',
+    r'(?<=[A-Z])(?=[A-Z][a-z])',
+    r'(?<=[A-Za-z])(?=[^A-Za-z])'
+))
+
+
 def cleverly_get_words(string):
-    regex = re.compile(r'(_|\.|{}|{}|{})'.format(
-        r'(?<=[^A-Z])(?=[A-Z])',
-        r'(?<=[A-Z])(?=[A-Z][a-z])',
-        r'(?<=[A-Za-z])(?=[^A-Za-z])'
-    ))
-    return [w for w in regex.sub(' ', string).split(' ') if w]
+    return [w for w in word_boundary_re.sub(' ', string).split(' ') if w]
@@ -0,0 +1,57 @@
+import functools
+import itertools
+from ..core import Batch
+from .sampling import ExampleSampler
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Batcher(object):
+    """
+    Runs the examples of batched test classes in chunks,
+    so that a whole chunk goes through a single setup/action/assertion pass.
+    """
+    batched_classes = {}
+
+    @classmethod
+    def locate(cls):
+        # chunk the examples before anything else gets its hands on them,
+        # so the rows are numbered in the order the examples method produced them
+        return (None, ExampleSampler)
+
+    def initialise(self, args, env):
+        return True
+
+    def process_examples(self, cls, examples):
+        for klass in cls.__mro__:
+            if klass in self.batched_classes:
+                size, collate = self.batched_classes[klass]
+                return make_batches(examples, size, collate)
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def make_batches(examples, size, collate):
+    iterator = iter(examples)
+    for start in itertools.count(0, size):
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield Batch(start, chunk, collate)
+
+
+def batched(cls=None, *, size=DEFAULT_BATCH_SIZE, collate=list):
+    """
+    Class decorator. Runs a test class's examples in batches of ``size``.
+    The test methods are passed ``collate(rows)`` - a list of examples by default -
+    instead of a single example.
+    Use it with or without arguments: ``@batched`` or ``@batched(size=10000, collate=numpy.array)``.
+    """
+    if cls is None:
+        return functools.partial(batched, size=size, collate=collate)
+    if size < 1:
+        raise ValueError("Batches must have at least one example in them, not {}".format(size))
+    Batcher.batched_classes[cls] = (size, collate)
+    return cls
@@ -0,0 +1,280 @@
+import ast
+import functools
+import json
+import os
+import sys
+from .. import errors
+from .importing import Importer
+from .importing.assertion_rewriting import AssertionRewritingImporter
+from .identification import NameBasedIdentifier
+from .result_cache import ResultCache
+from ..cache import DEFAULT_CACHE_DIR, save_json
+from ..plugin_interface import IGNORED
+
+
+class DependencyTracker(object):
+    """
+    Remembers which source files each module imports,
+    so that test modules which aren't affected by a change can be skipped.
+    It only does any work when it's asked to, with --only-changed, --changed-files or --watch.
+    """
+    VERSION = 2
+
+    @classmethod
+    def locate(cls):
+        # to skip a file we have to get in before the plugins which identify it
+        return (None, NameBasedIdentifier)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--only-changed',
+                            action='store_true',
+                            dest='only_changed',
+                            default=False,
+                            help="Skip test modules whose dependencies haven't changed since they were last run.")
+        parser.add_argument('--changed-files',
+                            action='store',
+                            dest='changed_files',
+                            default=None,
+                            metavar='FILE',
+                            help="Path to a file listing the files which have changed (eg, the output of git diff --name-only). "
+                                 "Test modules which don't depend on any of them are skipped.")
+
+    def initialise(self, args, env):
+        self.selecting = args.only_changed or args.changed_files is not None
+        if not self.selecting and not getattr(args, 'watch', False):
+            return False
+        if getattr(args, 'processes', 1) != 1:
+            # the test modules get imported in the worker processes, where we can't see them
+            if self.selecting:
+                raise errors.UsageError("--only-changed and --changed-files can't be used with --processes")
+            return False
+
+        cache_dir = getattr(args, 'cache_dir', DEFAULT_CACHE_DIR)
+        self.path = os.path.join(cache_dir, 'dependencies.json')
+        self.changed_files = read_changed_files(args.changed_files) if args.changed_files is not None else None
+        self.records = load_records(self.path, self.VERSION)
+        self.recorded = set()
+        self.changes = {}
+        self.failed_modules = set()
+        return True
+
+    def request_plugins(self):
+        # the importers don't tell anyone what else got imported along with a test module,
+        # so we have to listen in on them
+        returned_plugins = yield [Importer, AssertionRewritingImporter, ResultCache]
+        importers = {id(p): p for cls, p in returned_plugins.items() if cls is not ResultCache}
+        for importer in importers.values():
+            importer.import_module = self.make_recording_import(importer.import_module)
+        if ResultCache in returned_plugins:
+            self.failed_modules = returned_plugins[ResultCache].failed_modules
+
+    def make_recording_import(self, import_module):
+        def recording_import(dir_path, module_name):
+            before = set(sys.modules)
+            module = import_module(dir_path, module_name)
+            if module is not None:
+                self.record(module, set(sys.modules) - before)
+            return module
+        return recording_import
+
+    def record(self, module, newly_imported):
+        """
+        Record what `module`, and each of the modules it imports, imports in its turn.
+        Modules which the test module imported indirectly (eg, with importlib) count as
+        direct dependencies of the test module.
+        """
+        path = get_source_path(module)
+        if path is None:
+            return
+        indirect = {get_source_path(sys.modules.get(name)) for name in newly_imported} - {None, path}
+        modules_by_path = LazyModuleIndex()
+        to_visit = [(path, module, indirect, True)]
+        while to_visit:
+            path, module, extra, is_test = to_visit.pop()
+            if path in self.recorded:
+                continue
+            self.recorded.add(path)
+            mtime = get_mtime(path)
+            previous = self.records.get(path)
+            if previous is not None and previous['mtime'] == mtime:
+                # the file hasn't changed, so it still imports the same things
+                name, imports = previous['module'], set(previous['imports'])
+            else:
+                module = module or modules_by_path.get(path)
+                if module is None:
+                    continue
+                name, imports = module.__name__, find_imported_files(module)
+            imports |= extra
+            imports.discard(path)
+            self.records[path] = {
+                'module': name,
+                'mtime': mtime,
+                'imports': sorted(imports),
+                'test': is_test or (previous is not None and previous.get('test', False))
+            }
+            to_visit.extend((p, None, set(), False) for p in imports)
+
+    def identify_file(self, file):
+        if not self.selecting:
+            return
+        record = self.records.get(file)
+        if record is None or record['module'] in self.failed_modules:
+            return
+        if not self.is_affected(file):
+            return IGNORED
+
+    def is_affected(self, path):
+        return any(self.has_changed(p) for p in self.dependencies_of(path, include_unknown=True))
+
+    def has_changed(self, path):
+        if path not in self.changes:
+            record = self.records.get(path)
+            if record is None:
+                # we don't know what it imports, so it might depend on anything
+                self.changes[path] = True
+            elif self.changed_files is not None:
+                self.changes[path] = path in self.changed_files
+            else:
+                self.changes[path] = get_mtime(path) != record['mtime']
+        return self.changes[path]
+
+    def dependencies_of(self, path, include_unknown=False):
+        """
+        The source file at `path`, and every file which it imports, directly or indirectly.
+        """
+        seen = set()
+        to_visit = [path]
+        while to_visit:
+            path = to_visit.pop()
+            if path in seen:
+                continue
+            record = self.records.get(path)
+            if record is not None or include_unknown:
+                seen.add(path)
+            if record is not None:
+                to_visit.extend(record['imports'])
+        return seen
+
+    def test_modules(self):
+        return [path for path, record in self.records.items() if record.get('test', False)]
+
+    def test_run_ended(self):
+        save_json(self.path, {'version': self.VERSION, 'modules': self.records})
+        # in case the tests get run again
+        self.recorded = set()
+        self.changes = {}
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+@functools.lru_cache(maxsize=None)
+def get_library_folders():
+    import sysconfig
+    return tuple({
+        os.path.join(os.path.realpath(sysconfig.get_paths()[name]), '')
+        for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+    })
+
+
+def get_source_path(module):
+    """
+    The real path of the module's file, or None if it doesn't have one or belongs to
+    the standard library or site-packages (which we assume don't change).
+    """
+    filename = getattr(module, '__file__', None)
+    if not isinstance(filename, str):
+        return None
+    path = os.path.realpath(filename)
+    if path.startswith(get_library_folders()):
+        return None
+    return path
+
+
+class LazyModuleIndex(object):
+    # only built if a file which has changed since the last run has to be looked at
+    def __init__(self):
+        self.index = None
+
+    def get(self, path):
+        if self.index is None:
+            self.index = {}
+            for module in list(sys.modules.values()):
+                module_path = get_source_path(module)
+                if module_path is not None:
+                    self.index.setdefault(module_path, module)
+        return self.index.get(path)
+
+
+def find_imported_files(module):
+    return {
+        path for path in (get_source_path(sys.modules.get(name)) for name in find_imported_names(module))
+        if path is not None
+    }
+
+
+def find_imported_names(module):
+    """
+    The names of the modules which `module`'s import statements refer to, wherever they are in the file.
+    Each of these is a dependency even if it was already imported by the time `module` was.
+    """
+    try:
+        with open(module.__file__, 'rb') as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    package = getattr(module, '__package__', None) or ''
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                names.update(with_parents(alias.name))
+        elif isinstance(node, ast.ImportFrom):
+            base = resolve_relative_name(node.module, node.level, package)
+            if base is None:
+                continue
+            names.update(with_parents(base))
+            # 'from package import name' might be importing a submodule
+            names.update(base + '.' + alias.name for alias in node.names)
+    return names
+
+
+def resolve_relative_name(name, level, package):
+    if level == 0:
+        return name
+    parts = package.split('.') if package else []
+    if level - 1 > len(parts):
+        return None
+    base = '.'.join(parts[:len(parts) - (level - 1)])
+    if name is None:
+        return base or None
+    return base + '.' + name if base else name
+
+
+def with_parents(name):
+    # importing a submodule runs its parent packages too
+    parts = name.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def get_mtime(filename):
+    try:
+        return os.stat(filename).st_mtime
+    except OSError:
+        return None
+
+
+def read_changed_files(path):
+    with open(path, 'r') as f:
+        return {os.path.realpath(line.strip()) for line in f if line.strip()}
+
+
+def load_records(path, version):
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    return data.get('modules', {})
@@ -0,0 +1,60 @@
+from .reporting.teamcity import TeamCityReporter
+
+
+class EventLoopProvider(object):
+    """
+    Provides the asyncio event loop which async test methods are run on.
+    """
+    @classmethod
+    def locate(cls):
+        # TeamCityReporter stops later plugins from hearing about the end of modules
+        return (None, TeamCityReporter)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--event-loop',
+                            action='store',
+                            dest='event_loop_scope',
+                            choices=['run', 'module'],
+                            default='run',
+                            help="Run async tests on one event loop for the whole test run (the default), "
+                                 "or on a new event loop for each module.")
+        parser.add_argument('--concurrency',
+                            action='store',
+                            dest='concurrency',
+                            type=int,
+                            default=1,
+                            metavar='N',
+                            help="Run up to N test classes of each module, and up to N examples of each test class, "
+                                 "at once on the event loop, so that async tests can overlap. (Default: 1)")
+
+    def initialise(self, args, env):
+        self.scope = args.event_loop_scope
+        self.concurrency = args.concurrency
+        self.loop = None
+        return True
+
+    def get_event_loop(self):
+        if self.loop is None:
+            # most test runs have no async tests in them, so asyncio only gets imported when it's needed
+            import asyncio
+            self.loop = asyncio.new_event_loop()
+        return self.loop
+
+    def get_concurrency(self):
+        return self.concurrency
+
+    def suite_ended(self, module):
+        if self.scope == 'module':
+            self.close_loop()
+
+    def test_run_ended(self):
+        self.close_loop()
+
+    def close_loop(self):
+        if self.loop is not None:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+            self.loop = None
+
+    def __eq__(self, other):
+        return type(self) == type(other)
@@ -1,6 +1,9 @@
+import functools
 import os.path
 import re
-from contexts.plugin_interface import TEST_FOLDER, TEST_FILE, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN
+from contexts.plugin_interface import (
+    TEST_FOLDER, TEST_FILE, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, SHARED_SETUP, SHARED_TEARDOWN
+)
 from contexts import errors
 from textwrap import dedent
 from .. import cleverly_get_words
@@ -15,6 +18,10 @@ setup_words = frozenset(("establish", "context", "given"))
 action_words = frozenset(("because", "when", "since", "after"))
 assertion_words = frozenset(("should", "it", "must", "will", "then"))
 cleanup_words = frozenset(("cleanup",))
+# shared fixtures are marked by a pair of words at the start of the name, neither of which is a keyword
+# on its own, so they can't be confused with the other kinds of method (or with ordinary helpers)
+shared_setup_prefixes = frozenset((("setup", "class"), ("setup", "module")))
+shared_cleanup_prefixes = frozenset((("teardown", "class"), ("teardown", "module")))
 
 
 class NameBasedIdentifier(object):
@@ -36,43 +43,69 @@ class NameBasedIdentifier(object):
             return CONTEXT
 
     def identify_method(self, method):
-        d = {
-            example_words: EXAMPLES,
-            setup_words: SETUP,
-            action_words: ACTION,
-            assertion_words: ASSERTION,
-            cleanup_words: TEARDOWN
-        }
-        name = method.__name__
-
-        for word in get_lowercase_words(name):
-            for keywords in d:
-                if word in keywords:
-                    assert_not_ambiguous(name, keywords)
-                    return d[keywords]
+        return classify_method_name(method.__name__)
 
     def __eq__(self, other):
         return type(self) == type(other)
 
 
-def assert_not_ambiguous(name, keywords):
-    all_keyword_sets = {example_words, setup_words, action_words, assertion_words, cleanup_words}
-    all_keyword_sets.remove(keywords)
-
-    for method_word in get_lowercase_words(name):
-        for keyword in all_keyword_sets:
-            if method_word in keyword:
-                method_keyword = next(k for k in keywords if k in name)
-                msg = dedent(
-                    """
-                    The method {name} is ambiguously named:
-                        It contains both {method_word!r} and {method_keyword!r}
-                        You can override this check by explicitly marking your
-                        method using one of the decorators in the 'contexts' module:
-                        http://contexts.readthedocs.org/en/latest/guide.html#overriding-name-based-usage
-                    """
-                ).format(**locals())
-                raise errors.MethodNamingError(msg)
+# maps each keyword to the kind of method it denotes
+keyword_classifications = {
+    word: classification
+    for keywords, classification in [
+        (example_words, EXAMPLES),
+        (setup_words, SETUP),
+        (action_words, ACTION),
+        (assertion_words, ASSERTION),
+        (cleanup_words, TEARDOWN)
+    ]
+    for word in keywords
+}
+prefix_classifications = {
+    prefix: classification
+    for prefixes, classification in [
+        (shared_setup_prefixes, SHARED_SETUP),
+        (shared_cleanup_prefixes, SHARED_TEARDOWN)
+    ]
+    for prefix in prefixes
+}
+
+
+# test classes share a lot of method names (and inherit a lot of methods),
+# so each name only gets split up and looked at once.
+# Ambiguous names raise an error every time, because lru_cache doesn't cache exceptions
+@functools.lru_cache(maxsize=None)
+def classify_method_name(name):
+    words = list(get_lowercase_words(name))
+    classification = prefix_classifications.get(tuple(words[:2]))
+    if classification is None:
+        method_keyword = None
+    else:
+        method_keyword = '_'.join(words[:2])
+        words = words[2:]
+    for word in words:
+        word_classification = keyword_classifications.get(word)
+        if word_classification is None:
+            continue
+        if classification is None:
+            classification = word_classification
+            method_keyword = word
+        elif word_classification is not classification:
+            raise_ambiguous(name, word, method_keyword)
+    return classification
+
+
+def raise_ambiguous(name, method_word, method_keyword):
+    msg = dedent(
+        """
+        The method {name} is ambiguously named:
+            It contains both {method_word!r} and {method_keyword!r}
+            You can override this check by explicitly marking your
+            method using one of the decorators in the 'contexts' module:
+            http://contexts.readthedocs.org/en/latest/guide.html#overriding-name-based-usage
+        """
+    ).format(**locals())
+    raise errors.MethodNamingError(msg)
 
 
 def get_lowercase_words(string):
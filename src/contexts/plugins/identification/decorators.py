@@ -1,6 +1,6 @@
 import types
 from contexts.plugin_interface import (
-    CONTEXT, IGNORED, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN
+    CONTEXT, IGNORED, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, SHARED_SETUP, SHARED_TEARDOWN
 )
 from . import NameBasedIdentifier
 
@@ -13,7 +13,9 @@ class DecoratorBasedIdentifier(object):
         "setups": set(),
         "actions": set(),
         "assertions": set(),
-        "teardowns": set()
+        "teardowns": set(),
+        "shared_setups": set(),
+        "shared_teardowns": set()
     }
 
     @classmethod
@@ -45,6 +47,10 @@ class DecoratorBasedIdentifier(object):
             return ASSERTION
         if method in self.decorated_items["teardowns"]:
             return TEARDOWN
+        if method in self.decorated_items["shared_setups"]:
+            return SHARED_SETUP
+        if method in self.decorated_items["shared_teardowns"]:
+            return SHARED_TEARDOWN
 
     def __eq__(self, other):
         return type(self) == type(other)
@@ -98,6 +104,28 @@ def teardown(func):
     return func
 
 
+def shared_setup(func):
+    """
+    Decorator. Marks a classmethod (or a function in a test module) as a shared setup method,
+    which is run once for the whole class (or module).
+    Goes underneath ``@classmethod``.
+    """
+    assert_not_multiple_decorators(func, "shared_setups")
+    DecoratorBasedIdentifier.decorated_items["shared_setups"].add(func)
+    return func
+
+
+def shared_teardown(func):
+    """
+    Decorator. Marks a classmethod (or a function in a test module) as a shared teardown method,
+    which is run once for the whole class (or module).
+    Goes underneath ``@classmethod``.
+    """
+    assert_not_multiple_decorators(func, "shared_teardowns")
+    DecoratorBasedIdentifier.decorated_items["shared_teardowns"].add(func)
+    return func
+
+
 def examples(func):
     """
     Decorator. Marks a method as an examples method.
@@ -1,9 +1,19 @@
+import _imp
 import ast
 import importlib.abc
+import importlib.util
+import marshal
+import os
+import struct
 import sys
 from . import Importer
 
 
+# Increment this whenever a change to AssertionRewriter changes the code it generates,
+# so that code cached by older versions gets rewritten again.
+REWRITER_VERSION = 1
+
+
 class AssertionRewritingImporter(Importer):
     def setup_parser(self, parser):
         parser.add_argument('--no-assert',
@@ -24,13 +34,24 @@ class AssertionRewritingImporter(Importer):
 
 
 class AssertionRewritingLoader(importlib.machinery.SourceFileLoader):
-    # in Python 3.4, implementing get_code won't be necessary -
-    # I could just override source_to_code.
-    # When 3.4 gets officially released, maybe wrap this def in an if
+    # SourceFileLoader.get_code would cache the rewritten code in the normal .pyc file,
+    # where it would get picked up by regular imports, so we keep our own cache
     def get_code(self, fullname):
-        source = self.get_source(fullname)
         path = self.get_filename(fullname)
-        return self.source_to_code(source, path)
+        source_bytes = self.get_data(path)
+        stats = self.path_stats(path)
+        header = make_cache_header(source_bytes, stats)
+        cache_path = get_cache_path(path)
+
+        code = read_cached_code(cache_path, header)
+        if code is None:
+            source = importlib.util.decode_source(source_bytes)
+            code = self.source_to_code(source, path)
+            write_cached_code(cache_path, header, code)
+        else:
+            # the cache could have been written before the folder was moved or renamed
+            _imp._fix_co_filename(code, path)
+        return code
 
     def source_to_code(self, source, path='<string>'):
         parsed = ast.parse(source)
@@ -44,6 +65,54 @@ class AssertionRewritingLoader(importlib.machinery.SourceFileLoader):
         return '<module {!r} from {!r}>'.format(module.__name__, module.__file__)
 
 
+# Rewritten code is cached alongside the normal .pyc files, in the same way that pytest does it.
+# The magic number and the cache tag in the filename take care of the Python version;
+# the header takes care of the rewriter version and the source file.
+def get_cache_path(source_path):
+    folder, filename = os.path.split(source_path)
+    name = os.path.splitext(filename)[0]
+    tag = sys.implementation.cache_tag
+    return os.path.join(folder, '__pycache__', '{}.{}-contexts.pyc'.format(name, tag))
+
+
+def make_cache_header(source_bytes, stats):
+    return (importlib.util.MAGIC_NUMBER +
+            struct.pack('<IQQ', REWRITER_VERSION, int(stats['mtime']), stats['size']) +
+            importlib.util.source_hash(source_bytes))
+
+
+def read_cached_code(cache_path, header):
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(header):
+        return None
+    try:
+        return marshal.loads(data[len(header):])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cached_code(cache_path, header, code):
+    if sys.dont_write_bytecode:
+        return
+    temp_path = '{}.{}'.format(cache_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(header + marshal.dumps(code))
+        # replace atomically, in case another process is reading the cache
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # a read-only file system shouldn't stop the test run
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
 class AssertionRewriter(ast.NodeTransformer):
     def visit_Assert(self, assert_node):
         if assert_node.msg is not None:
@@ -0,0 +1,394 @@
+import gc
+import importlib
+import os
+import pickle
+import sys
+import traceback
+import types
+from contextlib import contextmanager, suppress
+from io import StringIO
+from .. import errors, timing
+from ..core import PluginComposite, ExceptionHandler, Suite
+from ..plugin_interface import NO_EXAMPLE
+
+
+class ParallelRunner(object):
+    def setup_parser(self, parser):
+        parser.add_argument('--processes',
+                            action='store',
+                            dest='processes',
+                            type=int,
+                            default=1,
+                            metavar='N',
+                            help="Import and run test modules in N worker processes. "
+                                 "Use 0 for one process per CPU. (Default: 1)")
+        parser.add_argument('--preload',
+                            action='append',
+                            dest='preload_modules',
+                            default=[],
+                            metavar='MODULE',
+                            help="With --processes, import MODULE once before starting the worker processes, "
+                                 "so that they start with it already imported. Can be given more than once.")
+        parser.add_argument('--preload-tests',
+                            action='store_true',
+                            dest='preload_tests',
+                            default=False,
+                            help="With --processes, import the test modules (and everything they import) "
+                                 "once before starting the worker processes.")
+
+    def initialise(self, args, env):
+        # os.cpu_count() returns None if it can't tell how many CPUs there are
+        self.processes = args.processes if args.processes != 0 else (os.cpu_count() or 1)
+        self.preload_modules = args.preload_modules
+        self.preload_tests = args.preload_tests
+        if self.processes > 1 and not can_fork():
+            raise errors.UsageError("--processes can't be used on this platform, because it doesn't support fork()")
+        return self.processes > 1
+
+    def run_modules(self, specifications, plugin_composite):
+        # this plugin is loaded on every run, but only used on some,
+        # so it doesn't import multiprocessing until it's needed
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        specifications = remove_duplicate_specs(specifications)
+        if not specifications:
+            return True
+
+        # the workers are forked from this process, so anything imported here
+        # is shared with them (copy-on-write) instead of being imported by every one of them
+        preloaded = self.preload(specifications, plugin_composite)
+        # stop the workers' garbage collectors from touching (and so copying) the preloaded objects
+        gc.freeze()
+        try:
+            executor = ProcessPoolExecutor(
+                min(self.processes, len(specifications)),
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=initialise_worker,
+                initargs=(plugin_composite, preloaded)
+            )
+            with executor:
+                futures = [executor.submit(run_in_worker, spec) for spec in specifications]
+                for future in as_completed(futures):
+                    replay(future.result(), plugin_composite)
+        finally:
+            gc.unfreeze()
+        return True
+
+    def preload(self, specifications, plugin_composite):
+        for module_name in self.preload_modules:
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                plugin_composite.unexpected_error(e)
+
+        if not self.preload_tests:
+            return frozenset()
+        # errors are thrown away here - a module which fails to import
+        # gets imported again by a worker, which reports the error
+        preloader = Worker(plugin_composite)
+        with preloader.recorder.recording():
+            preloaded = frozenset(
+                module_name for location, module_name in specifications
+                if preloader.import_module(location, module_name) is not None
+            )
+        preloader.recorder.pop_events()
+        return preloaded
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+
+def can_fork():
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def remove_duplicate_specs(specifications):
+    seen = set()
+    unique = []
+    for location, module_name in specifications:
+        if module_name not in seen:
+            seen.add(module_name)
+            unique.append((location, module_name))
+    return unique
+
+
+def replay(events, plugin_composite):
+    for event in events:
+        event.replay(plugin_composite)
+
+
+worker = None
+
+
+def initialise_worker(plugin_composite, preloaded):
+    global worker
+    worker = Worker(plugin_composite, preloaded)
+
+
+def run_in_worker(specification):
+    return worker.run(specification)
+
+
+class Worker(object):
+    def __init__(self, plugin_composite, preloaded=frozenset()):
+        self.recorder = EventRecorder()
+        # the recorder swallows the progress notifications so the parent process's reporters only hear them once
+        self.plugin_composite = PluginComposite([self.recorder, plugin_composite])
+        self.exception_handler = ExceptionHandler(self.plugin_composite)
+        self.imported_parents = set()
+        # test modules which were imported by the parent process before it forked this one
+        self.preloaded = preloaded
+
+    def run(self, specification):
+        with self.recorder.recording():
+            try:
+                module = self.import_module(*specification)
+                modules = [module] if module is not None else []
+                self.plugin_composite.process_module_list(modules)
+                for module in modules:
+                    suite = Suite(module, self.plugin_composite)
+                    suite.run()
+            except Exception as e:
+                self.plugin_composite.unexpected_error(e)
+        return self.recorder.pop_events()
+
+    def import_module(self, location, module_name):
+        # a package has to be imported before its submodules can be.
+        # errors in the parent package get reported when the package itself is run
+        package_names = module_name.split('.')[:-1]
+        for i in range(1, len(package_names) + 1):
+            parent_name = '.'.join(package_names[:i])
+            if parent_name not in self.imported_parents:
+                self.imported_parents.add(parent_name)
+                with suppress(Exception):
+                    self.plugin_composite.import_module(location, parent_name)
+
+        if module_name in self.imported_parents or module_name in self.preloaded:
+            return sys.modules.get(module_name)
+
+        with self.exception_handler.importing(location, module_name):
+            return self.plugin_composite.import_module(location, module_name)
+
+
+class EventRecorder(object):
+    def __init__(self):
+        self.events = []
+
+    @contextmanager
+    def recording(self):
+        real_stdout, real_stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = self.stdout, self.stderr = StringIO(), StringIO()
+        try:
+            yield
+        finally:
+            sys.stdout, sys.stderr = real_stdout, real_stderr
+
+    def pop_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def record(self, hook_name, *args):
+        self.events.append(Event(hook_name, args, pop_buffer(self.stdout), pop_buffer(self.stderr), timing.now()))
+        return True
+
+    def suite_started(self, module):
+        return self.record("suite_started", ModuleReference(module))
+
+    def suite_ended(self, module):
+        return self.record("suite_ended", ModuleReference(module))
+
+    def test_class_started(self, cls):
+        return self.record("test_class_started", ClassReference(cls))
+
+    def test_class_ended(self, cls):
+        return self.record("test_class_ended", ClassReference(cls))
+
+    def test_class_errored(self, cls, exception):
+        return self.record("test_class_errored", ClassReference(cls), ExceptionReference(exception))
+
+    def context_started(self, cls, example):
+        return self.record("context_started", ClassReference(cls), ExampleReference(example))
+
+    def action_started(self, cls, example):
+        return self.record("action_started", ClassReference(cls), ExampleReference(example))
+
+    def teardown_started(self, cls, example):
+        return self.record("teardown_started", ClassReference(cls), ExampleReference(example))
+
+    def context_ended(self, cls, example):
+        return self.record("context_ended", ClassReference(cls), ExampleReference(example))
+
+    def context_errored(self, cls, example, exception):
+        return self.record("context_errored", ClassReference(cls), ExampleReference(example), ExceptionReference(exception))
+
+    def assertion_started(self, func):
+        return self.record("assertion_started", FunctionReference(func))
+
+    def assertion_passed(self, func):
+        return self.record("assertion_passed", FunctionReference(func))
+
+    def assertion_failed(self, func, exception):
+        return self.record("assertion_failed", FunctionReference(func), ExceptionReference(exception))
+
+    def assertion_errored(self, func, exception):
+        return self.record("assertion_errored", FunctionReference(func), ExceptionReference(exception))
+
+    def unexpected_error(self, exception):
+        return self.record("unexpected_error", ExceptionReference(exception))
+
+
+def pop_buffer(buffer):
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+class Event(object):
+    def __init__(self, hook_name, args, stdout, stderr, timestamp):
+        self.hook_name = hook_name
+        self.args = args
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timestamp = timestamp
+
+    def replay(self, plugin_composite):
+        # write the output where it would have gone if the test had run in this process,
+        # so that the stdout-capturing plugins can deal with it
+        if self.stdout:
+            sys.stdout.write(self.stdout)
+        if self.stderr:
+            sys.stderr.write(self.stderr)
+        args = [a.restore() for a in self.args]
+        # the worker's clock is the same as ours (perf_counter is system-wide),
+        # so the plugins can time the tests as if they'd run here
+        with timing.replaying(self.timestamp):
+            getattr(plugin_composite, self.hook_name)(*args)
+
+
+# The test modules are only imported in the worker processes,
+# so we send stand-ins for the objects that they define.
+# Stand-ins are cached so that each event about a given object receives the same stand-in.
+restored_objects = {}
+
+
+class ModuleReference(object):
+    def __init__(self, module):
+        self.name = module.__name__
+        self.file = getattr(module, '__file__', None)
+
+    def restore(self):
+        key = ('module', self.name, self.file)
+        if key not in restored_objects:
+            module = types.ModuleType(self.name)
+            module.__file__ = self.file
+            restored_objects[key] = module
+        return restored_objects[key]
+
+
+class ClassReference(object):
+    def __init__(self, cls):
+        self.module = cls.__module__
+        self.qualname = cls.__qualname__
+        self.name = cls.__name__
+
+    def restore(self):
+        key = ('class', self.module, self.qualname)
+        if key not in restored_objects:
+            restored_objects[key] = type(self.name, (), {'__module__': self.module, '__qualname__': self.qualname})
+        return restored_objects[key]
+
+
+class FunctionReference(object):
+    def __init__(self, func):
+        self.module = getattr(func, '__module__', None)
+        self.qualname = getattr(func, '__qualname__', func.__name__)
+        self.name = func.__name__
+
+    def restore(self):
+        return RemoteFunction(self.module, self.qualname, self.name)
+
+
+class RemoteFunction(object):
+    def __init__(self, module, qualname, name):
+        self.__module__ = module
+        self.__qualname__ = qualname
+        self.__name__ = name
+
+    def __repr__(self):
+        return '<remote function {}>'.format(self.__qualname__)
+
+
+class ExampleReference(object):
+    def __init__(self, example):
+        self.is_no_example = example is NO_EXAMPLE
+        self.pickled = try_pickle(example) if not self.is_no_example else None
+        self.str = str(example)
+        self.repr = repr(example)
+
+    def restore(self):
+        if self.is_no_example:
+            return NO_EXAMPLE
+        try:
+            return pickle.loads(self.pickled)
+        except Exception:
+            return RemoteExample(self.str, self.repr)
+
+
+class RemoteExample(object):
+    def __init__(self, str_, repr_):
+        self.str = str_
+        self.repr = repr_
+
+    def __str__(self):
+        return self.str
+
+    def __repr__(self):
+        return self.repr
+
+
+class ExceptionReference(object):
+    def __init__(self, exception):
+        self.pickled = try_pickle(exception)
+        self.module = type(exception).__module__
+        self.qualname = type(exception).__qualname__
+        self.args = [str(a) for a in exception.args]
+        self.traceback = ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+        self.is_assertion_error = isinstance(exception, AssertionError)
+
+    def restore(self):
+        from multiprocessing.pool import RemoteTraceback
+        try:
+            exception = pickle.loads(self.pickled)
+        except Exception:
+            exception = self.make_stand_in()
+        # this is how multiprocessing.Pool reports errors from its workers
+        exception.__cause__ = RemoteTraceback(self.traceback.rstrip())
+        return exception
+
+    def make_stand_in(self):
+        key = ('exception', self.module, self.qualname, self.is_assertion_error)
+        if key not in restored_objects:
+            base = RemoteAssertionError if self.is_assertion_error else RemoteError
+            restored_objects[key] = type(self.qualname.rpartition('.')[2], (base,), {
+                '__module__': self.module,
+                '__qualname__': self.qualname
+            })
+        return restored_objects[key](*self.args)
+
+
+class RemoteError(Exception):
+    pass
+
+
+class RemoteAssertionError(RemoteError, AssertionError):
+    pass
+
+
+def try_pickle(obj):
+    try:
+        return pickle.dumps(obj)
+    except Exception:
+        return None
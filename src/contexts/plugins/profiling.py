@@ -0,0 +1,309 @@
+import json
+import os
+from .. import errors, plugin_discovery
+from .importing import Importer
+from .importing.assertion_rewriting import AssertionRewritingImporter
+from .reporting import StreamReporter
+
+
+class StartupProfiler(StreamReporter):
+    """
+    Reports how long each stage of the test run took, from loading the plugins
+    to running the tests.
+    """
+    @classmethod
+    def locate(cls):
+        # we need to hear about run_modules even if the ParallelRunner takes over
+        from .parallel import ParallelRunner
+        return (None, ParallelRunner)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--profile-startup',
+                            action='store_true',
+                            dest='profile_startup',
+                            default=False,
+                            help="Report how long each stage of the test run took.")
+        parser.add_argument('--profile-startup-json',
+                            action='store',
+                            dest='profile_startup_json',
+                            default='contexts-startup.json',
+                            metavar='FILE',
+                            help="Where to write the report from --profile-startup. (Default: contexts-startup.json)")
+
+    def initialise(self, args, env):
+        if args.profile_startup and getattr(args, 'processes', 1) != 1:
+            # the worker processes import the test modules, and we'd only hear how long they took to run
+            raise errors.UsageError("--profile-startup can't be used with --processes")
+        self.json_path = args.profile_startup_json
+        return args.profile_startup
+
+    def request_plugins(self):
+        # the importers don't tell anyone how long they took, so we have to listen in on them
+        returned_plugins = yield [Importer, AssertionRewritingImporter]
+        for importer in {id(p): p for p in returned_plugins.values()}.values():
+            importer.import_module = self.make_timed_import(importer.import_module)
+            if isinstance(importer, AssertionRewritingImporter):
+                importer.get_loader = self.make_timed_get_loader(importer.get_loader)
+
+    def test_run_started(self):
+        self.phases = dict(plugin_discovery.load_timings)
+        for phase in ['filesystem discovery', 'import', 'assertion rewriting', 'class collection', 'execution']:
+            self.phases[phase] = 0
+        self.imports = []
+        self.rewriting_time = 0
+        self.lap = plugin_discovery.make_stopwatch()
+
+    # Each hook marks the end of a stretch of time. Which stage that time belongs to
+    # depends on which hook it is.
+    def finish_stage(self, phase):
+        self.phases[phase] += self.lap()
+
+    def make_timed_import(self, import_module):
+        def timed_import(dir_path, module_name):
+            # the time since the last import was spent looking for this file
+            self.finish_stage('filesystem discovery')
+            self.rewriting_time = 0
+            try:
+                return import_module(dir_path, module_name)
+            finally:
+                elapsed = self.lap()
+                self.phases['import'] += elapsed
+                self.phases['assertion rewriting'] += self.rewriting_time
+                self.imports.append((module_name, elapsed, self.rewriting_time))
+        return timed_import
+
+    def make_timed_get_loader(self, get_loader):
+        def timed_get_loader(module_name, filename):
+            loader = get_loader(module_name, filename)
+            loader.source_to_code = self.make_timed_source_to_code(loader.source_to_code)
+            return loader
+        return timed_get_loader
+
+    def make_timed_source_to_code(self, source_to_code):
+        def timed_source_to_code(*args, **kwargs):
+            lap = plugin_discovery.make_stopwatch()
+            try:
+                return source_to_code(*args, **kwargs)
+            finally:
+                self.rewriting_time += lap()
+        return timed_source_to_code
+
+    def run_modules(self, specifications, plugin_composite):
+        self.finish_stage('filesystem discovery')
+
+    def process_module_list(self, modules):
+        self.finish_stage('filesystem discovery')
+
+    def process_class_list(self, module, classes):
+        self.finish_stage('class collection')
+
+    def test_class_started(self, cls):
+        self.finish_stage('class collection')
+
+    def suite_started(self, module):
+        self.finish_stage('execution')
+
+    def suite_ended(self, module):
+        self.finish_stage('execution')
+
+    def test_class_ended(self, cls):
+        self.finish_stage('execution')
+
+    def test_class_errored(self, cls, exception):
+        self.finish_stage('execution')
+
+    def context_started(self, cls, example):
+        self.finish_stage('execution')
+
+    def context_ended(self, cls, example):
+        self.finish_stage('execution')
+
+    def context_errored(self, cls, example, exception):
+        self.finish_stage('execution')
+
+    def assertion_started(self, func):
+        self.finish_stage('execution')
+
+    def assertion_passed(self, func):
+        self.finish_stage('execution')
+
+    def assertion_failed(self, func, exception):
+        self.finish_stage('execution')
+
+    def assertion_errored(self, func, exception):
+        self.finish_stage('execution')
+
+    def unexpected_error(self, exception):
+        self.finish_stage('execution')
+
+    def test_run_ended(self):
+        self.finish_stage('execution')
+        self.print_report()
+        self.write_json()
+
+    def print_report(self):
+        self._print('')
+        self._print("Startup profile:")
+        for phase, seconds in self.phases.items():
+            # rewriting happens during importing, so it's shown as part of it
+            indent = '    ' if phase == 'assertion rewriting' else '  '
+            self._print("{}{:<{}} {:>10.1f} ms".format(indent, phase, 30 - len(indent), seconds * 1000))
+        self._print("  {:<28} {:>10.1f} ms".format("total", self.total() * 1000))
+
+        slowest = sorted(self.imports, key=lambda i: i[1], reverse=True)[:10]
+        if slowest:
+            self._print("Slowest imports:")
+        for module_name, seconds, rewriting in slowest:
+            self._print("  {:>10.1f} ms  {} (assertion rewriting: {:.1f} ms)".format(seconds * 1000, module_name, rewriting * 1000))
+
+    def total(self):
+        return sum(seconds for phase, seconds in self.phases.items() if phase != 'assertion rewriting')
+
+    def write_json(self):
+        report = {
+            'phases': self.phases,
+            'total': self.total(),
+            'imports': [
+                {'module': module_name, 'seconds': seconds, 'assertion_rewriting_seconds': rewriting}
+                for module_name, seconds, rewriting in self.imports
+            ]
+        }
+        with open(self.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+class Profiler(object):
+    """
+    Runs each test class under cProfile, and writes out where the time went.
+    """
+    @classmethod
+    def locate(cls):
+        from .parallel import ParallelRunner
+        return (None, ParallelRunner)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--profile',
+                            action='store_true',
+                            dest='profile',
+                            default=False,
+                            help="Profile the test classes, and write the results to a .pstats file "
+                                 "and a file of collapsed stacks for drawing flame graphs.")
+        parser.add_argument('--profile-output',
+                            action='store',
+                            dest='profile_output',
+                            default='contexts-profile',
+                            metavar='PREFIX',
+                            help="Where to write the results of --profile. "
+                                 "Writes PREFIX.pstats and PREFIX.collapsed. (Default: contexts-profile)")
+
+    def initialise(self, args, env):
+        if args.profile and (getattr(args, 'processes', 1) != 1 or getattr(args, 'concurrency', 1) > 1):
+            # the profiler is switched on when it hears that a class has started, but with --processes
+            # the class runs in another process, and with --concurrency it hears about it afterwards
+            raise errors.UsageError("--profile can't be used with --processes or --concurrency")
+        self.output = args.profile_output
+        self.reset()
+        return args.profile
+
+    def test_run_started(self):
+        # each test run gets profiled on its own, if the tests get run more than once (eg, with --watch)
+        self.reset()
+
+    def reset(self):
+        self.profiles = {}
+        self.current = None
+
+    def test_class_started(self, cls):
+        import cProfile
+        self.current = self.profiles.setdefault(class_name(cls), cProfile.Profile())
+        self.current.enable()
+
+    def test_class_ended(self, cls):
+        self.stop()
+
+    def test_class_errored(self, cls, exception):
+        self.stop()
+
+    def stop(self):
+        if self.current is not None:
+            self.current.disable()
+            self.current = None
+
+    def test_run_ended(self):
+        self.stop()
+        profiles = {name: profile for name, profile in self.profiles.items() if get_stats(profile)}
+        if not profiles:
+            return
+        write_pstats(self.output + '.pstats', profiles.values())
+        with open(self.output + '.collapsed', 'w') as f:
+            for name, profile in sorted(profiles.items()):
+                for stack, microseconds in collapse_stacks(get_stats(profile)):
+                    f.write('{} {}\n'.format(';'.join([name] + stack), microseconds))
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def class_name(cls):
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+def get_stats(profile):
+    import pstats
+    try:
+        return pstats.Stats(profile).stats
+    except TypeError:  # nothing was recorded
+        return {}
+
+
+def write_pstats(path, profiles):
+    import pstats
+    stats = pstats.Stats(*profiles)
+    stats.dump_stats(path)
+
+
+def collapse_stacks(stats):
+    """
+    cProfile only remembers which function called which, not whole stacks,
+    so the stacks are rebuilt by following the calls down from the functions
+    which weren't called by anything else. Each callee gets a share of its caller's time
+    in proportion to how much of the callee's time was spent being called from there.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, (_, _, _, _, callers) in stats.items() if not any(c in stats for c in callers)]
+
+    collapsed = {}
+
+    def visit(func, seconds, stack, seen):
+        _, _, self_time, cumulative, _ = stats[func]
+        # tiny shares aren't worth drawing, and following them can take forever
+        if cumulative <= 0 or seconds < 0.000001:
+            return
+        stack = stack + (frame_name(func),)
+        share = seconds / cumulative
+        collapsed[stack] = collapsed.get(stack, 0) + self_time * share
+        for callee, edge_time in callees.get(func, ()):
+            # recursion would go round forever, so the time spent in it stays with the first call
+            if callee not in seen and callee in stats:
+                visit(callee, edge_time * share, stack, seen | {callee})
+
+    for root in roots:
+        visit(root, stats[root][3], (), {root})
+
+    for stack, seconds in collapsed.items():
+        microseconds = int(round(seconds * 1000000))
+        if microseconds:
+            yield list(stack), microseconds
+
+
+def frame_name(func):
+    filename, line, name = func
+    if filename == '~':  # built-in functions
+        label = name
+    else:
+        label = '{} ({}:{})'.format(name, os.path.basename(filename), line)
+    # semicolons separate the frames in a collapsed stack
+    return label.replace(';', ',')
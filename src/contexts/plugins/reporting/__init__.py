@@ -30,6 +30,10 @@ class ExitCodeReporter(object):
     def get_exit_code(self):
         return self.exit_code
 
+    def test_run_started(self):
+        # when watching, each run of the tests gets its own exit code
+        self.exit_code = 0
+
     def assertion_failed(self, func, exception):
         self.exit_code = 1
 
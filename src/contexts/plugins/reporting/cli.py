@@ -106,6 +106,13 @@ class FinalCountsReporter(StreamReporter):
 
     def __init__(self, stream=sys.stdout):
         super().__init__(stream)
+        self.reset()
+
+    def test_run_started(self):
+        # the counts are for this test run, if the tests get run more than once (eg, with --watch)
+        self.reset()
+
+    def reset(self):
         self.context_count = 0
         self.assertion_count = 0
         self.failure_count = 0
@@ -362,6 +369,9 @@ class FailuresOnlyBefore(object):
         returned_plugins = yield [FailuresOnlyMaster]
         self.master = returned_plugins[FailuresOnlyMaster]
 
+    def test_run_started(self):
+        self.master.final_report = StringIO()
+
     def context_started(self, name, example):
         self.master.set_streams(StringIO())
         self.master.current_context_failed = False
@@ -0,0 +1,184 @@
+import heapq
+import itertools
+import json
+from . import StreamReporter
+from ... import timing
+from .cli import FailuresOnlyBefore
+from ...plugin_interface import NO_EXAMPLE
+
+
+class ContextTiming(object):
+    def __init__(self, cls, example, start):
+        self.cls = cls
+        self.example = example
+        self.start = start
+        self.phases = {'setup': 0, 'action': 0, 'assertions': 0, 'teardown': 0}
+        self.assertions = []
+        self.total = 0
+
+    @property
+    def name(self):
+        return '{}.{}'.format(self.cls.__module__, self.cls.__qualname__)
+
+    @property
+    def description(self):
+        if self.example is NO_EXAMPLE:
+            return self.name
+        return '{} -> {}'.format(self.name, self.example)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'example': None if self.example is NO_EXAMPLE else str(self.example),
+            'total_ns': self.total,
+            'phases_ns': self.phases,
+            'assertions': [{'name': name, 'total_ns': ns} for name, ns in self.assertions]
+        }
+
+
+class DurationsReporter(StreamReporter):
+    """
+    Times the setup, action, assertions and teardown of every context,
+    and reports the slowest ones at the end of the run.
+    """
+    @classmethod
+    def locate(cls):
+        # FailuresOnlyBefore stops later plugins from hearing about passing assertions
+        return (None, FailuresOnlyBefore)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--durations',
+                            action='store',
+                            dest='durations',
+                            type=int,
+                            default=None,
+                            metavar='N',
+                            help="Report the N slowest contexts and assertions (0 to report all of them).")
+        parser.add_argument('--durations-json',
+                            action='store',
+                            dest='durations_json',
+                            default=None,
+                            metavar='FILE',
+                            help="Write how long every context and assertion took to FILE, as JSON.")
+
+    def initialise(self, args, env):
+        self.count = args.durations
+        self.json_path = args.durations_json
+        return self.count is not None or self.json_path is not None
+
+    def test_run_started(self):
+        # a parametrised test can have any number of examples,
+        # so only the slowest ones are kept, and the JSON file is written as we go
+        self.slowest_contexts = []
+        self.slowest_assertions = []
+        self.tie_breaker = itertools.count()
+        self.json_file = None
+        self.current = None
+        self.phase = None
+
+    def context_started(self, cls, example):
+        now = timing.now()
+        self.current = ContextTiming(cls, example, now)
+        self.phase = 'setup'
+        self.phase_start = now
+
+    # Each phase runs until the hook which marks the start of the next one.
+    def start_phase(self, phase):
+        now = timing.now()
+        if self.current is None:
+            return now
+        if self.phase is not None:
+            self.current.phases[self.phase] += now - self.phase_start
+        self.phase = phase
+        self.phase_start = now
+        return now
+
+    def action_started(self, cls, example):
+        self.start_phase('action')
+
+    def assertion_started(self, func):
+        self.assertion_start = self.start_phase('assertions')
+
+    def assertion_passed(self, func):
+        self.assertion_ended(func)
+
+    def assertion_failed(self, func, exception):
+        self.assertion_ended(func)
+
+    def assertion_errored(self, func, exception):
+        self.assertion_ended(func)
+
+    def assertion_ended(self, func):
+        if self.current is not None:
+            now = self.start_phase(None)
+            self.current.assertions.append((func.__name__, now - self.assertion_start))
+
+    def teardown_started(self, cls, example):
+        self.start_phase('teardown')
+
+    def context_ended(self, cls, example):
+        self.finish_context()
+
+    def context_errored(self, cls, example, exception):
+        self.finish_context()
+
+    def finish_context(self):
+        if self.current is None:
+            return
+        self.current.total = self.start_phase(None) - self.current.start
+        self.record(self.current)
+        self.current = None
+
+    def record(self, context):
+        if self.json_path is not None:
+            self.write_json(context)
+        if self.count is not None:
+            self.keep(self.slowest_contexts, context.total, context)
+            for name, ns in context.assertions:
+                self.keep(self.slowest_assertions, ns, '{}: {}'.format(context.description, name))
+
+    def keep(self, heap, ns, item):
+        # heap is a min-heap, so the quickest of the slowest is the first to go
+        entry = (ns, next(self.tie_breaker), item)
+        if self.count and len(heap) >= self.count:
+            heapq.heappushpop(heap, entry)
+        else:
+            heapq.heappush(heap, entry)
+
+    def test_run_ended(self):
+        if self.count is not None:
+            self.print_report()
+        if self.json_path is not None:
+            self.write_json(None)
+            self.json_file.close()
+
+    def print_report(self):
+        contexts = [context for _, _, context in sorted(self.slowest_contexts, reverse=True)]
+        assertions = [(ns, description) for ns, _, description in sorted(self.slowest_assertions, reverse=True)]
+
+        self._print('')
+        self._print("Slowest contexts:")
+        for context in contexts:
+            self._print("{:>10} {}".format(format_ns(context.total), context.description))
+            self._print("{:>10} {}".format('', ', '.join(
+                '{} {}'.format(phase, format_ns(ns)) for phase, ns in context.phases.items()
+            )))
+        self._print("Slowest assertions:")
+        for ns, description in assertions:
+            self._print("{:>10} {}".format(format_ns(ns), description))
+
+    def write_json(self, context):
+        if self.json_file is None:
+            self.json_file = open(self.json_path, 'w')
+            self.json_file.write('{"contexts": [')
+            separator = '\n'
+        else:
+            separator = ',\n'
+        if context is None:
+            self.json_file.write('\n]}\n')
+        else:
+            self.json_file.write(separator + json.dumps(context.to_dict()))
+
+
+def format_ns(ns):
+    return '{:.1f} ms'.format(ns / 1e6)
@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 import io
-import xml.etree.ElementTree as ET
 
 from . import context_name, format_exception, make_readable
 from ...plugin_interface import NO_EXAMPLE
@@ -72,11 +71,25 @@ class AssertionResult(Result):
         return 0
 
 
+# The counts in the <testsuites> element aren't known until the end of the run,
+# so we leave room for them at the start of the file and fill them in afterwards.
+# Whitespace before the closing '>' of a tag is legal XML.
+HEADER_WIDTH = 160
+
+
 class XmlReporter:
 
     def __init__(self):
-        self.suites = Result("Test suites")
         self.path = None
+        self.reset()
+
+    def reset(self):
+        self.file = None
+        self.ctx = None
+        self.started = datetime.now()
+        self.tests = 0
+        self.errors = 0
+        self.failures = 0
 
     def initialise(self, args, environ):
         if(args and args.xml_path):
@@ -92,13 +105,19 @@ class XmlReporter:
                             help='Path for XML output'
                             )
 
+    def test_run_started(self):
+        # each test run gets a fresh file, if the tests get run more than once (eg, with --watch)
+        self.reset()
+        self.open_file()
+
     def context_started(self, cls, example=NO_EXAMPLE):
+        self.write_context()
         name = context_name(cls.__name__, example)
-        ctx = self.ctx = Result(name)
-        self.suites.add_child(ctx)
+        self.ctx = Result(name)
 
     def context_ended(self, cls, example=NO_EXAMPLE):
         self.ctx.stop()
+        self.write_context()
 
     def assertion_started(self, func):
         self.test = AssertionResult(make_readable(func.__name__))
@@ -115,15 +134,37 @@ class XmlReporter:
         self.test.stop()
         self.test.error = exception
 
-    def write_test_suites(self, builder):
-        total_tests = sum([len(suite) for suite in self.suites])
-        builder.start("testsuites", {
-            "tests": str(total_tests),
-            "errors": str(self.suites.errors),
-            "failures": str(self.suites.failures),
-            "time": "{0:.2f}".format(self.suites.time.total_seconds())
+    def open_file(self):
+        if self.file is None:
+            self.file = io.open(self.path, 'wb')
+            self.write_header()
+
+    def write_header(self):
+        header = '<testsuites tests="{}" errors="{}" failures="{}" time="{:.2f}"'.format(
+            self.tests,
+            self.errors,
+            self.failures,
+            (datetime.now() - self.started).total_seconds()
+        )
+        self.file.write((header.ljust(HEADER_WIDTH - 1) + '>').encode('us-ascii'))
+
+    def write_context(self):
+        # each context is written out as soon as it's finished, and then forgotten about,
+        # so that we don't hang on to every exception (and its frames) until the end of the run
+        if self.ctx is None:
+            return
+        import xml.etree.ElementTree as ET
+        ctx, self.ctx = self.ctx, None
+        self.tests += len(ctx)
+        self.errors += ctx.errors
+        self.failures += ctx.failures
 
-        })
+        builder = ET.TreeBuilder()
+        self.write_test_suite(builder, ctx)
+        self.end_test_suite(builder)
+        self.open_file()
+        self.file.write(ET.tostring(builder.close()))
+        self.file.flush()
 
     def write_test_suite(self, builder, suite):
         builder.start("testsuite", {
@@ -162,18 +203,10 @@ class XmlReporter:
     def end_test_suite(self, builder):
         builder.end('testsuite')
 
-    def end_test_suites(self, builder):
-        builder.end('testsuites')
-
     def test_run_ended(self):
-        self.suites.stop()
-        builder = ET.TreeBuilder()
-        self.write_test_suites(builder)
-        for suite in self.suites:
-            self.write_test_suite(builder, suite)
-            self.end_test_suite(builder)
-        self.end_test_suites(builder)
-
-        el = ET.ElementTree(element=builder.close())
-        with io.open(self.path, 'wb') as f:
-            el.write(f)
+        self.write_context()
+        self.open_file()
+        self.file.write(b'</testsuites>')
+        self.file.seek(0)
+        self.write_header()
+        self.file.close()
@@ -0,0 +1,136 @@
+import json
+import os
+from ..cache import DEFAULT_CACHE_DIR, save_json
+
+
+class ResultCache(object):
+    """
+    Remembers which test classes failed, so that they can be re-run
+    on their own (or before everything else) next time.
+    """
+    @classmethod
+    def locate(cls):
+        # reordering the tests is pointless if they get shuffled afterwards
+        from .shuffling import Shuffler
+        return (Shuffler, None)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--last-failed',
+                            action='store_true',
+                            dest='last_failed',
+                            default=False,
+                            help="Only run the test classes which failed last time "
+                                 "(and any modules which haven't been run before). "
+                                 "If nothing failed, run everything.")
+        parser.add_argument('--failed-first',
+                            action='store_true',
+                            dest='failed_first',
+                            default=False,
+                            help="Run the test classes which failed last time before the others.")
+        parser.add_argument('--cache-dir',
+                            action='store',
+                            dest='cache_dir',
+                            default=DEFAULT_CACHE_DIR,
+                            help="Folder in which to remember the results of test runs. (Default: .contexts-cache)")
+
+    def initialise(self, args, env):
+        self.path = os.path.join(args.cache_dir, 'results.json')
+        self.last_failed = args.last_failed
+        self.failed_first = args.failed_first
+        self.previous_modules, self.previous_failures = load_results(self.path)
+        self.failed_modules = {key.partition(':')[0] for key in self.previous_failures}
+        self.reset()
+        return True
+
+    def test_run_started(self):
+        # the results are for this test run, if the tests get run more than once (eg, with --watch)
+        self.reset()
+
+    def reset(self):
+        self.modules = set()
+        self.classes = set()
+        self.failures = {}
+        self.current_class = None
+
+    def process_module_list(self, modules):
+        if self.should_select():
+            modules[:] = [m for m in modules if self.module_failed(m) or m.__name__ not in self.previous_modules]
+        elif self.failed_first:
+            modules.sort(key=lambda m: not self.module_failed(m))
+
+    def process_class_list(self, module, classes):
+        if self.should_select() and module.__name__ in self.previous_modules:
+            classes[:] = [c for c in classes if self.class_failed(c)]
+        elif self.failed_first:
+            classes.sort(key=lambda c: not self.class_failed(c))
+
+    def process_assertion_list(self, cls, functions):
+        if self.last_failed or self.failed_first:
+            failed_assertions = self.previous_failures.get(class_key(cls), ())
+            functions.sort(key=lambda f: f.__name__ not in failed_assertions)
+
+    def should_select(self):
+        return self.last_failed and bool(self.previous_failures)
+
+    def module_failed(self, module):
+        return module.__name__ in self.failed_modules
+
+    def class_failed(self, cls):
+        return class_key(cls) in self.previous_failures
+
+    def suite_started(self, module):
+        self.modules.add(module.__name__)
+
+    def test_class_started(self, cls):
+        self.classes.add(class_key(cls))
+
+    def test_class_errored(self, cls, exception):
+        self.failures.setdefault(class_key(cls), set())
+
+    def context_started(self, cls, example):
+        self.current_class = class_key(cls)
+
+    def context_errored(self, cls, example, exception):
+        self.failures.setdefault(class_key(cls), set())
+
+    def assertion_failed(self, func, exception):
+        self.failures.setdefault(self.current_class, set()).add(func.__name__)
+
+    def assertion_errored(self, func, exception):
+        self.failures.setdefault(self.current_class, set()).add(func.__name__)
+
+    def test_run_ended(self):
+        # classes which didn't run this time keep their old results,
+        # so that running a subset of the tests doesn't forget about the rest
+        failures = {key: names for key, names in self.previous_failures.items() if key not in self.classes}
+        failures.update(self.failures)
+        modules = self.previous_modules | self.modules
+        save_results(self.path, modules, failures)
+        # in case the tests get run again. other plugins hold on to failed_modules, so it's updated in place
+        self.previous_modules, self.previous_failures = modules, failures
+        self.failed_modules.clear()
+        self.failed_modules.update(key.partition(':')[0] for key in failures)
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def class_key(cls):
+    return '{}:{}'.format(cls.__module__, cls.__qualname__)
+
+
+def load_results(path):
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return set(data['modules']), {key: set(names) for key, names in data['failures'].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return set(), {}
+
+
+def save_results(path, modules, failures):
+    save_json(path, {
+        'modules': sorted(modules),
+        'failures': {key: sorted(names) for key, names in failures.items()}
+    })
+
@@ -0,0 +1,92 @@
+import argparse
+import itertools
+import math
+import random
+from .. import errors
+from .shuffling import Shuffler
+
+
+class ExampleSampler(object):
+    """
+    Runs a limited number of the examples of each parametrised test class,
+    for examples methods which generate more cases than it's practical to run.
+    """
+    @classmethod
+    def locate(cls):
+        # pick the examples before they get shuffled
+        return (None, Shuffler)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--max-examples',
+                            action='store',
+                            dest='max_examples',
+                            type=parse_example_count,
+                            default=None,
+                            metavar='N',
+                            help="Only run the first N examples of each parametrised test class.")
+        parser.add_argument('--random-examples',
+                            action='store_true',
+                            dest='random_examples',
+                            default=False,
+                            help="With --max-examples, pick N examples at random from all of them, "
+                                 "rather than taking the first N.")
+
+    def initialise(self, args, env):
+        self.max_examples = args.max_examples
+        self.random_examples = args.random_examples
+        if self.random_examples and self.max_examples is None:
+            raise errors.UsageError("--random-examples can only be used with --max-examples")
+        return self.max_examples is not None
+
+    def process_examples(self, cls, examples):
+        if self.random_examples:
+            return sample_stream(examples, self.max_examples)
+        return itertools.islice(examples, self.max_examples)
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def parse_example_count(value):
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if count < 0:
+        raise argparse.ArgumentTypeError("The number of examples must be a whole number, 0 or more, not {}".format(value))
+    return count
+
+
+def sample_stream(iterable, k):
+    """
+    Pick `k` items at random from an iterable, while only holding `k` items in memory.
+    Uses Li's 'Algorithm L', which skips over most of the items without generating a random number for each.
+    """
+    iterator = iter(iterable)
+    reservoir = list(itertools.islice(iterator, k))
+    if len(reservoir) < k or k <= 0:
+        yield from reservoir
+        return
+
+    w = math.exp(math.log(random_fraction()) / k)
+    while True:
+        skip = math.floor(math.log(random_fraction()) / math.log(1 - w))
+        # consume `skip` items without keeping them
+        next(itertools.islice(iterator, skip, skip), None)
+        item = next(iterator, _end)
+        if item is _end:
+            break
+        reservoir[random.randrange(k)] = item
+        w *= math.exp(math.log(random_fraction()) / k)
+    yield from reservoir
+
+
+_end = object()
+
+
+def random_fraction():
+    # a number between 0 and 1 which it's safe to take the logarithm of
+    while True:
+        fraction = random.random()
+        if fraction > 0:
+            return fraction
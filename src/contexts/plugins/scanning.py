@@ -0,0 +1,23 @@
+class FolderScanner(object):
+    """
+    Decides how many threads the test folders get read with.
+    """
+    def setup_parser(self, parser):
+        parser.add_argument('--discovery-threads',
+                            action='store',
+                            dest='discovery_threads',
+                            type=int,
+                            default=1,
+                            metavar='N',
+                            help="Read the test folders with N threads, "
+                                 "which helps a lot on slow (eg, network) file systems. (Default: 1)")
+
+    def initialise(self, args, env):
+        self.threads = args.discovery_threads
+        return self.threads > 1
+
+    def get_discovery_threads(self):
+        return self.threads
+
+    def __eq__(self, other):
+        return type(self) == type(other)
@@ -0,0 +1,40 @@
+import argparse
+
+
+class ServerOptions(object):
+    """
+    The test server gets started (or asked to run the tests) before any plugins are loaded,
+    by contexts.__main__, but its options are part of the command line like any others.
+    """
+    def setup_parser(self, parser):
+        add_server_options(parser)
+
+    def initialise(self, args, env):
+        return False
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def add_server_options(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--serve',
+                       action='store_true',
+                       dest='serve',
+                       default=False,
+                       help="Start a test server which stays running between test runs, instead of running the tests.")
+    group.add_argument('--client',
+                       action='store_true',
+                       dest='client',
+                       default=False,
+                       help="Ask the test server to run the tests, with the rest of the command line.")
+
+
+def parse_server_options(argv):
+    """
+    Pick --serve and --client out of the command line, without loading the plugins.
+    Returns the parsed options and the rest of the command line.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_server_options(parser)
+    return parser.parse_known_args(argv)
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import zlib
+
+
+class Sharder(object):
+    """
+    Runs one of several disjoint slices of the test run, so that the slices can be run on different machines.
+    Every machine works out the same slices, so they must all be given the same tests and timings files.
+    """
+    def setup_parser(self, parser):
+        parser.add_argument('--shard',
+                            action='store',
+                            dest='shard',
+                            type=parse_shard,
+                            default=None,
+                            metavar='INDEX/TOTAL',
+                            help="Split the tests into TOTAL slices and only run slice number INDEX (counting from 1).")
+        parser.add_argument('--shard-by',
+                            action='store',
+                            dest='shard_by',
+                            choices=['module', 'class'],
+                            default='module',
+                            help="Split the tests between the shards by test module (the default), "
+                                 "or by test class.")
+        parser.add_argument('--shard-timings',
+                            action='append',
+                            dest='shard_timings',
+                            default=[],
+                            metavar='FILE',
+                            help="A --durations-json file from a previous run, used to give each shard "
+                                 "the same amount of work rather than the same number of tests. "
+                                 "Can be given more than once (eg, once for each shard of the previous run).")
+
+    def initialise(self, args, env):
+        if args.shard is None:
+            return False
+        self.index, self.total = args.shard
+        self.granularity = args.shard_by
+        self.durations = load_durations(args.shard_timings)
+        return True
+
+    def process_module_specs(self, specifications):
+        if self.granularity != 'module':
+            return
+        # a module can't be imported without its packages, so every shard imports all the packages
+        # and only the test modules get split between the shards
+        names = [module_name for location, module_name in specifications if not is_package(location, module_name)]
+        durations = module_durations(names, self.durations)
+        mine = set(choose_shard(names, durations, self.index, self.total))
+        specifications[:] = [s for s in specifications if s[1] in mine or is_package(*s)]
+
+    def process_class_list(self, module, classes):
+        if self.granularity != 'class':
+            return
+        names = [class_name(cls) for cls in classes]
+        # each module gets split on its own (the modules may be run in any order, or in different processes).
+        # starting each one at a different shard stops the first shard getting the biggest class of every module
+        first_shard = zlib.crc32(module.__name__.encode()) % self.total
+        mine = set(choose_shard(names, self.durations, self.index, self.total, first_shard))
+        classes[:] = [cls for cls in classes if class_name(cls) in mine]
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def parse_shard(value):
+    index, _, total = value.partition('/')
+    try:
+        index, total = int(index), int(total)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Shards look like INDEX/TOTAL (eg, 2/4), not {}".format(value))
+    if not 1 <= index <= total:
+        raise argparse.ArgumentTypeError("The shard's index must be between 1 and {}, not {}".format(total, index))
+    return index - 1, total
+
+
+def is_package(location, module_name):
+    return os.path.isfile(os.path.join(location, *module_name.split('.'), '__init__.py'))
+
+
+def class_name(cls):
+    # the same as the names in --durations-json
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+def load_durations(paths):
+    """Add up how long each test class took (over all its examples), in nanoseconds."""
+    durations = {}
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                contexts = json.load(f)['contexts']
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        for context in contexts:
+            durations[context['name']] = durations.get(context['name'], 0) + context['total_ns']
+    return durations
+
+
+def module_durations(module_names, class_durations):
+    # a class belongs to the module with the longest name which its name starts with
+    # (a class in 'pkg.test_thing' is not in the package 'pkg')
+    by_length = sorted(set(module_names), key=len, reverse=True)
+    durations = {}
+    for name, ns in class_durations.items():
+        for module_name in by_length:
+            if name.startswith(module_name + '.'):
+                durations[module_name] = durations.get(module_name, 0) + ns
+                break
+    return durations
+
+
+def choose_shard(names, durations, index, total, first_shard=0):
+    """
+    Deal out the named tests between the shards, longest first, each one to the shard with the least work so far,
+    and return the names of the tests for shard number `index`.
+    Tests with no recorded duration count as an average one, so with no timings each shard gets the same number.
+    """
+    known = [durations[name] for name in names if name in durations]
+    default = sum(known) / len(known) if known else 1
+    loads = [0] * total
+    mine = []
+    for name in sorted(set(names), key=lambda name: (-durations.get(name, default), name)):
+        shard = min(range(total), key=lambda i: (loads[i], (i - first_shard) % total))
+        loads[shard] += durations.get(name, default)
+        if shard == index:
+            mine.append(name)
+    return mine
@@ -1,6 +1,10 @@
 import random
 
 
+# examples can go on forever, so they only get shuffled this many at a time
+EXAMPLE_WINDOW = 1000
+
+
 class Shuffler(object):
     def setup_parser(self, parser):
         parser.add_argument('--no-random',
@@ -18,6 +22,9 @@ class Shuffler(object):
     def process_class_list(self, module, l):
         self.shuffle_list(l)
 
+    def process_examples(self, cls, examples):
+        return shuffle_stream(examples, EXAMPLE_WINDOW)
+
     def process_assertion_list(self, cls, l):
         self.shuffle_list(l)
 
@@ -26,3 +33,20 @@ class Shuffler(object):
 
     def __eq__(self, other):
         return isinstance(other, Shuffler)
+
+
+def shuffle_stream(iterable, window):
+    """
+    Shuffle an iterable while only holding `window` items in memory.
+    If there are no more than `window` items, every order is equally likely.
+    """
+    buffer = []
+    for item in iterable:
+        if len(buffer) < window:
+            buffer.append(item)
+            continue
+        i = random.randrange(window)
+        yield buffer[i]
+        buffer[i] = item
+    random.shuffle(buffer)
+    yield from buffer
@@ -0,0 +1,43 @@
+class TimeLimiter(object):
+    """
+    Sets how long each part of a test is allowed to run for before it gets interrupted.
+    """
+    limited_classes = {}
+
+    def setup_parser(self, parser):
+        parser.add_argument('--timeout',
+                            action='store',
+                            dest='timeout',
+                            type=float,
+                            default=None,
+                            metavar='SECONDS',
+                            help="Interrupt the setup and action of a test, any of its assertions, "
+                                 "or its teardown, if it runs for longer than SECONDS.")
+
+    def initialise(self, args, env):
+        self.timeout = args.timeout
+        # the @timeout decorator works without the command-line option
+        return True
+
+    def get_timeout(self, cls):
+        for klass in cls.__mro__:
+            if klass in self.limited_classes:
+                return self.limited_classes[klass]
+        return self.timeout
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def timeout(seconds):
+    """
+    Class decorator. Sets the time limit for a test class, in seconds, overriding ``--timeout``.
+    ``@timeout(None)`` switches the time limit off.
+    """
+    if seconds is not None and seconds <= 0:
+        raise ValueError("Time limits must be a positive number of seconds, not {}".format(seconds))
+
+    def decorator(cls):
+        TimeLimiter.limited_classes[cls] = seconds
+        return cls
+    return decorator
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+from .dependencies import DependencyTracker
+from .reporting.teamcity import TeamCityReporter
+
+
+POLL_INTERVAL = 0.5
+
+
+class Watcher(object):
+    """
+    Keeps the test runner going once the tests have finished, and runs them again whenever a file changes.
+    Only the test modules which depend on the changed files get run again,
+    and only the code they depend on gets imported again.
+    """
+    interval = POLL_INTERVAL
+
+    @classmethod
+    def locate(cls):
+        # TeamCityReporter stops later plugins from hearing about the end of the test run
+        return (None, TeamCityReporter)
+
+    def setup_parser(self, parser):
+        parser.add_argument('--watch',
+                            action='store_true',
+                            dest='watch',
+                            default=False,
+                            help="After running the tests, wait for files to change and run the affected tests again. "
+                                 "Press Ctrl+C to stop.")
+
+    def initialise(self, args, env):
+        self.test_files = set()
+        self.snapshot = {}
+        self.tracker = None
+        return args.watch
+
+    def request_plugins(self):
+        # the dependency tracker knows which files each test module depends on
+        returned_plugins = yield [DependencyTracker]
+        self.tracker = returned_plugins.get(DependencyTracker)
+
+    def identify_file(self, file):
+        self.test_files.add(file)
+
+    def test_run_ended(self):
+        self.snapshot = take_snapshot(self.watched_paths())
+
+    def wait_to_run_again(self):
+        print("Watching for changes... (press Ctrl+C to stop)", flush=True)
+        try:
+            changed = self.wait_for_changes()
+        except KeyboardInterrupt:
+            return False
+        self.unload(changed)
+        if self.tracker is not None:
+            # from now on, the modules which aren't affected by a change get skipped
+            self.tracker.selecting = True
+            self.tracker.changed_files = None
+        return True
+
+    def wait_for_changes(self):
+        while True:
+            time.sleep(self.interval)
+            snapshot = take_snapshot(self.snapshot)
+            changed = {path for path, mtime in snapshot.items() if mtime != self.snapshot[path]}
+            if changed:
+                return changed
+
+    def watched_paths(self):
+        # adding a file to a folder changes the folder's modification time,
+        # so watching the folders catches new test files
+        paths = set(self.test_files)
+        paths.update(os.path.dirname(f) for f in self.test_files)
+        for dependencies in self.dependencies():
+            paths.update(dependencies)
+        return paths
+
+    def dependencies(self):
+        # the files which each test module depends on (including the test module itself)
+        if self.tracker is None:
+            return []
+        return [self.tracker.dependencies_of(path) for path in self.tracker.test_modules()]
+
+    def unload(self, changed):
+        """
+        Forget about the changed modules, along with everything imported by the test modules which depend on them,
+        so that the test modules get imported again with the new code.
+        """
+        to_unload = set(changed)
+        for dependencies in self.dependencies():
+            if not dependencies.isdisjoint(changed):
+                to_unload.update(dependencies)
+
+        for name, module in list(sys.modules.items()):
+            # the test runner can't be imported again while it's running
+            if name == 'contexts' or name.startswith('contexts.') or name == '__main__':
+                continue
+            filename = getattr(module, '__file__', None)
+            if filename is not None and os.path.realpath(filename) in to_unload:
+                del sys.modules[name]
+
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+def take_snapshot(paths):
+    snapshot = {}
+    for path in paths:
+        try:
+            snapshot[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            snapshot[path] = None
+    return snapshot
@@ -0,0 +1,28 @@
+import time
+from contextlib import contextmanager
+
+
+# Some hooks get passed on to the plugins after the event they're about
+# (by a worker process with --processes, or once a class has finished with --concurrency).
+# While they're being passed on, this is the time they were first called.
+replayed_time = None
+
+
+def now():
+    """
+    The time of the event which the plugins are being told about, in nanoseconds.
+    Use this rather than time.perf_counter_ns() to time the tests from inside a plugin.
+    """
+    if replayed_time is not None:
+        return replayed_time
+    return time.perf_counter_ns()
+
+
+@contextmanager
+def replaying(timestamp):
+    global replayed_time
+    previous, replayed_time = replayed_time, timestamp
+    try:
+        yield
+    finally:
+        replayed_time = previous
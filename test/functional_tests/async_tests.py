@@ -0,0 +1,288 @@
+import asyncio
+import functools
+import sys
+import types
+from io import StringIO
+from unittest import mock
+from .tools import run_object, initialise_plugin
+from contexts.plugin_interface import PluginInterface, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, SHARED_SETUP
+from contexts.plugins.event_loop import EventLoopProvider
+from contexts.plugins.reporting.cli import StdOutCapturingReporter
+
+
+class EventLoopSharedContext:
+    def run_with_an_event_loop(self, to_run, *argv):
+        provider, _ = initialise_plugin(EventLoopProvider(), *argv)
+        run_object(to_run, [provider] + self.get_plugins())
+
+    def get_plugins(self):
+        return [self.plugin]
+
+
+class WhenRunningAnAsyncSpec(EventLoopSharedContext):
+    def given_a_test_class_with_async_methods(self):
+        class AsyncSpec:
+            log = []
+
+            @classmethod
+            async def prepare(cls):
+                cls.log.append(("prepare", asyncio.get_running_loop()))
+
+            async def context(self):
+                await asyncio.sleep(0)
+                self.__class__.log.append(("setup", asyncio.get_running_loop()))
+
+            async def because(self):
+                self.__class__.log.append(("action", asyncio.get_running_loop()))
+
+            async def it(self):
+                self.__class__.log.append(("assertion", asyncio.get_running_loop()))
+
+            def should_also_run_ordinary_methods(self):
+                self.__class__.log.append(("sync assertion", None))
+
+            async def cleanup(self):
+                self.__class__.log.append(("teardown", asyncio.get_running_loop()))
+        self.spec = AsyncSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            AsyncSpec.prepare: SHARED_SETUP,
+            AsyncSpec.context: SETUP,
+            AsyncSpec.because: ACTION,
+            AsyncSpec.it: ASSERTION,
+            AsyncSpec.should_also_run_ordinary_methods: ASSERTION,
+            AsyncSpec.cleanup: TEARDOWN
+        }[meth]
+
+    def because_we_run_the_class(self):
+        self.run_with_an_event_loop(self.spec)
+
+    def it_should_run_all_the_methods_in_order(self):
+        assert [step for step, _ in self.spec.log] == [
+            "prepare", "setup", "action", "assertion", "sync assertion", "teardown"
+        ]
+
+    def it_should_run_them_all_on_the_same_loop(self):
+        loops = {loop for _, loop in self.spec.log if loop is not None}
+        assert len(loops) == 1
+
+    def it_should_report_that_the_assertions_passed(self):
+        assert self.plugin.assertion_passed.call_count == 2
+
+
+class WhenAnAsyncAssertionFails(EventLoopSharedContext):
+    def given_a_test_class_with_a_failing_async_assertion(self):
+        self.exception = AssertionError()
+
+        class AsyncSpec:
+            async def it(s):
+                await asyncio.sleep(0)
+                raise self.exception
+
+            async def cleanup(s):
+                s.__class__.cleaned_up = True
+        self.spec = AsyncSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            AsyncSpec.it: ASSERTION,
+            AsyncSpec.cleanup: TEARDOWN
+        }[meth]
+
+    def because_we_run_the_class(self):
+        self.run_with_an_event_loop(self.spec)
+
+    def it_should_report_the_failure(self):
+        [(func, exception), _] = self.plugin.assertion_failed.call_args
+        assert func.__name__ == 'it'
+        assert exception is self.exception
+
+    def it_should_still_run_the_teardown(self):
+        assert self.spec.cleaned_up
+
+
+class WhenAnAsyncAssertionIsWrappedInADecorator(EventLoopSharedContext):
+    def given_a_test_class_with_a_decorated_async_assertion(self):
+        self.exception = AssertionError()
+
+        def decorator(func):
+            # an ordinary function which returns the coroutine
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return func(*args, **kwargs)
+            return wrapper
+
+        class AsyncSpec:
+            @decorator
+            async def it(s):
+                await asyncio.sleep(0)
+                raise self.exception
+        self.spec = AsyncSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            AsyncSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        self.run_with_an_event_loop(self.spec)
+
+    def it_should_await_it(self):
+        [(func, exception), _] = self.plugin.assertion_failed.call_args
+        assert exception is self.exception
+
+    def it_should_not_report_that_it_passed(self):
+        assert not self.plugin.assertion_passed.called
+
+
+class WhenRunningTheExamplesOfAnAsyncSpecConcurrently(EventLoopSharedContext):
+    def given_a_parametrised_test_class_which_waits_for_io(self):
+        class AsyncSpec:
+            running = 0
+            most_running = 0
+
+            @classmethod
+            def examples(cls):
+                yield from range(6)
+
+            async def because(self, example):
+                cls = self.__class__
+                cls.running += 1
+                cls.most_running = max(cls.most_running, cls.running)
+                await asyncio.sleep(0.01)
+                cls.running -= 1
+
+            def it(self, example):
+                assert example != 4
+        self.spec = AsyncSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            AsyncSpec.examples: EXAMPLES,
+            AsyncSpec.because: ACTION,
+            AsyncSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        self.run_with_an_event_loop(self.spec, '--concurrency', '3')
+
+    def it_should_run_up_to_the_limit_at_once(self):
+        assert self.spec.most_running == 3
+
+    def it_should_run_every_one(self):
+        assert sorted(c[0][1] for c in self.plugin.context_started.call_args_list) == list(range(6))
+
+    def it_should_report_the_failure(self):
+        assert self.plugin.assertion_failed.call_count == 1
+
+    def it_should_not_interleave_the_hooks(self):
+        names = [name for name, _, _ in self.plugin.mock_calls if name in ('context_started', 'context_ended')]
+        assert names == ['context_started', 'context_ended'] * 6
+
+
+class WhenRunningTheClassesOfAModuleConcurrently(EventLoopSharedContext):
+    def given_a_module_with_async_test_classes(self):
+        self.log = []
+        self.module = types.ModuleType('fake_specs')
+
+        class Spec1:
+            async def because(s):
+                self.log.append("spec1 started")
+                await asyncio.sleep(0.01)
+                self.log.append("spec1 finished")
+
+            def it(s):
+                pass
+
+        class Spec2:
+            async def because(s):
+                self.log.append("spec2 started")
+                await asyncio.sleep(0.01)
+                self.log.append("spec2 finished")
+
+            def it(s):
+                pass
+        self.module.Spec1 = Spec1
+        self.module.Spec2 = Spec2
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_class.return_value = CONTEXT
+        self.plugin.identify_method.side_effect = lambda meth: {
+            Spec1.because: ACTION,
+            Spec1.it: ASSERTION,
+            Spec2.because: ACTION,
+            Spec2.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_module(self):
+        self.run_with_an_event_loop(self.module, '--concurrency', '2')
+
+    def it_should_overlap_the_classes(self):
+        assert self.log[:2] == ["spec1 started", "spec2 started"]
+
+    def it_should_tell_the_plugins_about_one_class_at_a_time(self):
+        names = [name for name, _, _ in self.plugin.mock_calls if name.startswith('test_class_')]
+        assert names == ['test_class_started', 'test_class_ended'] * 2
+
+    def it_should_still_finish_the_suite(self):
+        self.plugin.suite_ended.assert_called_once_with(self.module)
+
+
+class WhenTestsThatRunConcurrentlyPrintThings(EventLoopSharedContext):
+    def given_a_module_with_failing_async_test_classes_which_print(self):
+        self.module = types.ModuleType('fake_specs')
+
+        class Spec1:
+            async def because(s):
+                print("hello from spec1")
+                await asyncio.sleep(0.01)
+
+            def it(s):
+                assert False
+
+        class Spec2:
+            async def because(s):
+                print("hello from spec2")
+                await asyncio.sleep(0.01)
+
+            def it(s):
+                assert False
+        self.module.Spec1 = Spec1
+        self.module.Spec2 = Spec2
+
+        identifier = mock.Mock(spec=PluginInterface)
+        identifier.identify_class.return_value = CONTEXT
+        identifier.identify_method.side_effect = lambda meth: {
+            Spec1.because: ACTION,
+            Spec1.it: ASSERTION,
+            Spec2.because: ACTION,
+            Spec2.it: ASSERTION
+        }[meth]
+        self.report = StringIO()
+        self.reporter = StdOutCapturingReporter(self.report)
+        self.reporter.quiet = False
+        self.plugin = identifier
+
+        self.real_stdout = sys.stdout
+        sys.stdout = self.stdout = StringIO()
+
+    def because_we_run_the_module(self):
+        try:
+            self.run_with_an_event_loop(self.module, '--concurrency', '2')
+        finally:
+            sys.stdout = self.real_stdout
+
+    def get_plugins(self):
+        return [self.reporter, self.plugin]
+
+    def it_should_show_each_tests_output_with_its_failure(self):
+        sections = self.report.getvalue().split(">> begin captured stdout <<")[1:]
+        captured = sorted(section.split(">> end captured stdout <<")[0].strip(" -\n") for section in sections)
+        assert captured == ["hello from spec1", "hello from spec2"]
+
+    def it_should_not_let_the_output_escape(self):
+        assert "hello from" not in self.stdout.getvalue()
+
+    def it_should_put_stdout_back(self):
+        assert sys.stdout is self.real_stdout
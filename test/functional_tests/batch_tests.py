@@ -0,0 +1,117 @@
+from unittest import mock
+from .tools import run_object
+from contexts.plugin_interface import PluginInterface, EXAMPLES, SETUP, ASSERTION
+from contexts.plugins.batching import Batcher, batched
+
+
+class WhenRunningABatchedSpec:
+    def given_a_batched_test_class(self):
+        @batched(size=2)
+        class BatchedSpec:
+            initialised = 0
+            setups = []
+
+            @classmethod
+            def examples(cls):
+                yield from range(5)
+
+            def __init__(self):
+                self.__class__.initialised += 1
+
+            def context(self, rows):
+                self.__class__.setups.append(rows)
+
+            def it(self, rows):
+                pass
+        self.spec = BatchedSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            BatchedSpec.examples: EXAMPLES,
+            BatchedSpec.context: SETUP,
+            BatchedSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [Batcher(), self.plugin])
+
+    def it_should_instantiate_the_class_once_per_batch(self):
+        assert self.spec.initialised == 3
+
+    def it_should_pass_each_batch_into_the_test_methods(self):
+        assert self.spec.setups == [[0, 1], [2, 3], [4]]
+
+    def it_should_report_each_batch_once(self):
+        assert [str(c[0][1]) for c in self.plugin.context_started.call_args_list] == [
+            "rows 0-1", "rows 2-3", "row 4: 4"
+        ]
+
+    def cleanup_the_decorator(self):
+        del Batcher.batched_classes[self.spec]
+
+
+class WhenABatchFails:
+    def given_a_batched_test_class_with_one_bad_row(self):
+        @batched(size=3, collate=set)
+        class BatchedSpec:
+            @classmethod
+            def examples(cls):
+                yield from range(6)
+
+            def it(self, rows):
+                assert 4 not in rows
+        self.spec = BatchedSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            BatchedSpec.examples: EXAMPLES,
+            BatchedSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [Batcher(), self.plugin])
+
+    def it_should_report_the_failing_row_instead_of_the_failing_batch(self):
+        assert [str(c[0][1]) for c in self.plugin.context_started.call_args_list] == [
+            "rows 0-2", "row 4: 4"
+        ]
+
+    def it_should_only_count_the_failure_once(self):
+        assert self.plugin.assertion_failed.call_count == 1
+
+    def it_should_finish_everything_it_started(self):
+        assert self.plugin.context_ended.call_count == 2
+
+    def cleanup_the_decorator(self):
+        del Batcher.batched_classes[self.spec]
+
+
+class WhenABatchFailsButNoneOfItsRowsFailOnTheirOwn:
+    def given_a_batched_test_class_which_checks_the_whole_batch(self):
+        @batched(size=3)
+        class BatchedSpec:
+            @classmethod
+            def examples(cls):
+                yield from range(3)
+
+            def it(self, rows):
+                assert len(rows) != 3
+        self.spec = BatchedSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            BatchedSpec.examples: EXAMPLES,
+            BatchedSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [Batcher(), self.plugin])
+
+    def it_should_report_the_failing_batch(self):
+        assert [str(c[0][1]) for c in self.plugin.context_started.call_args_list] == ["rows 0-2"]
+
+    def it_should_report_the_failure(self):
+        assert self.plugin.assertion_failed.call_count == 1
+
+    def cleanup_the_decorator(self):
+        del Batcher.batched_classes[self.spec]
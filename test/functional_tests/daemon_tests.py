@@ -0,0 +1,111 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import types
+import contexts
+from contexts import daemon
+from contexts.plugins.timeouts import TimeLimiter
+
+
+class WhenRunningTestsOnATestServer:
+    def establish_that_a_server_is_running(self):
+        self.folder = tempfile.mkdtemp()
+        with open(os.path.join(self.folder, 'test_served.py'), 'w') as f:
+            f.write("""
+import fractions
+import os
+# the standard library stays imported between runs, but the test module gets imported again
+fractions.contexts_test_runs = getattr(fractions, 'contexts_test_runs', 0) + 1
+
+class WhenRunningOnTheServer:
+    def it_should_say_which_run_it_is(self):
+        print("run", fractions.contexts_test_runs)
+        print("client", os.environ.get("CONTEXTS_TEST_CLIENT"))
+        assert False
+""")
+        self.socket_path = os.path.join(self.folder, 'daemon.sock')
+        self.env = dict(os.environ, CONTEXTS_SOCKET=self.socket_path)
+        self.server = subprocess.Popen([sys.executable, '-m', 'contexts', '--serve'], cwd=self.folder, env=self.env,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(100):
+            if daemon.is_listening(self.socket_path):
+                break
+            time.sleep(0.05)
+
+    def because_a_client_asks_for_the_tests_to_be_run_twice(self):
+        self.results = [self.run_client(name) for name in ["first", "second"]]
+
+    def it_should_send_the_output_to_the_client(self):
+        output, _ = self.results[0]
+        assert "When running on the server" in output
+        assert "run 1" in output
+
+    def it_should_import_the_test_module_again_on_the_next_run(self):
+        output, _ = self.results[1]
+        assert "run 2" in output
+
+    def it_should_run_the_tests_with_the_clients_environment_variables(self):
+        assert "client first" in self.results[0][0]
+        assert "client second" in self.results[1][0]
+
+    def the_server_should_not_keep_the_clients_environment_variables(self):
+        assert "client None" not in self.results[0][0]
+
+    def it_should_send_back_the_exit_code(self):
+        assert [exit_code for _, exit_code in self.results] == [1, 1]
+
+    def cleanup_the_server(self):
+        self.server.terminate()
+        self.server.wait(5)
+        shutil.rmtree(self.folder)
+
+    def run_client(self, name):
+        client = subprocess.run([sys.executable, '-m', 'contexts', '--client', '--no-random', '.'],
+                                cwd=self.folder, env=dict(self.env, CONTEXTS_TEST_CLIENT=name),
+                                stdout=subprocess.PIPE, universal_newlines=True)
+        return client.stdout, client.returncode
+
+
+class WhenThereIsNoTestServer:
+    def establish_that_nothing_is_listening(self):
+        self.folder = tempfile.mkdtemp()
+        with open(os.path.join(self.folder, 'test_not_served.py'), 'w') as f:
+            f.write("class WhenRunningWithoutAServer:\n    def it_should_pass(self):\n        pass\n")
+        self.env = dict(os.environ, CONTEXTS_SOCKET=os.path.join(self.folder, 'daemon.sock'))
+
+    def because_a_client_asks_for_the_tests_to_be_run(self):
+        self.client = subprocess.run([sys.executable, '-m', 'contexts', '--client', '.'], cwd=self.folder, env=self.env,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    def it_should_run_them_itself(self):
+        assert "1 context, 1 assertion" in self.client.stdout
+        assert self.client.returncode == 0
+
+    def it_should_say_so(self):
+        assert "No test server" in self.client.stderr
+
+    def cleanup_the_folder(self):
+        shutil.rmtree(self.folder)
+
+
+class WhenATestRunOnTheServerFinishes:
+    def establish_that_a_test_module_registered_a_class(self):
+        self.environment = daemon.TestRunEnvironment(os.getcwd(), dict(os.environ), [])
+        self.environment.__enter__()
+        module = types.ModuleType('daemon_test_module')
+        module.__file__ = os.path.join(tempfile.gettempdir(), 'daemon_test_module.py')
+        sys.modules[module.__name__] = module
+        self.cls = type('WhenRunningOnTheServer', (), {'__module__': module.__name__})
+        contexts.timeout(5)(self.cls)
+
+    def because_the_run_finishes(self):
+        self.environment.__exit__(None, None, None)
+
+    def it_should_forget_the_test_module(self):
+        assert 'daemon_test_module' not in sys.modules
+
+    def it_should_forget_the_modules_registered_classes(self):
+        assert self.cls not in TimeLimiter.limited_classes
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+from contexts import core, discovery
+from contexts.plugin_interface import PluginInterface, TEST_FOLDER
+
+
+class FolderIdentifier(object):
+    def __init__(self):
+        self.identified = []
+
+    def identify_folder(self, folder):
+        self.identified.append(folder)
+        if os.path.basename(folder).startswith('test'):
+            return TEST_FOLDER
+
+
+class DiscoverySharedContext:
+    def establish_that_there_is_a_tree_of_folders(self):
+        self.root = os.path.realpath(tempfile.mkdtemp())
+        for folder in ['test_one', 'test_one/test_nested', 'test_one/not_tests', 'test_two', 'not_tests', 'not_tests/test_hidden']:
+            os.makedirs(os.path.join(self.root, folder))
+        for path in ['test_one/__init__.py', 'test_one/test_nested/__init__.py', 'test_one/test_nested/test_file.py']:
+            open(os.path.join(self.root, path), 'w').close()
+        self.identifier = FolderIdentifier()
+
+    def cleanup_the_tree(self):
+        shutil.rmtree(self.root)
+
+
+class WhenWalkingTheTestFolders(DiscoverySharedContext):
+    @classmethod
+    def examples_of_thread_counts(cls):
+        yield 1
+        yield 4
+
+    def because_we_walk_the_tree(self, threads):
+        self.file_system = discovery.FileSystem(threads)
+        self.folders = list(self.file_system.walk_test_folders(self.root, self.identifier))
+
+    def it_should_find_the_test_folders_in_the_same_order_as_os_walk(self, threads):
+        expected = []
+        for folder, dirnames, _ in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d.startswith('test')]
+            expected.append(folder)
+        assert self.folders == expected
+
+    def it_should_not_look_inside_folders_which_are_not_test_folders(self, threads):
+        assert os.path.join(self.root, 'not_tests', 'test_hidden') not in self.identifier.identified
+
+
+class WhenDiscoveringTheSameFoldersMoreThanOnce(DiscoverySharedContext):
+    def establish_that_the_tree_has_been_walked(self):
+        self.file_system = discovery.FileSystem()
+        list(self.file_system.walk_test_folders(self.root, self.identifier))
+
+    def because_we_ask_about_the_packages_again(self):
+        with mock.patch('os.scandir', side_effect=AssertionError("scanned twice")) as self.scandir:
+            self.nested_is_package = self.file_system.ispackage(os.path.join(self.root, 'test_one', 'test_nested'))
+            self.spec = self.file_system.get_package_specification(os.path.join(self.root, 'test_one', 'test_nested'))
+
+    def it_should_not_scan_the_folders_again(self):
+        assert not self.scandir.called
+
+    def it_should_know_that_the_folder_is_a_package(self):
+        assert self.nested_is_package
+
+    def it_should_work_out_the_package_name(self):
+        assert self.spec == discovery.PackageSpecification(self.root, 'test_one.test_nested')
+
+
+class WhenDiscoveringTheSameFoldersByARelativePath(DiscoverySharedContext):
+    def establish_that_the_tree_has_been_walked_by_its_real_path(self):
+        self.file_system = discovery.FileSystem()
+        list(self.file_system.walk_test_folders(self.root, self.identifier))
+        self.old_cwd = os.getcwd()
+        os.chdir(self.root)
+
+    def because_we_walk_the_tree_again_from_inside(self):
+        with mock.patch('os.scandir', side_effect=AssertionError("scanned twice")) as self.scandir:
+            self.folders = list(self.file_system.walk_test_folders('test_one', self.identifier))
+
+    def it_should_not_scan_the_folders_again(self):
+        assert not self.scandir.called
+
+    def it_should_still_find_the_test_folders(self):
+        assert self.folders == ['test_one', os.path.join('test_one', 'test_nested')]
+
+    def cleanup_the_working_directory(self):
+        os.chdir(self.old_cwd)
+
+
+class WhenAFolderContainsASymlinkToAFile(DiscoverySharedContext):
+    def establish_that_there_is_a_symlink(self):
+        self.target = os.path.join(self.root, 'not_tests', 'test_real.py')
+        open(self.target, 'w').close()
+        os.symlink(self.target, os.path.join(self.root, 'test_two', 'test_link.py'))
+        self.identified_files = []
+        self.identifier.identify_file = self.identified_files.append
+
+    def because_we_look_for_test_files(self):
+        importer = discovery.create_importer(os.path.join(self.root, 'test_two'), self.identifier, None, discovery.FileSystem())
+        importer.get_file_details()
+
+    def it_should_identify_the_file_by_its_real_path(self):
+        assert self.identified_files == [self.target]
+
+
+class WhenAPluginSaysHowToReadTheFolders:
+    def establish_that_the_plugin_wants_threads(self):
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.get_discovery_threads.return_value = 4
+
+    def because_a_test_run_starts(self):
+        self.test_run = core.TestRun('.', core.PluginComposite([self.plugin]))
+
+    def it_should_read_the_folders_with_that_many_threads(self):
+        assert self.test_run.file_system.threads == 4
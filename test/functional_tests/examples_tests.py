@@ -1,3 +1,5 @@
+import inspect
+import itertools
 from unittest import mock
 from .tools import run_object
 from contexts.plugin_interface import PluginInterface, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN
@@ -161,6 +163,9 @@ class WhenNotifyingAPluginOfExamples:
         self.ParametrisedSpec = ParametrisedSpec
 
         self.plugin = mock.Mock(spec=PluginInterface)
+        del self.plugin.get_timeout
+        del self.plugin.get_discovery_threads
+        del self.plugin.wait_to_run_again
         self.plugin.identify_method.side_effect = lambda meth: {
             ParametrisedSpec.examples: EXAMPLES,
             ParametrisedSpec.it: ASSERTION
@@ -274,3 +279,101 @@ class WhenExamplesReturnsNone:
 
     def it_should_run_the_spec_once(self):
         assert self.spec.times_run == 1
+
+
+class WhenRunningAParametrisedSpecWithManyExamples:
+    def given_a_parametrised_test(self):
+        class ParametrisedSpec:
+            @classmethod
+            def examples(cls):
+                for i in range(10):
+                    yield (i, i)
+
+            def context(self, x, y):
+                pass
+
+            def it(self, x, y):
+                pass
+
+        self.ParametrisedSpec = ParametrisedSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            ParametrisedSpec.examples: EXAMPLES,
+            ParametrisedSpec.context: SETUP,
+            ParametrisedSpec.it: ASSERTION,
+        }[meth]
+
+    def because_we_run_the_class(self):
+        with mock.patch('inspect.signature', wraps=inspect.signature) as self.signature:
+            run_object(self.ParametrisedSpec, [self.plugin])
+
+    def it_should_only_inspect_each_method_once(self):
+        inspected = [c[1][0].__func__ for c in self.signature.mock_calls if c[0] == '']
+        assert len(inspected) == len(set(inspected))
+
+
+class WhenPluginsProcessTheExamples:
+    def given_a_parametrised_test_with_endless_test_cases(self):
+        class ParametrisedSpec:
+            assertions = []
+
+            @classmethod
+            def examples(cls):
+                yield from itertools.count()
+
+            def it(self, example):
+                self.__class__.assertions.append(example)
+        self.ParametrisedSpec = ParametrisedSpec
+
+        self.plugin1 = mock.Mock(spec=PluginInterface)
+        self.plugin1.identify_method.side_effect = lambda meth: {
+            ParametrisedSpec.examples: EXAMPLES,
+            ParametrisedSpec.it: ASSERTION
+        }[meth]
+        self.plugin1.process_examples.side_effect = lambda cls, examples: itertools.islice(examples, 3)
+        self.plugin2 = mock.Mock(spec=PluginInterface)
+        self.plugin2.process_examples.side_effect = lambda cls, examples: (e * 10 for e in examples)
+        self.plugin3 = mock.Mock(spec=PluginInterface)
+        self.plugin3.process_examples.return_value = None
+
+    def because_we_run_the_class(self):
+        run_object(self.ParametrisedSpec, [self.plugin1, self.plugin2, self.plugin3])
+
+    def it_should_pass_each_plugin_what_the_one_before_returned(self):
+        assert self.ParametrisedSpec.assertions == [0, 10, 20]
+
+    def it_should_tell_the_plugins_which_class_it_is(self):
+        assert self.plugin1.process_examples.call_args[0][0] is self.ParametrisedSpec
+
+
+class WhenRunningAParametrisedSpecWithLotsOfExamples:
+    def given_a_parametrised_test(self):
+        class ParametrisedSpec:
+            instances = []
+
+            @classmethod
+            def examples(cls):
+                yield from range(3)
+
+            def it(self, example):
+                self.__class__.instances.append(self)
+        self.spec = ParametrisedSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            ParametrisedSpec.examples: EXAMPLES,
+            ParametrisedSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_only_ask_the_plugins_about_the_assertions_once(self):
+        self.plugin.process_assertion_list.assert_called_once_with(self.spec, [self.spec.it])
+
+    def it_should_tell_the_plugins_about_the_assertion_on_each_instance(self):
+        assert self.plugin.assertion_passed.call_args_list == [mock.call(i.it) for i in self.spec.instances]
+
+    def it_should_use_a_new_instance_every_time(self):
+        assert len(set(map(id, self.spec.instances))) == 3
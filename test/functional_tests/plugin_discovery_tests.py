@@ -0,0 +1,36 @@
+import contextlib
+from io import StringIO
+from contexts import plugin_discovery
+from contexts.plugins.identification import NameBasedIdentifier
+
+
+class WhenFindingTheInstalledPlugins:
+    def because_we_look_up_the_entry_points(self):
+        self.entry_points = {ep.name: ep for ep in plugin_discovery.iter_entry_points('contexts.plugins')}
+
+    def it_should_find_the_builtin_plugins(self):
+        assert self.entry_points['NameBasedIdentifier'].load() is NameBasedIdentifier
+
+    def it_should_not_find_anything_for_an_unknown_group(self):
+        assert list(plugin_discovery.iter_entry_points('contexts.not_a_real_group')) == []
+
+
+class WhenThePluginsAreGivenOptionsWhichCantBeUsedTogether:
+    def because_we_load_the_plugins(self):
+        self.stderr = StringIO()
+        self.exception = None
+        try:
+            with contextlib.redirect_stderr(self.stderr):
+                plugin_discovery.load_plugins(['--profile', '--processes', '2'])
+        except SystemExit as e:
+            self.exception = e
+
+    def it_should_exit_like_argparse_does(self):
+        assert isinstance(self.exception, SystemExit)
+        assert self.exception.code == 2
+
+    def it_should_explain_the_problem(self):
+        assert "--profile can't be used with --processes or --concurrency" in self.stderr.getvalue()
+
+    def it_should_print_the_usage(self):
+        assert self.stderr.getvalue().startswith("usage:")
@@ -0,0 +1,280 @@
+import types
+from unittest import mock
+from .tools import run_object
+from contexts import errors
+from contexts.plugin_interface import (
+    PluginInterface, CONTEXT, EXAMPLES, SETUP, ASSERTION, TEARDOWN, SHARED_SETUP, SHARED_TEARDOWN
+)
+
+
+class WhenRunningAParametrisedSpecWithSharedFixtures:
+    def given_a_parametrised_test_with_an_expensive_fixture(self):
+        class ParametrisedSpec:
+            log = []
+
+            @classmethod
+            def examples(cls):
+                yield 1
+                yield 2
+
+            @classmethod
+            def prepare(cls):
+                cls.log.append("prepare")
+                cls.fixture = object()
+
+            def context(self, example):
+                self.__class__.log.append("setup {}".format(example))
+
+            def it(self, example):
+                self.__class__.log.append("assertion {}".format(example))
+                self.__class__.seen_fixtures = getattr(self.__class__, 'seen_fixtures', []) + [self.fixture]
+
+            def cleanup(self, example):
+                self.__class__.log.append("teardown {}".format(example))
+
+            @classmethod
+            def dispose(cls):
+                cls.log.append("dispose")
+        self.spec = ParametrisedSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            ParametrisedSpec.examples: EXAMPLES,
+            ParametrisedSpec.prepare: SHARED_SETUP,
+            ParametrisedSpec.context: SETUP,
+            ParametrisedSpec.it: ASSERTION,
+            ParametrisedSpec.cleanup: TEARDOWN,
+            ParametrisedSpec.dispose: SHARED_TEARDOWN
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_run_the_shared_fixtures_once_around_every_run_of_the_class(self):
+        assert self.spec.log == [
+            "prepare",
+            "setup 1", "assertion 1", "teardown 1",
+            "setup 2", "assertion 2", "teardown 2",
+            "dispose"
+        ]
+
+    def it_should_share_the_fixture_between_the_runs(self):
+        assert self.spec.seen_fixtures == [self.spec.fixture, self.spec.fixture]
+
+
+class WhenSharedFixturesAreInherited:
+    def given_a_subclass_of_a_class_with_shared_fixtures(self):
+        class Super:
+            log = []
+
+            @classmethod
+            def prepare(cls):
+                cls.log.append(("super prepare", cls))
+
+            @classmethod
+            def dispose(cls):
+                cls.log.append(("super dispose", cls))
+
+        class Spec(Super):
+            @classmethod
+            def prepare_more(cls):
+                cls.log.append(("prepare", cls))
+
+            def it(self):
+                self.__class__.log.append(("assertion", self.__class__))
+
+            @classmethod
+            def dispose_more(cls):
+                cls.log.append(("dispose", cls))
+        self.spec = Spec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            Super.prepare: SHARED_SETUP,
+            Super.dispose: SHARED_TEARDOWN,
+            Spec.prepare_more: SHARED_SETUP,
+            Spec.it: ASSERTION,
+            Spec.dispose_more: SHARED_TEARDOWN
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_run_the_superclass_setup_first_and_its_teardown_last_against_the_subclass(self):
+        assert self.spec.log == [
+            ("super prepare", self.spec),
+            ("prepare", self.spec),
+            ("assertion", self.spec),
+            ("dispose", self.spec),
+            ("super dispose", self.spec)
+        ]
+
+
+class WhenASharedSetupRaisesAnException:
+    def given_a_class_whose_shared_setup_throws(self):
+        self.exception = Exception()
+
+        class Spec:
+            log = []
+
+            @classmethod
+            def prepare(cls):
+                raise self.exception
+
+            def it(s):
+                s.__class__.log.append("assertion")
+
+            @classmethod
+            def dispose(cls):
+                cls.log.append("dispose")
+        self.spec = Spec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            Spec.prepare: SHARED_SETUP,
+            Spec.it: ASSERTION,
+            Spec.dispose: SHARED_TEARDOWN
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_not_run_any_contexts(self):
+        assert "assertion" not in self.spec.log
+
+    def it_should_still_run_the_shared_teardown(self):
+        assert self.spec.log == ["dispose"]
+
+    def it_should_tell_the_plugin_the_class_errored(self):
+        self.plugin.test_class_errored.assert_called_once_with(self.spec, self.exception)
+
+
+class WhenASharedFixtureIsNotAClassmethod:
+    def given_a_class_whose_shared_setup_is_an_ordinary_method(self):
+        self.ran_a_method = False
+
+        class Spec:
+            def setup_class(s):
+                self.ran_a_method = True
+
+            def it(s):
+                self.ran_a_method = True
+        self.spec = Spec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_method.side_effect = lambda meth: {
+            Spec.setup_class: SHARED_SETUP,
+            Spec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_call_unexpected_error_with_a_NotAClassMethodError(self):
+        assert isinstance(self.plugin.unexpected_error.call_args[0][0], errors.NotAClassMethodError)
+
+    def it_should_not_run_the_methods(self):
+        assert not self.ran_a_method
+
+
+class WhenAModuleHasSharedFixtures:
+    def given_a_module_with_shared_fixtures_and_two_classes(self):
+        self.log = []
+        self.module = types.ModuleType('fake_specs')
+
+        def prepare_the_module():
+            self.log.append("prepare")
+
+        def dispose_of_the_module():
+            self.log.append("dispose")
+
+        def helper_with_an_establish_and_an_it_in_its_name():
+            pass
+
+        class Spec1:
+            def it(s):
+                self.log.append("spec1")
+
+        class Spec2:
+            def it(s):
+                self.log.append("spec2")
+
+        for name, func in [('prepare_the_module', prepare_the_module),
+                           ('dispose_of_the_module', dispose_of_the_module),
+                           ('helper_with_an_establish_and_an_it_in_its_name', helper_with_an_establish_and_an_it_in_its_name)]:
+            func.__module__ = 'fake_specs'
+            setattr(self.module, name, func)
+        self.module.Spec1 = Spec1
+        self.module.Spec2 = Spec2
+        self.module.imported_function = run_object
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_class.return_value = CONTEXT
+
+        def identify_method(meth):
+            if meth is helper_with_an_establish_and_an_it_in_its_name:
+                raise errors.MethodNamingError()
+            return {
+                prepare_the_module: SHARED_SETUP,
+                dispose_of_the_module: SHARED_TEARDOWN,
+                Spec1.it: ASSERTION,
+                Spec2.it: ASSERTION
+            }[meth]
+        self.plugin.identify_method.side_effect = identify_method
+
+    def because_we_run_the_module(self):
+        run_object(self.module, [self.plugin])
+
+    def it_should_run_the_shared_fixtures_once_around_all_the_classes(self):
+        assert self.log == ["prepare", "spec1", "spec2", "dispose"]
+
+    def it_should_not_mind_helper_functions_with_ambiguous_names(self):
+        assert not self.plugin.unexpected_error.called
+
+    def it_should_not_ask_about_functions_imported_from_elsewhere(self):
+        assert mock.call(run_object) not in self.plugin.identify_method.call_args_list
+
+
+class WhenAModuleSharedSetupRaisesAnException:
+    def given_a_module_whose_shared_setup_throws(self):
+        self.log = []
+        self.exception = Exception()
+        self.module = types.ModuleType('fake_specs')
+
+        def prepare_the_module():
+            raise self.exception
+
+        def dispose_of_the_module():
+            self.log.append("dispose")
+
+        class Spec:
+            def it(s):
+                self.log.append("spec")
+
+        for func in [prepare_the_module, dispose_of_the_module]:
+            func.__module__ = 'fake_specs'
+            setattr(self.module, func.__name__, func)
+        self.module.Spec = Spec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.identify_class.return_value = CONTEXT
+        self.plugin.identify_method.side_effect = lambda meth: {
+            prepare_the_module: SHARED_SETUP,
+            dispose_of_the_module: SHARED_TEARDOWN,
+            Spec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_module(self):
+        run_object(self.module, [self.plugin])
+
+    def it_should_not_run_the_classes(self):
+        assert "spec" not in self.log
+
+    def it_should_still_run_the_shared_teardown(self):
+        assert self.log == ["dispose"]
+
+    def it_should_report_the_error(self):
+        self.plugin.unexpected_error.assert_called_once_with(self.exception)
+
+    def it_should_still_finish_the_suite(self):
+        self.plugin.suite_ended.assert_called_once_with(self.module)
@@ -0,0 +1,244 @@
+import asyncio
+import ctypes
+import signal
+import threading
+import time
+from unittest import mock
+from .tools import run_object, initialise_plugin
+from contexts import errors
+from contexts.core import Watchdog, TakenBack
+from contexts.plugin_interface import PluginInterface, ACTION, ASSERTION, TEARDOWN, EXAMPLES
+from contexts.plugins.event_loop import EventLoopProvider
+
+
+class WhenTheActionOfATestTakesTooLong:
+    def given_a_test_class_which_hangs(self):
+        class SlowSpec:
+            def because(s):
+                time.sleep(5)
+
+            def it(s):
+                pass
+
+            def cleanup(s):
+                s.__class__.cleaned_up = True
+        self.spec = SlowSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.get_timeout.return_value = 0.05
+        self.plugin.identify_method.side_effect = lambda meth: {
+            SlowSpec.because: ACTION,
+            SlowSpec.it: ASSERTION,
+            SlowSpec.cleanup: TEARDOWN
+        }[meth]
+
+    def because_we_run_the_class(self):
+        started = time.perf_counter()
+        run_object(self.spec, [self.plugin])
+        self.elapsed = time.perf_counter() - started
+
+    def it_should_interrupt_the_test(self):
+        assert self.elapsed < 1
+
+    def it_should_report_that_the_test_errored(self):
+        [(cls, _, exception), _] = self.plugin.context_errored.call_args
+        assert cls is self.spec
+        assert isinstance(exception, errors.TestTimeoutError)
+
+    def it_should_still_run_the_teardown(self):
+        assert self.spec.cleaned_up
+
+    def it_should_put_back_the_old_signal_handler(self):
+        assert signal.getsignal(signal.SIGALRM) is signal.SIG_DFL
+
+
+class WhenAnAssertionTakesTooLong:
+    def given_a_test_class_with_a_slow_assertion(self):
+        class SlowSpec:
+            def it_hangs(s):
+                time.sleep(5)
+
+            def it_passes(s):
+                pass
+        self.spec = SlowSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.get_timeout.return_value = 0.05
+        self.plugin.identify_method.side_effect = lambda meth: {
+            SlowSpec.it_hangs: ASSERTION,
+            SlowSpec.it_passes: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_report_that_the_assertion_errored(self):
+        [(func, exception), _] = self.plugin.assertion_errored.call_args
+        assert func.__name__ == 'it_hangs'
+        assert isinstance(exception, errors.TestTimeoutError)
+
+    def it_should_carry_on_with_the_other_assertions(self):
+        [(func,), _] = self.plugin.assertion_passed.call_args
+        assert func.__name__ == 'it_passes'
+
+
+class WhenOnlyTheAssertionTakesTooLong:
+    def given_a_test_class_with_a_quick_action(self):
+        class SlowSpec:
+            def because(s):
+                pass
+
+            def it(s):
+                time.sleep(0.1)
+        self.spec = SlowSpec
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.get_timeout.return_value = 0.05
+        self.plugin.identify_method.side_effect = lambda meth: {
+            SlowSpec.because: ACTION,
+            SlowSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        run_object(self.spec, [self.plugin])
+
+    def it_should_give_each_step_its_own_time_limit(self):
+        # the assertion alone takes longer than the limit; it mustn't be counting from the start of the action
+        assert self.plugin.assertion_errored.called
+
+    def it_should_not_report_that_the_setup_or_action_errored(self):
+        assert not self.plugin.context_errored.called
+
+
+class WhenAnAsyncTestTakesTooLongWhileRunningConcurrently:
+    def given_a_parametrised_async_test_class_with_a_slow_case(self):
+        class SlowSpec:
+            @classmethod
+            def examples(cls):
+                yield from [0.01, 5, 0.01]
+
+            async def because(s, delay):
+                await asyncio.sleep(delay)
+
+            def it(s, delay):
+                pass
+        self.spec = SlowSpec
+
+        self.provider, _ = initialise_plugin(EventLoopProvider(), '--concurrency', '3')
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.get_timeout.return_value = 0.1
+        self.plugin.identify_method.side_effect = lambda meth: {
+            SlowSpec.examples: EXAMPLES,
+            SlowSpec.because: ACTION,
+            SlowSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        started = time.perf_counter()
+        run_object(self.spec, [self.provider, self.plugin])
+        self.elapsed = time.perf_counter() - started
+
+    def it_should_stop_waiting_for_the_slow_one(self):
+        assert self.elapsed < 1
+
+    def it_should_report_that_it_errored(self):
+        [(_, example, exception), _] = self.plugin.context_errored.call_args
+        assert example == 5
+        assert isinstance(exception, errors.TestTimeoutError)
+
+    def it_should_run_the_others(self):
+        assert self.plugin.assertion_passed.call_count == 2
+
+
+class WhenASynchronousTestHangsWhileRunningConcurrently:
+    def given_a_parametrised_test_class_with_a_case_which_hangs(self):
+        class SlowSpec:
+            @classmethod
+            def examples(cls):
+                # the one that hangs holds up the event loop, so it goes first,
+                # before the others are waiting for anything
+                yield from [5, 0.01, 0.01]
+
+            def because(s, delay):
+                time.sleep(delay)
+
+            async def it(s, delay):
+                await asyncio.sleep(0.01)
+        self.spec = SlowSpec
+
+        self.provider, _ = initialise_plugin(EventLoopProvider(), '--concurrency', '3')
+
+        self.plugin = mock.Mock(spec=PluginInterface)
+        self.plugin.get_timeout.return_value = 0.1
+        self.plugin.identify_method.side_effect = lambda meth: {
+            SlowSpec.examples: EXAMPLES,
+            SlowSpec.because: ACTION,
+            SlowSpec.it: ASSERTION
+        }[meth]
+
+    def because_we_run_the_class(self):
+        started = time.perf_counter()
+        run_object(self.spec, [self.provider, self.plugin])
+        self.elapsed = time.perf_counter() - started
+
+    def it_should_interrupt_the_one_that_hangs(self):
+        assert self.elapsed < 1
+        [(_, example, exception), _] = self.plugin.context_errored.call_args
+        assert example == 5
+        assert isinstance(exception, errors.TestTimeoutError)
+
+    def it_should_run_the_others(self):
+        assert self.plugin.assertion_passed.call_count == 2
+
+    def it_should_put_back_the_old_signal_handler(self):
+        assert signal.getsignal(signal.SIGALRM) is signal.SIG_DFL
+
+
+class WhenATestTakesTooLongOutsideTheMainThread:
+    def establish_a_watchdog_in_another_thread(self):
+        self.exception = None
+
+        def run():
+            try:
+                with Watchdog(0.05):
+                    for _ in range(500):
+                        time.sleep(0.01)
+            except errors.TestTimeoutError as e:
+                self.exception = e
+        self.thread = threading.Thread(target=run)
+
+    def because_the_thread_runs(self):
+        self.thread.start()
+        self.thread.join(5)
+
+    def it_should_interrupt_it(self):
+        assert not self.thread.is_alive()
+        assert isinstance(self.exception, errors.TestTimeoutError)
+
+
+class WhenAWatchdogOutsideTheMainThreadGoesOffJustAsTheTestFinishes:
+    def establish_a_watchdog_in_another_thread(self):
+        self.calls = []
+
+        def run():
+            self.thread_id = threading.get_ident()
+            watchdog = Watchdog(5)
+            with watchdog:
+                # the timer goes off, but the exception hasn't reached the test yet
+                watchdog.interrupt(self.thread_id)
+        self.thread = threading.Thread(target=run)
+
+    def because_the_thread_runs(self):
+        with mock.patch.object(ctypes.pythonapi, 'PyThreadState_SetAsyncExc', self.set_async_exc):
+            self.thread.start()
+            self.thread.join(5)
+
+    def set_async_exc(self, thread_id, exception):
+        self.calls.append((thread_id.value, exception.value))
+
+    def it_should_replace_the_exception_with_one_that_it_takes_back(self):
+        assert self.calls == [(self.thread_id, errors.TestTimeoutError), (self.thread_id, TakenBack)]
+
+    def it_should_let_the_thread_finish(self):
+        assert not self.thread.is_alive()
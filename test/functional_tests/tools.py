@@ -1,3 +1,4 @@
+import argparse
 import contexts
 from contexts.plugins.test_target_suppliers import ObjectSupplier
 
@@ -19,3 +20,12 @@ def run_object(to_run, plugins):
     extra_plug = ObjectSupplier(to_run)
     plugins.insert(0, extra_plug)
     return contexts.run_with_plugins(plugins)
+
+
+# the functional tests can be run without the plugin tests,
+# so they can't borrow plugin_tests.tools.initialise_plugin
+def initialise_plugin(plugin, *argv):
+    parser = argparse.ArgumentParser()
+    plugin.setup_parser(parser)
+    enabled = plugin.initialise(parser.parse_args(list(argv)), {})
+    return plugin, enabled
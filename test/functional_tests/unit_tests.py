@@ -304,6 +304,8 @@ class WhenRunningASpecWithPlugins:
 
         self.plugin1 = Mock(wraps=PluginInterface())
         del self.plugin1.process_assertion_list
+        del self.plugin1.get_timeout
+        del self.plugin1.get_discovery_threads
         self.plugin1.identify_method = lambda meth: {
             TestSpec.method_with_establish_in_the_name: SETUP,
             TestSpec.method_with_because_in_the_name: ACTION,
@@ -312,6 +314,8 @@ class WhenRunningASpecWithPlugins:
         }[meth]
         self.plugin2 = Mock(wraps=PluginInterface())
         del self.plugin2.process_assertion_list
+        del self.plugin2.get_timeout
+        del self.plugin2.get_discovery_threads
 
     def because_we_run_the_spec(self):
         run_object(self.spec, [self.plugin1, self.plugin2])
@@ -327,21 +331,29 @@ class WhenRunningASpecWithPlugins:
     def it_should_call_context_started_with_the_name_and_the_example(self):
         assert self.calls[2] == mock.call.context_started(self.spec, NO_EXAMPLE)
 
+    @assertion
+    def it_should_call_action_started_once_the_setup_has_run(self):
+        assert self.calls[3] == mock.call.action_started(self.spec, NO_EXAMPLE)
+
     def it_should_call_assertion_started_for_the_assertion(self):
-        assert self.calls[3] == mock.call.assertion_started(self.spec.instance.method_with_should_in_the_name)
+        assert self.calls[4] == mock.call.assertion_started(self.spec.instance.method_with_should_in_the_name)
 
     def it_should_call_assertion_passed_for_the_assertion(self):
-        assert self.calls[4] == mock.call.assertion_passed(self.spec.instance.method_with_should_in_the_name)
+        assert self.calls[5] == mock.call.assertion_passed(self.spec.instance.method_with_should_in_the_name)
+
+    @assertion
+    def it_should_call_teardown_started_before_the_teardown(self):
+        assert self.calls[6] == mock.call.teardown_started(self.spec, NO_EXAMPLE)
 
     @assertion
     def it_should_call_context_ended_next(self):
-        assert self.calls[5] == mock.call.context_ended(self.spec, NO_EXAMPLE)
+        assert self.calls[7] == mock.call.context_ended(self.spec, NO_EXAMPLE)
 
     def it_should_call_test_class_ended(self):
-        assert self.calls[6] == mock.call.test_class_ended(self.spec)
+        assert self.calls[8] == mock.call.test_class_ended(self.spec)
 
     def finally_it_should_call_test_run_ended(self):
-        assert self.calls[7] == mock.call.test_run_ended()
+        assert self.calls[9] == mock.call.test_run_ended()
 
     def it_should_do_exactly_the_same_to_the_other_plugin(self):
         assert self.plugin2.mock_calls == self.calls
@@ -752,5 +764,101 @@ class WhenAPluginModifiesAClassList:
         assert not self.ran_reals
 
 
+class WhenCallingAHookThatOnlySomePluginsImplement:
+    def establish_a_composite_of_plugins(self):
+        class NotImplemented:
+            pass
+
+        class Inherited(PluginInterface):
+            pass
+
+        class ReturnsNone:
+            def get_exit_code(s):
+                self.log.append('returns none')
+
+        class ReturnsSomething:
+            def get_exit_code(s):
+                self.log.append('returns something')
+                return 3
+
+        class TooLate:
+            def get_exit_code(s):
+                self.log.append('too late')
+                return 4
+
+        self.log = []
+        self.composite = contexts.core.PluginComposite([NotImplemented(), Inherited(), ReturnsNone(), ReturnsSomething(), TooLate()])
+
+    def because_we_call_the_hook(self):
+        self.result = self.composite.get_exit_code()
+
+    def it_should_return_the_first_reply_which_is_not_none(self):
+        assert self.result == 3
+
+    def it_should_call_the_implementations_in_order_until_one_replies(self):
+        assert self.log == ['returns none', 'returns something']
+
+
+class WhenCallingAHookThatNoPluginsImplement:
+    def establish_a_composite_of_plugins(self):
+        self.composite = contexts.core.PluginComposite([object(), PluginInterface()])
+
+    def because_we_call_the_hook(self):
+        self.result = self.composite.identify_class(type)
+
+    def it_should_return_none(self):
+        assert self.result is None
+
+
+class WhenAskingACompositeForSomethingThatIsNotAHook:
+    def establish_a_composite_of_plugins(self):
+        self.composite = contexts.core.PluginComposite([Mock()])
+
+    def because_we_ask_for_a_method_that_is_not_in_the_interface(self):
+        self.exception = contexts.catch(lambda: self.composite.not_a_hook)
+
+    def it_should_raise_an_attribute_error(self):
+        assert isinstance(self.exception, AttributeError)
+
+
+class WhenSeveralClassesShareABaseClass:
+    def establish_two_classes_with_the_same_superclass(self):
+        self.log = []
+
+        class Super:
+            def method_one(s):
+                self.log.append("super setup")
+
+        class Spec1(Super):
+            def method_two(s):
+                self.log.append("spec1 assertion")
+
+        class Spec2(Super):
+            def method_three(s):
+                self.log.append("spec2 assertion")
+
+        self.super = Super
+        self.module = types.ModuleType('fake_specs')
+        self.module.Spec1 = Spec1
+        self.module.Spec2 = Spec2
+
+        self.plugin = Mock(spec=PluginInterface)
+        self.plugin.identify_class.return_value = CONTEXT
+        self.plugin.identify_method.side_effect = lambda meth: {
+            Super.method_one: SETUP,
+            Spec1.method_two: ASSERTION,
+            Spec2.method_three: ASSERTION,
+        }.get(meth)
+
+    def because_we_run_the_module(self):
+        run_object(self.module, [self.plugin])
+
+    def it_should_only_ask_the_plugin_about_the_superclass_method_once(self):
+        assert self.plugin.identify_method.call_args_list.count(mock.call(self.super.method_one)) == 1
+
+    def it_should_run_the_superclass_setup_for_both_classes(self):
+        assert self.log.count("super setup") == 2
+
+
 if __name__ == "__main__":
     contexts.main()
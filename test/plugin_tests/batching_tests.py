@@ -0,0 +1,51 @@
+import itertools
+from contexts import catch
+from contexts.plugins.batching import Batcher, batched
+
+
+class WhenBatchingTheExamplesOfASubclass:
+    def establish_that_a_superclass_is_batched(self):
+        class Super:
+            pass
+        batched(size=4, collate=tuple)(Super)
+
+        class Spec(Super):
+            pass
+        self.super = Super
+        self.spec = Spec
+        self.examples = itertools.count()
+
+    def because_we_process_the_cases(self):
+        self.batches = Batcher().process_examples(self.spec, self.examples)
+        self.first_two = list(itertools.islice(self.batches, 2))
+
+    def it_should_chunk_them(self):
+        assert [b.data for b in self.first_two] == [(0, 1, 2, 3), (4, 5, 6, 7)]
+
+    def it_should_number_the_rows(self):
+        assert [b.start for b in self.first_two] == [0, 4]
+
+    def it_should_not_read_any_more_of_them(self):
+        assert next(self.examples) == 8
+
+    def it_should_split_a_batch_into_rows(self):
+        assert [(r.start, r.data) for r in self.first_two[1].rows()] == [(4, (4,)), (5, (5,)), (6, (6,)), (7, (7,))]
+
+    def cleanup_the_decorator(self):
+        del Batcher.batched_classes[self.super]
+
+
+class WhenProcessingTheExamplesOfAnOrdinaryClass:
+    def because_we_process_the_cases(self):
+        self.result = Batcher().process_examples(WhenProcessingTheExamplesOfAnOrdinaryClass, [1, 2])
+
+    def it_should_leave_them_alone(self):
+        assert self.result is None
+
+
+class WhenBatchingWithAnEmptyBatchSize:
+    def because_we_decorate_a_class(self):
+        self.exception = catch(batched(size=0), WhenBatchingWithAnEmptyBatchSize)
+
+    def it_should_throw_a_ValueError(self):
+        assert isinstance(self.exception, ValueError)
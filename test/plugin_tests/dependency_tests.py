@@ -0,0 +1,163 @@
+import json
+import os
+import sys
+from contexts import catch, errors
+from contexts.plugins.dependencies import DependencyTracker
+from contexts.plugins.importing import Importer
+from contexts.plugins.parallel import ParallelRunner
+from contexts.plugins.result_cache import ResultCache
+from contexts.plugin_interface import IGNORED
+from .tools import initialise_plugin, TemporaryFolderSharedContext
+
+
+class DependencyTrackerSharedContext(TemporaryFolderSharedContext):
+    def establish_that_there_is_a_project(self):
+        self.cache_dir = os.path.join(self.folder, 'cache')
+        self.library = self.write_file('dependency_tracker_library.py', "def f():\n    return 1\n")
+        self.other_library = self.write_file('dependency_tracker_other_library.py', "def g():\n    return 2\n")
+        self.test_file = self.write_file('test_dependency_tracker.py', "from dependency_tracker_library import f\n")
+
+    def make_plugin(self, *argv, plugins=()):
+        plugin, self.enabled = initialise_plugin(DependencyTracker(), '--cache-dir', self.cache_dir, *argv,
+                                                 plugins=plugins, options_from=[ResultCache()])
+        return plugin
+
+    def record_a_run(self):
+        sys.path.insert(0, self.folder)
+        importer = Importer()
+        plugin = self.make_plugin('--only-changed', plugins=[importer])
+        importer.import_module(self.folder, 'test_dependency_tracker')
+        plugin.test_run_ended()
+
+    def read_records(self):
+        with open(os.path.join(self.cache_dir, 'dependencies.json'), 'r') as f:
+            return json.load(f)['modules']
+
+    def cleanup_the_project(self):
+        if sys.path[0] == self.folder:
+            del sys.path[0]
+        for name in ['test_dependency_tracker', 'dependency_tracker_library', 'dependency_tracker_other_library',
+                     'dependency_tracker_helper']:
+            sys.modules.pop(name, None)
+
+
+class WhenATestModuleIsImported(DependencyTrackerSharedContext):
+    def because_we_record_a_run(self):
+        self.record_a_run()
+
+    def it_should_record_the_module_name(self):
+        assert self.read_records()[self.test_file]['module'] == 'test_dependency_tracker'
+
+    def it_should_record_the_module_it_imported(self):
+        assert self.read_records()[self.test_file]['imports'] == [self.library]
+
+    def it_should_record_the_imported_module_too(self):
+        assert self.read_records()[self.library]['imports'] == []
+
+    def it_should_not_record_modules_it_did_not_import(self):
+        assert self.other_library not in self.read_records()
+
+
+class WhenATestModuleImportsANameFromAModuleWhichWasAlreadyImported(DependencyTrackerSharedContext):
+    def establish_that_the_library_has_already_been_imported(self):
+        self.write_file('dependency_tracker_library.py', "CONSTANT = 1\n")
+        self.write_file('test_dependency_tracker.py', "from dependency_tracker_library import CONSTANT\n")
+        sys.path.insert(0, self.folder)
+        __import__('dependency_tracker_library')
+
+    def because_we_record_a_run(self):
+        self.record_a_run()
+
+    def it_should_still_record_the_dependency(self):
+        assert self.read_records()[self.test_file]['imports'] == [self.library]
+
+
+class WhenTheTrackerIsNotAskedFor(DependencyTrackerSharedContext):
+    def because_we_initialise_the_plugin_without_any_of_its_options(self):
+        self.make_plugin()
+
+    def it_should_switch_itself_off(self):
+        assert self.enabled is False
+
+
+class WhenTheTrackerIsAskedForAlongWithWorkerProcesses(DependencyTrackerSharedContext):
+    def because_we_initialise_the_plugin_with_processes(self):
+        self.exception = catch(initialise_plugin, DependencyTracker(), '--only-changed', '--processes', '4',
+                               options_from=[ParallelRunner()])
+
+    def it_should_refuse(self):
+        assert isinstance(self.exception, errors.UsageError)
+
+
+class WhenNoDependenciesHaveChanged(DependencyTrackerSharedContext):
+    def establish_that_the_module_has_been_run(self):
+        self.record_a_run()
+        self.plugin = self.make_plugin('--only-changed')
+
+    def because_we_identify_the_file(self):
+        self.result = self.plugin.identify_file(self.test_file)
+
+    def it_should_skip_it(self):
+        assert self.result is IGNORED
+
+
+class WhenADependencyOfADependencyHasChanged(DependencyTrackerSharedContext):
+    def establish_that_the_library_is_imported_through_a_helper(self):
+        self.write_file('dependency_tracker_helper.py', "from dependency_tracker_library import f\n")
+        self.write_file('test_dependency_tracker.py', "import dependency_tracker_helper\n")
+        self.record_a_run()
+        stat = os.stat(self.library)
+        os.utime(self.library, (stat.st_atime, stat.st_mtime + 10))
+        self.plugin = self.make_plugin('--only-changed')
+
+    def because_we_identify_the_file(self):
+        self.result = self.plugin.identify_file(self.test_file)
+
+    def it_should_leave_it_to_the_other_plugins(self):
+        assert self.result is None
+
+
+class WhenADependencyHasChanged(DependencyTrackerSharedContext):
+    def establish_that_the_library_is_newer_than_the_record(self):
+        self.record_a_run()
+        stat = os.stat(self.library)
+        os.utime(self.library, (stat.st_atime, stat.st_mtime + 10))
+        self.plugin = self.make_plugin('--only-changed')
+
+    def because_we_identify_the_file(self):
+        self.result = self.plugin.identify_file(self.test_file)
+
+    def it_should_leave_it_to_the_other_plugins(self):
+        assert self.result is None
+
+
+class WhenGivenAListOfChangedFiles(DependencyTrackerSharedContext):
+    @classmethod
+    def examples(cls):
+        yield ('dependency_tracker_library.py', None)
+        yield ('dependency_tracker_other_library.py', IGNORED)
+
+    def establish_that_the_module_has_been_run(self, changed, expected):
+        self.record_a_run()
+        self.changed_files = self.write_file('changed.txt', os.path.join(self.folder, changed) + '\n')
+        self.plugin = self.make_plugin('--changed-files', self.changed_files)
+
+    def because_we_identify_the_file(self, changed, expected):
+        self.result = self.plugin.identify_file(self.test_file)
+
+    def it_should_only_skip_it_if_none_of_its_dependencies_changed(self, changed, expected):
+        assert self.result is expected
+
+
+class WhenAnUnchangedModuleFailedLastTime(DependencyTrackerSharedContext):
+    def establish_that_the_module_failed(self):
+        self.record_a_run()
+        result_cache = ResultCache()
+        result_cache.failed_modules = {'test_dependency_tracker'}
+        self.plugin = self.make_plugin('--only-changed', plugins=[result_cache])
+
+    def because_we_identify_the_file(self):
+        self.result = self.plugin.identify_file(self.test_file)
+
+    def it_should_leave_it_to_the_other_plugins(self):
+        assert self.result is None
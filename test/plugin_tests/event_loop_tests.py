@@ -0,0 +1,54 @@
+from contexts.plugins.event_loop import EventLoopProvider
+from .tools import initialise_plugin
+
+
+class WhenSharingTheEventLoopBetweenModules:
+    def establish_that_a_module_has_used_the_loop(self):
+        self.provider, self.enabled = initialise_plugin(EventLoopProvider())
+        self.first_loop = self.provider.get_event_loop()
+        self.provider.suite_ended(None)
+
+    def because_the_next_module_asks_for_the_loop(self):
+        self.second_loop = self.provider.get_event_loop()
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_give_it_the_same_loop(self):
+        assert self.second_loop is self.first_loop
+
+    def it_should_close_the_loop_at_the_end_of_the_run(self):
+        self.provider.test_run_ended()
+        assert self.first_loop.is_closed()
+
+
+class WhenUsingANewEventLoopForEachModule:
+    def establish_that_a_module_has_used_the_loop(self):
+        self.provider, _ = initialise_plugin(EventLoopProvider(), '--event-loop', 'module')
+        self.first_loop = self.provider.get_event_loop()
+
+    def because_the_module_ends(self):
+        self.provider.suite_ended(None)
+
+    def it_should_close_the_loop(self):
+        assert self.first_loop.is_closed()
+
+    def it_should_give_the_next_module_a_new_loop(self):
+        assert self.provider.get_event_loop() is not self.first_loop
+
+    def cleanup_the_loop(self):
+        self.provider.test_run_ended()
+
+
+class WhenNoAsyncTestsRun:
+    def establish_that_the_provider_is_on(self):
+        self.provider, _ = initialise_plugin(EventLoopProvider(), '--concurrency', '4')
+
+    def because_the_run_ends(self):
+        self.provider.test_run_ended()
+
+    def it_should_not_have_made_a_loop(self):
+        assert self.provider.loop is None
+
+    def it_should_report_the_concurrency(self):
+        assert self.provider.get_concurrency() == 4
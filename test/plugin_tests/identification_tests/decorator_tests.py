@@ -1,6 +1,8 @@
-from contexts.plugin_interface import CONTEXT, IGNORED, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN
+from contexts.plugin_interface import (
+    CONTEXT, IGNORED, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, SHARED_SETUP, SHARED_TEARDOWN
+)
 from contexts.plugins.identification.decorators import DecoratorBasedIdentifier
-from contexts import catch, spec, context, ignored, examples, setup, action, assertion, teardown
+from contexts import catch, spec, context, ignored, examples, setup, action, assertion, teardown, shared_setup, shared_teardown
 
 
 class WhenMarkingAClassAsASpec:
@@ -130,6 +132,28 @@ class WhenMarkingAMethodAsATeardown:
         assert self.result is TEARDOWN
 
 
+class WhenMarkingAMethodAsASharedFixture:
+    @classmethod
+    def examples(cls):
+        yield shared_setup, SHARED_SETUP
+        yield shared_teardown, SHARED_TEARDOWN
+
+    def context(self, decorator, expected):
+        class Spec:
+            @classmethod
+            @decorator
+            def innocuous_method(cls):
+                pass
+        self.method = Spec.innocuous_method
+        self.identifier = DecoratorBasedIdentifier()
+
+    def because_the_framework_asks_the_plugin_to_identify_the_method(self, decorator, expected):
+        self.result = self.identifier.identify_method(self.method)
+
+    def it_should_identify_it_as_a_shared_fixture(self, decorator, expected):
+        assert self.result is expected
+
+
 class WhenMarkingAMethodAsTwoThings:
     @classmethod
     def examples(cls):
@@ -138,6 +162,8 @@ class WhenMarkingAMethodAsTwoThings:
         yield action, assertion
         yield assertion, teardown
         yield teardown, examples
+        yield shared_setup, setup
+        yield shared_teardown, shared_setup
 
     def given_an_attempt_to_use_multiple_decorators(self, decorator1, decorator2):
         def throwing_func():
@@ -1,6 +1,8 @@
 import os.path
 import contexts
-from contexts.plugin_interface import TEST_FOLDER, TEST_FILE, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN
+from contexts.plugin_interface import (
+    TEST_FOLDER, TEST_FILE, CONTEXT, EXAMPLES, SETUP, ACTION, ASSERTION, TEARDOWN, SHARED_SETUP, SHARED_TEARDOWN
+)
 from contexts.plugins.identification import NameBasedIdentifier
 from contexts import assertion, examples
 
@@ -547,6 +549,105 @@ class WhenATeardownMethodIsAmbiguous:
         assert isinstance(self.exception, contexts.errors.MethodNamingError)
 
 
+class WhenIdentifyingASharedFixture:
+    @classmethod
+    def examples_of_legal_shared_fixture_names(self):
+        def setup_class_with_a_database():
+            pass
+
+        yield setup_class_with_a_database, SHARED_SETUP
+
+        def teardown_class():
+            pass
+
+        yield teardown_class, SHARED_TEARDOWN
+
+        def setupModule():
+            pass
+
+        yield setupModule, SHARED_SETUP
+
+        def teardown_module_database():
+            pass
+
+        yield teardown_module_database, SHARED_TEARDOWN
+
+    def establish(self):
+        self.identifier = NameBasedIdentifier()
+
+    def because_the_framework_asks_the_plugin_to_identify_the_method(self, method, expected):
+        self.result = self.identifier.identify_method(method)
+
+    def it_should_identify_it_as_a_shared_fixture(self, method, expected):
+        assert self.result is expected
+
+
+class WhenAMethodNameContainsWordsThatAreNotASharedFixturePrefix:
+    @classmethod
+    def examples_of_method_names(self):
+        def it_should_dispose_of_the_socket():
+            pass
+
+        yield it_should_dispose_of_the_socket, ASSERTION
+
+        def prepare_a_request():
+            pass
+
+        yield prepare_a_request, None
+
+        def after_all_the_retries():
+            pass
+
+        yield after_all_the_retries, ACTION
+
+        def before_all_the_retries():
+            pass
+
+        yield before_all_the_retries, None
+
+        def a_helper_to_setup_class_attributes():
+            pass
+
+        yield a_helper_to_setup_class_attributes, None
+
+    def establish(self):
+        self.identifier = NameBasedIdentifier()
+
+    def because_the_framework_asks_the_plugin_to_identify_the_method(self, method, expected):
+        self.result = self.identifier.identify_method(method)
+
+    def it_should_not_identify_it_as_a_shared_fixture(self, method, expected):
+        assert self.result is expected
+
+
+class WhenASharedFixtureIsAmbiguous:
+    @classmethod
+    def examples_of_ambiguous_shared_fixture_names(self):
+        def setup_class_and_establish():
+            pass
+
+        yield setup_class_and_establish
+
+        def teardown_class_and_cleanup():
+            pass
+
+        yield teardown_class_and_cleanup
+
+        def setup_class_because():
+            pass
+
+        yield setup_class_because
+
+    def establish(self):
+        self.identifier = NameBasedIdentifier()
+
+    def because_the_framework_asks_the_plugin_to_identify_the_method(self, method):
+        self.exception = contexts.catch(self.identifier.identify_method, method)
+
+    def it_should_throw_a_MethodNamingError(self):
+        assert isinstance(self.exception, contexts.errors.MethodNamingError)
+
+
 class WhenIdentiyingANormalMethod:
     @classmethod
     def examples_of_uninteresting_names(self):
@@ -586,3 +687,37 @@ class WhenAMethodContainsAKeywordAsPartOfAWord:
 
     def it_should_ignore_it(self):
         assert self.result is None
+
+
+class WhenIdentifyingAnAmbiguousMethodForASecondTime:
+    def establish_that_the_method_has_already_been_identified(self):
+        def method_with_establish_and_should_in_the_name():
+            pass
+        self.method = method_with_establish_and_should_in_the_name
+        self.identifier = NameBasedIdentifier()
+        contexts.catch(self.identifier.identify_method, self.method)
+
+    def because_the_framework_asks_the_plugin_to_identify_the_method_again(self):
+        self.exception = contexts.catch(self.identifier.identify_method, self.method)
+
+    def it_should_still_throw_a_MethodNamingError(self):
+        assert isinstance(self.exception, contexts.errors.MethodNamingError)
+
+
+class WhenIdentifyingTwoMethodsWithTheSameName:
+    def establish_two_methods_with_the_same_name(self):
+        class First:
+            def because_something_happens(self):
+                pass
+
+        class Second:
+            def because_something_happens(self):
+                pass
+        self.methods = [First.because_something_happens, Second.because_something_happens]
+        self.identifier = NameBasedIdentifier()
+
+    def because_the_framework_asks_the_plugin_to_identify_both_methods(self):
+        self.results = [self.identifier.identify_method(m) for m in self.methods]
+
+    def it_should_identify_both_of_them(self):
+        assert self.results == [ACTION, ACTION]
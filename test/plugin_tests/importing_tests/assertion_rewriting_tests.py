@@ -2,9 +2,10 @@ import importlib
 import os
 import shutil
 import sys
+from unittest import mock
 import contexts
 from contexts import action, assertion
-from contexts.plugins.importing.assertion_rewriting import AssertionRewritingImporter
+from contexts.plugins.importing.assertion_rewriting import AssertionRewritingImporter, AssertionRewritingLoader, get_cache_path
 
 
 THIS_FILE = os.path.realpath(__file__)
@@ -766,3 +767,136 @@ def assertion_func():
     @assertion
     def the_exception_should_be_given_a_generated_message(self):
         assert self.exc.args[0] == "Not all elements of [True, 1, 0, False, '', 'hello'] were truthy. First falsy element: 0 at position 2"
+
+
+class AssertionRewritingCacheSharedContext(AssertionRewritingSharedContext):
+    def establish_that_bytecode_can_be_written(self):
+        self.old_dont_write_bytecode = sys.dont_write_bytecode
+        sys.dont_write_bytecode = False
+
+    def cleanup_the_bytecode_setting(self):
+        sys.dont_write_bytecode = self.old_dont_write_bytecode
+
+
+class WhenImportingARewrittenModuleForASecondTime(AssertionRewritingCacheSharedContext):
+    def context(self):
+        self.code = """
+def assertion_func():
+    assert 1 == 2
+"""
+        self.write_file()
+        self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        del sys.modules[self.module_name]
+
+    @action
+    def when_we_import_the_module_again(self):
+        with mock.patch.object(AssertionRewritingLoader, 'source_to_code') as self.source_to_code:
+            self.module = self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        self.exc = contexts.catch(self.module.assertion_func)
+
+    def it_should_write_the_rewritten_code_to_the_cache(self):
+        assert os.path.isfile(get_cache_path(self.filename))
+
+    def it_should_not_rewrite_the_module_again(self):
+        assert not self.source_to_code.called
+
+    @assertion
+    def the_cached_code_should_have_the_generated_message(self):
+        assert self.exc.args[0] == "Asserted 1 == 2 but found them not to be equal"
+
+
+class WhenARewrittenModuleChangesAfterItWasCached(AssertionRewritingCacheSharedContext):
+    def context(self):
+        self.code = """
+def assertion_func():
+    assert 1 == 2
+"""
+        self.write_file()
+        self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        del sys.modules[self.module_name]
+
+        # same length, and probably the same mtime, as the original
+        with open(self.filename, 'w') as f:
+            f.write(self.code.replace('1 == 2', '3 == 4'))
+
+    @action
+    def when_we_import_the_module_again(self):
+        self.module = self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        self.exc = contexts.catch(self.module.assertion_func)
+
+    @assertion
+    def the_exception_should_come_from_the_new_code(self):
+        assert self.exc.args[0] == "Asserted 3 == 4 but found them not to be equal"
+
+
+class WhenACachedModuleIsImportedFromAFolderThatHasMoved(AssertionRewritingCacheSharedContext):
+    def context(self):
+        self.code = """
+def assertion_func():
+    assert 1 == 2
+"""
+        self.write_file()
+        self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        del sys.modules[self.module_name]
+        self.moved_dir = TEST_DATA_DIR + "_moved"
+
+    @action
+    def when_we_move_the_folder_and_import_the_module_again(self):
+        os.rename(TEST_DATA_DIR, self.moved_dir)
+        try:
+            with mock.patch.object(AssertionRewritingLoader, 'source_to_code') as self.source_to_code:
+                self.module = self.importer.import_module(self.moved_dir, self.module_name)
+        finally:
+            os.rename(self.moved_dir, TEST_DATA_DIR)
+
+    def it_should_use_the_cached_code(self):
+        assert not self.source_to_code.called
+
+    def the_code_should_know_where_the_file_is_now(self):
+        assert self.module.assertion_func.__code__.co_filename == os.path.join(self.moved_dir, self.module_name + ".py")
+
+
+class WhenTheRewritingCacheIsCorrupt(AssertionRewritingCacheSharedContext):
+    def context(self):
+        self.code = """
+def assertion_func():
+    assert 1 == 2
+"""
+        self.write_file()
+        self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        del sys.modules[self.module_name]
+
+        cache_path = get_cache_path(self.filename)
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        with open(cache_path, 'wb') as f:
+            f.write(data[:-10])
+
+    @action
+    def when_we_import_the_module_again(self):
+        self.module = self.importer.import_module(TEST_DATA_DIR, self.module_name)
+        self.exc = contexts.catch(self.module.assertion_func)
+
+    @assertion
+    def the_module_should_be_rewritten_again(self):
+        assert self.exc.args[0] == "Asserted 1 == 2 but found them not to be equal"
+
+
+class WhenImportingARewrittenModuleAndBytecodeIsDisabled(AssertionRewritingSharedContext):
+    def context(self):
+        self.code = """
+def assertion_func():
+    assert 1 == 2
+"""
+        self.write_file()
+        self.old_dont_write_bytecode = sys.dont_write_bytecode
+        sys.dont_write_bytecode = True
+
+    def because_we_import_the_module(self):
+        self.importer.import_module(TEST_DATA_DIR, self.module_name)
+
+    def it_should_not_write_to_the_cache(self):
+        assert not os.path.exists(get_cache_path(self.filename))
+
+    def cleanup_the_bytecode_setting(self):
+        sys.dont_write_bytecode = self.old_dont_write_bytecode
@@ -0,0 +1,269 @@
+import os
+import sys
+from io import StringIO
+from unittest import mock
+from multiprocessing.pool import RemoteTraceback
+import contexts
+from contexts import timing
+from contexts.plugins.parallel import ParallelRunner, Event, ExceptionReference, ExampleReference, ClassReference
+from contexts.plugins.importing import Importer
+from contexts.plugins.test_target_suppliers import ObjectSupplier
+from contexts.plugins.identification import NameBasedIdentifier
+from contexts.plugin_interface import NO_EXAMPLE
+from .tools import initialise_plugin, TemporaryFolderSharedContext
+
+
+class WhenInitialisingTheParallelRunner:
+    @classmethod
+    def examples(cls):
+        yield ([], False)
+        yield (['--processes', '1'], False)
+        yield (['--processes', '4'], True)
+
+    def because_we_initialise_the_plugin(self, argv, expected):
+        _, self.result = initialise_plugin(ParallelRunner(), *argv)
+
+    def it_should_only_activate_for_more_than_one_process(self, argv, expected):
+        assert self.result is expected
+
+
+class WhenRunningOneProcessPerCPUButTheNumberOfCPUsIsUnknown:
+    def establish_that_the_cpus_cannot_be_counted(self):
+        self.patch = mock.patch('os.cpu_count', return_value=None)
+        self.patch.start()
+
+    def because_we_initialise_the_plugin(self):
+        self.runner, self.enabled = initialise_plugin(ParallelRunner(), '--processes', '0')
+
+    def it_should_use_one_process(self):
+        assert self.runner.processes == 1
+
+    def it_should_not_activate(self):
+        assert self.enabled is False
+
+    def cleanup_the_patch(self):
+        self.patch.stop()
+
+
+class WhenAskingForProcessesOnAPlatformWhichCantFork:
+    def establish_that_fork_is_not_supported(self):
+        self.patch = mock.patch('multiprocessing.get_all_start_methods', return_value=['spawn'])
+        self.patch.start()
+
+    def because_we_initialise_the_plugin(self):
+        self.exception = contexts.catch(initialise_plugin, ParallelRunner(), '--processes', '4')
+
+    def it_should_refuse(self):
+        assert isinstance(self.exception, contexts.errors.UsageError)
+        assert str(self.exception) == "--processes can't be used on this platform, because it doesn't support fork()"
+
+    def cleanup_the_patch(self):
+        self.patch.stop()
+
+
+class EventLog(object):
+    def __init__(self):
+        self.events = []
+        self.times = []
+
+    def initialise(self, args, env):
+        return True
+
+    def suite_started(self, module):
+        self.events.append(('suite_started', module.__name__))
+
+    def context_started(self, cls, example):
+        self.events.append(('context_started', cls.__name__))
+        self.times.append(timing.now())
+
+    def assertion_passed(self, func):
+        self.events.append(('assertion_passed', func.__name__))
+
+    def assertion_failed(self, func, exception):
+        self.events.append(('assertion_failed', func.__name__, type(exception)))
+
+    def unexpected_error(self, exception):
+        self.events.append(('unexpected_error', type(exception)))
+
+
+class WhenRunningAFolderInParallel(TemporaryFolderSharedContext):
+    def establish_that_there_is_a_folder_of_test_modules(self):
+        self.write_file('test_parallel_one.py', """
+class WhenRunningInAWorker:
+    def it_should_pass(self):
+        pass
+    def it_should_fail(self):
+        assert False
+""")
+        self.write_file('test_parallel_two.py', """
+class WhenRunningInAnotherWorker:
+    def it_should_pass(self):
+        pass
+""")
+        self.write_file('test_parallel_broken.py', "raise TypeError('oh no')")
+
+        self.runner, _ = initialise_plugin(ParallelRunner(), '--processes', '2')
+        self.log = EventLog()
+
+    def because_we_run_the_folder(self):
+        contexts.run_with_plugins([ObjectSupplier(self.folder), self.runner, Importer(), NameBasedIdentifier(), self.log])
+
+    def it_should_report_each_module(self):
+        suites = {e[1] for e in self.log.events if e[0] == 'suite_started'}
+        assert suites == {'test_parallel_one', 'test_parallel_two'}
+
+    def it_should_report_each_class(self):
+        classes = {e[1] for e in self.log.events if e[0] == 'context_started'}
+        assert classes == {'WhenRunningInAWorker', 'WhenRunningInAnotherWorker'}
+
+    def it_should_report_the_passing_assertions(self):
+        assert self.log.events.count(('assertion_passed', 'it_should_pass')) == 2
+
+    def it_should_report_the_failure_as_an_assertion_error(self):
+        assert ('assertion_failed', 'it_should_fail', AssertionError) in self.log.events
+
+    def it_should_report_the_import_error(self):
+        assert ('unexpected_error', TypeError) in self.log.events
+
+    def it_should_report_each_module_in_one_piece(self):
+        suite_indices = [i for i, e in enumerate(self.log.events) if e[0] == 'suite_started']
+        for i in suite_indices:
+            assert self.log.events[i + 1][0] == 'context_started'
+
+    def it_should_not_import_the_modules_in_this_process(self):
+        assert 'test_parallel_one' not in sys.modules
+
+
+class WhenPreloadingModulesBeforeStartingTheWorkers(TemporaryFolderSharedContext):
+    def establish_that_the_tests_depend_on_a_slow_module(self):
+        self.imports_file = os.path.join(self.folder, 'imports.txt')
+        # each module writes down the process it was imported in
+        record_import = "import os\nwith open({!r}, 'a') as f: f.write('{{}} {{}}\\n'.format(__name__, os.getpid()))\n"
+        record_import = record_import.format(self.imports_file)
+        self.write_file('preload_heavy_dependency.py', record_import)
+        self.write_file('test_preload_one.py', record_import + """
+import preload_heavy_dependency
+class WhenRunningInAWorker:
+    def it_should_pass(self):
+        pass
+""")
+        self.write_file('test_preload_two.py', record_import + """
+import preload_heavy_dependency
+class WhenRunningInAnotherWorker:
+    def it_should_pass(self):
+        pass
+""")
+        self.write_file('test_preload_broken.py', "raise TypeError('oh no')")
+        sys.path.insert(0, self.folder)
+
+        self.runner, _ = initialise_plugin(ParallelRunner(), '--processes', '2', '--preload', 'preload_heavy_dependency', '--preload-tests')
+        self.log = EventLog()
+
+    def because_we_run_the_folder(self):
+        contexts.run_with_plugins([ObjectSupplier(self.folder), self.runner, Importer(), NameBasedIdentifier(), self.log])
+
+    def it_should_import_everything_once_in_this_process(self):
+        with open(self.imports_file) as f:
+            imports = sorted(f.read().splitlines())
+        pid = str(os.getpid())
+        assert imports == [
+            'preload_heavy_dependency ' + pid,
+            'test_preload_one ' + pid,
+            'test_preload_two ' + pid
+        ]
+
+    def it_should_still_run_the_tests_in_the_workers(self):
+        assert self.log.events.count(('assertion_passed', 'it_should_pass')) == 2
+
+    def it_should_still_report_the_import_error(self):
+        assert self.log.events.count(('unexpected_error', TypeError)) == 1
+
+    def cleanup_the_modules(self):
+        sys.path.remove(self.folder)
+        for name in ['preload_heavy_dependency', 'test_preload_one', 'test_preload_two']:
+            sys.modules.pop(name, None)
+
+
+class WhenAModuleToPreloadCannotBeImported(TemporaryFolderSharedContext):
+    def establish_that_the_module_does_not_exist(self):
+        self.write_file('test_preload_missing.py', "class WhenRunningInAWorker:\n    def it_should_pass(self):\n        pass\n")
+        self.runner, _ = initialise_plugin(ParallelRunner(), '--processes', '2', '--preload', 'a_module_which_does_not_exist')
+        self.log = EventLog()
+
+    def because_we_run_the_folder(self):
+        contexts.run_with_plugins([ObjectSupplier(self.folder), self.runner, Importer(), NameBasedIdentifier(), self.log])
+
+    def it_should_report_the_error(self):
+        assert ('unexpected_error', ModuleNotFoundError) in self.log.events
+
+    def it_should_still_run_the_tests(self):
+        assert ('assertion_passed', 'it_should_pass') in self.log.events
+
+
+class WhenReplayingAnEventWithOutput:
+    def establish_that_the_test_printed_something(self):
+        self.log = EventLog()
+        cls = type('WhenPrinting', (), {})
+        self.event = Event('context_started', (ClassReference(cls), ExampleReference(NO_EXAMPLE)), 'printed\n', '', 12345)
+        self.real_stdout = sys.stdout
+        sys.stdout = self.buffer = StringIO()
+
+    def because_we_replay_the_event(self):
+        self.event.replay(self.log)
+
+    def it_should_write_the_output_to_stdout_first(self):
+        assert self.buffer.getvalue() == 'printed\n'
+
+    def it_should_call_the_hook_with_a_class_of_the_same_name(self):
+        assert self.log.events == [('context_started', 'WhenPrinting')]
+
+    def it_should_tell_the_plugins_what_time_the_event_happened_at(self):
+        assert self.log.times == [12345]
+
+    def cleanup_stdout(self):
+        sys.stdout = self.real_stdout
+
+
+class WhenRestoringAnExceptionThatCannotBePickled:
+    def establish_that_the_exception_class_is_local(self):
+        class LocalError(Exception):
+            pass
+        try:
+            raise LocalError('oops')
+        except LocalError as e:
+            self.reference = ExceptionReference(e)
+
+    def because_we_restore_the_exception(self):
+        self.exception = self.reference.restore()
+
+    def it_should_have_the_same_name(self):
+        assert type(self.exception).__name__ == 'LocalError'
+
+    def it_should_have_the_same_message(self):
+        assert str(self.exception) == 'oops'
+
+    def it_should_not_be_an_assertion_error(self):
+        assert not isinstance(self.exception, AssertionError)
+
+    def it_should_be_caused_by_the_remote_traceback(self):
+        assert isinstance(self.exception.__cause__, RemoteTraceback)
+        assert "raise LocalError('oops')" in str(self.exception.__cause__)
+
+
+class WhenRestoringAnExampleThatCannotBePickled:
+    def establish_an_unpicklable_value(self):
+        self.reference = ExampleReference(lambda: None)
+
+    def because_we_restore_the_value(self):
+        self.example = self.reference.restore()
+
+    def it_should_have_the_same_str(self):
+        assert str(self.example).startswith('<function')
+
+
+class WhenRestoringNoExample:
+    def because_we_restore_the_marker(self):
+        self.example = ExampleReference(NO_EXAMPLE).restore()
+
+    def it_should_be_the_same_marker(self):
+        assert self.example is NO_EXAMPLE
@@ -0,0 +1,166 @@
+import json
+import os
+import pstats
+import sys
+from io import StringIO
+from contexts import catch, errors
+from contexts import plugin_discovery
+from contexts.plugins.event_loop import EventLoopProvider
+from contexts.plugins.importing.assertion_rewriting import AssertionRewritingImporter
+from contexts.plugins.parallel import ParallelRunner
+from contexts.plugins.profiling import StartupProfiler, Profiler, collapse_stacks
+from .tools import initialise_plugin, TemporaryFolderSharedContext
+
+
+class StartupProfilerSharedContext(TemporaryFolderSharedContext):
+    def establish_that_there_is_a_test_module(self):
+        self.json_path = os.path.join(self.folder, 'startup.json')
+        self.write_file('test_startup_profiler.py', "def test():\n    assert 1 == 1\n")
+
+    def make_plugin(self, *argv, plugins=()):
+        plugin, self.enabled = initialise_plugin(StartupProfiler(StringIO()), *argv, plugins=plugins)
+        return plugin
+
+    def read_report(self):
+        with open(self.json_path, 'r') as f:
+            return json.load(f)
+
+    def cleanup_the_module(self):
+        sys.modules.pop('test_startup_profiler', None)
+
+
+class WhenProfilingTheStartupOfATestRun(StartupProfilerSharedContext):
+    def establish_that_the_plugins_have_been_loaded(self):
+        plugin_discovery.load_timings.clear()
+        plugin_discovery.load_timings['plugin discovery'] = 0.5
+        self.importer = AssertionRewritingImporter()
+        self.plugin = self.make_plugin('--profile-startup', '--profile-startup-json', self.json_path, plugins=[self.importer])
+
+    def because_we_import_a_module_and_run_its_tests(self):
+        self.plugin.test_run_started()
+        self.importer.import_module(self.folder, 'test_startup_profiler')
+        self.plugin.process_module_list([])
+        self.plugin.test_class_started(object)
+        self.plugin.test_class_ended(object)
+        self.plugin.test_run_ended()
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_report_how_long_loading_the_plugins_took(self):
+        assert self.read_report()['phases']['plugin discovery'] == 0.5
+
+    def it_should_report_each_stage(self):
+        assert set(self.read_report()['phases']) >= {'filesystem discovery', 'import', 'assertion rewriting', 'class collection', 'execution'}
+
+    def it_should_report_how_long_the_module_took_to_import(self):
+        [record] = self.read_report()['imports']
+        assert record['module'] == 'test_startup_profiler'
+        assert record['seconds'] > 0
+
+    def it_should_report_how_long_assertion_rewriting_took(self):
+        [record] = self.read_report()['imports']
+        assert 0 < record['assertion_rewriting_seconds'] <= record['seconds']
+
+    def it_should_add_up_the_stages(self):
+        report = self.read_report()
+        stages = [seconds for phase, seconds in report['phases'].items() if phase != 'assertion rewriting']
+        assert abs(report['total'] - sum(stages)) < 1e-9
+
+    def it_should_print_the_report(self):
+        output = self.plugin.stream.getvalue()
+        assert "Startup profile:" in output
+        assert "test_startup_profiler" in output
+
+    def cleanup_the_timings(self):
+        plugin_discovery.load_timings.clear()
+
+
+class WhenStartupProfilingIsNotRequested(StartupProfilerSharedContext):
+    def because_we_initialise_the_plugin(self):
+        self.make_plugin()
+
+    def it_should_switch_itself_off(self):
+        assert not self.enabled
+
+
+class WhenProfilingTheStartupOfATestRunInWorkerProcesses:
+    def because_we_initialise_the_plugin_with_processes(self):
+        self.exception = catch(initialise_plugin, StartupProfiler(StringIO()), '--profile-startup', '--processes', '4',
+                               options_from=[ParallelRunner()])
+
+    def it_should_refuse(self):
+        assert isinstance(self.exception, errors.UsageError)
+        assert str(self.exception) == "--profile-startup can't be used with --processes"
+
+
+def spend_some_time():
+    return sum(i * i for i in range(10000))
+
+
+class WhenProfilingATestClass(TemporaryFolderSharedContext):
+    def establish_that_the_profiler_is_on(self):
+        self.prefix = os.path.join(self.folder, 'profile')
+        self.profiler, self.enabled = initialise_plugin(Profiler(), '--profile', '--profile-output', self.prefix)
+
+    def because_a_test_class_spends_some_time(self):
+        self.profiler.test_class_started(WhenProfilingATestClass)
+        spend_some_time()
+        self.profiler.test_class_ended(WhenProfilingATestClass)
+        self.profiler.test_run_ended()
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_write_the_stats(self):
+        stats = pstats.Stats(self.prefix + '.pstats')
+        assert any(name == 'spend_some_time' for _, _, name in stats.stats)
+
+    def it_should_write_the_stacks_under_the_name_of_the_class(self):
+        with open(self.prefix + '.collapsed', 'r') as f:
+            lines = f.read().splitlines()
+        assert lines
+        assert all(line.startswith(__name__ + '.WhenProfilingATestClass;') for line in lines)
+        assert any('spend_some_time (profiling_tests.py:' in line for line in lines)
+
+
+class WhenCollapsingTheStacks:
+    def establish_that_one_function_is_called_from_two_places(self):
+        # (calls, primitive calls, own time, cumulative time, {caller: (..., ..., own time, cumulative time)})
+        root = ('test.py', 1, 'root')
+        left = ('test.py', 2, 'left')
+        right = ('test.py', 3, 'right')
+        shared = ('test.py', 4, 'shared')
+        self.stats = {
+            root: (1, 1, 1.0, 10.0, {}),
+            left: (1, 1, 1.0, 5.0, {root: (1, 1, 1.0, 5.0)}),
+            right: (1, 1, 1.0, 4.0, {root: (1, 1, 1.0, 4.0)}),
+            shared: (2, 2, 7.0, 7.0, {left: (1, 1, 4.0, 4.0), right: (1, 1, 3.0, 3.0)}),
+        }
+
+    def because_we_collapse_them(self):
+        self.stacks = {';'.join(stack): us for stack, us in collapse_stacks(self.stats)}
+
+    def it_should_split_the_shared_function_between_its_callers(self):
+        assert self.stacks == {
+            'root (test.py:1)': 1000000,
+            'root (test.py:1);left (test.py:2)': 1000000,
+            'root (test.py:1);left (test.py:2);shared (test.py:4)': 4000000,
+            'root (test.py:1);right (test.py:3)': 1000000,
+            'root (test.py:1);right (test.py:3);shared (test.py:4)': 3000000,
+        }
+
+
+class WhenProfilingTestClassesWhichRunConcurrently:
+    @classmethod
+    def examples_of_arguments(cls):
+        yield ['--processes', '4']
+        yield ['--concurrency', '4']
+
+    def because_we_initialise_the_profiler(self, argv):
+        self.exception = catch(initialise_plugin, Profiler(), '--profile', *argv,
+                               options_from=[ParallelRunner(), EventLoopProvider()])
+
+    def it_should_refuse(self):
+        assert isinstance(self.exception, errors.UsageError)
+        assert str(self.exception) == "--profile can't be used with --processes or --concurrency"
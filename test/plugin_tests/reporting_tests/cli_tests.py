@@ -69,6 +69,29 @@ FAILED!
 """)
 
 
+class WhenPrintingFinalCountsForTheSecondOfTwoRuns:
+    def establish_that_the_first_run_failed(self):
+        self.stringio = StringIO()
+        self.reporter = cli.FinalCountsReporter(self.stringio)
+        self.reporter.test_run_started()
+        self.reporter.assertion_failed(lambda: None, Exception())
+        self.reporter.test_run_ended()
+        self.stringio.seek(0)
+        self.stringio.truncate()
+
+    def because_the_second_run_passes(self):
+        self.reporter.test_run_started()
+        self.reporter.context_started(type('', (), {}), '')
+        self.reporter.test_run_ended()
+
+    def it_should_only_count_the_second_run(self):
+        assert self.stringio.getvalue() == ("""\
+----------------------------------------------------------------------
+PASSED!
+1 context, 0 assertions
+""")
+
+
 class WhenPrintingFinalCountsAfterAnAssertionErrors:
     def establish_that_a_test_has_failed(self):
         self.stringio = StringIO()
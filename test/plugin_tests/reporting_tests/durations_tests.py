@@ -0,0 +1,138 @@
+import json
+import os
+from io import StringIO
+from unittest import mock
+from contexts import catch
+from contexts.core import EventBuffer
+from contexts.plugin_interface import NO_EXAMPLE
+from contexts.plugins.reporting.durations import DurationsReporter
+from ..tools import initialise_plugin, TemporaryFolderSharedContext
+
+
+class Fast:
+    pass
+
+
+class Slow:
+    pass
+
+
+def it_should_be_quick():
+    pass
+
+
+def run_context(reporter, cls, example, setup, action, assertion, teardown):
+    # each phase takes the given number of milliseconds on a fake clock
+    times = []
+    now = 0
+    for ms in [0, setup, action, assertion, 0, teardown]:
+        now += ms * 1000000
+        times.append(now)
+    with mock.patch('time.perf_counter_ns', side_effect=times):
+        reporter.context_started(cls, example)
+        reporter.action_started(cls, example)
+        reporter.assertion_started(it_should_be_quick)
+        reporter.assertion_passed(it_should_be_quick)
+        reporter.teardown_started(cls, example)
+        reporter.context_ended(cls, example)
+
+
+class WhenReportingTheSlowestContexts(TemporaryFolderSharedContext):
+    def establish_that_some_contexts_have_run(self):
+        self.json_path = os.path.join(self.folder, 'durations.json')
+        self.stringio = StringIO()
+        self.reporter, self.enabled = initialise_plugin(DurationsReporter(self.stringio), '--durations', '1', '--durations-json', self.json_path)
+        self.reporter.test_run_started()
+        run_context(self.reporter, Fast, NO_EXAMPLE, 1, 2, 3, 4)
+        run_context(self.reporter, Slow, 12, 10, 20, 30, 40)
+
+    def because_the_test_run_ends(self):
+        self.reporter.test_run_ended()
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_print_the_slowest_one_with_its_phases(self):
+        lines = self.stringio.getvalue().splitlines()
+        assert lines[1:4] == [
+            "Slowest contexts:",
+            "  100.0 ms {}.Slow -> 12".format(__name__),
+            "           setup 10.0 ms, action 20.0 ms, assertions 30.0 ms, teardown 40.0 ms",
+        ]
+
+    def it_should_print_the_slowest_assertion(self):
+        lines = self.stringio.getvalue().splitlines()
+        assert lines[4:] == [
+            "Slowest assertions:",
+            "   30.0 ms {}.Slow -> 12: it_should_be_quick".format(__name__),
+        ]
+
+    def it_should_write_all_of_them_to_the_json_file(self):
+        with open(self.json_path, 'r') as f:
+            contexts = json.load(f)['contexts']
+        assert contexts[0] == {
+            'name': '{}.Fast'.format(__name__),
+            'example': None,
+            'total_ns': 10000000,
+            'phases_ns': {'setup': 1000000, 'action': 2000000, 'assertions': 3000000, 'teardown': 4000000},
+            'assertions': [{'name': 'it_should_be_quick', 'total_ns': 3000000}]
+        }
+        assert contexts[1]['example'] == '12'
+
+
+class WhenTheSetupOfAContextErrors:
+    def establish_that_the_reporter_is_on(self):
+        self.reporter, _ = initialise_plugin(DurationsReporter(StringIO()), '--durations', '0')
+        self.reporter.test_run_started()
+
+    def because_the_setup_raises_an_exception(self):
+        with mock.patch('time.perf_counter_ns', side_effect=[0, 5000000, 6000000]):
+            self.reporter.context_started(Fast, NO_EXAMPLE)
+            self.reporter.teardown_started(Fast, NO_EXAMPLE)
+            self.reporter.context_errored(Fast, NO_EXAMPLE, Exception())
+
+    def it_should_count_the_time_towards_the_setup(self):
+        [(_, _, context)] = self.reporter.slowest_contexts
+        assert context.phases == {'setup': 5000000, 'action': 0, 'assertions': 0, 'teardown': 1000000}
+
+
+class WhenTheHooksArePassedOnAfterTheContextHasFinished:
+    def establish_that_a_concurrent_context_has_been_buffered(self):
+        self.reporter, _ = initialise_plugin(DurationsReporter(StringIO()), '--durations', '0')
+        self.reporter.test_run_started()
+        self.events = EventBuffer()
+        run_context(self.events, Fast, NO_EXAMPLE, 1, 2, 3, 4)
+
+    def because_the_hooks_are_replayed_much_later(self):
+        with mock.patch('time.perf_counter_ns', return_value=60000000000):
+            self.events.replay(self.reporter)
+
+    def it_should_time_the_test_and_not_the_replay(self):
+        [(_, _, context)] = self.reporter.slowest_contexts
+        assert context.total == 10000000
+        assert context.phases == {'setup': 1000000, 'action': 2000000, 'assertions': 3000000, 'teardown': 4000000}
+
+
+class WhenDurationsAreNotRequested:
+    def because_we_initialise_the_reporter(self):
+        self.reporter, self.enabled = initialise_plugin(DurationsReporter(StringIO()))
+
+    def it_should_switch_itself_off(self):
+        assert not self.enabled
+
+
+class WhenOnlySomeOfTheHooksArePassedOn:
+    def establish_that_the_reporter_is_on(self):
+        self.reporter, _ = initialise_plugin(DurationsReporter(StringIO()), '--durations', '0')
+        self.reporter.test_run_started()
+
+    def because_a_worker_process_runs_a_test(self):
+        # the worker swallows context_started, but not the hooks for the phases
+        self.exception = catch(self.reporter.action_started, Fast, NO_EXAMPLE)
+        self.reporter.teardown_started(Fast, NO_EXAMPLE)
+
+    def it_should_not_mind(self):
+        assert self.exception is None
+
+    def it_should_not_record_anything(self):
+        assert self.reporter.slowest_contexts == []
@@ -96,3 +96,17 @@ class WhenGettingExitCodeAfterAnUnexpectedError:
 
     def it_should_return_1(self):
         assert self.result == 1
+
+
+class WhenGettingExitCodeAfterAFailingRunIsFollowedByAPassingOne:
+    def establish_that_the_first_run_failed(self):
+        self.plugin = reporting.ExitCodeReporter()
+        self.plugin.test_run_started()
+        self.plugin.assertion_failed(lambda: None, Exception())
+
+    def because_the_tests_run_again_and_pass(self):
+        self.plugin.test_run_started()
+        self.result = self.plugin.get_exit_code()
+
+    def it_should_return_0(self):
+        assert self.result == 0
@@ -304,3 +304,62 @@ class When_an_assertion_errors(XmlOutputContext):
     @property
     def test(self):
         return self.suite.find('testcase')
+
+
+class When_a_context_ends_before_the_end_of_the_run(XmlOutputContext):
+
+    def because_a_ctx_ends(self):
+        ctx = tools.create_context('When_a_context_ends')
+        assertion = lambda: None
+        assertion.__name__ = 'it_should_be_written_straight_away'
+
+        self.xml.test_run_started()
+        self.xml.context_started(ctx.cls)
+        self.xml.assertion_started(assertion)
+        self.xml.assertion_passed(assertion)
+        self.xml.context_ended(ctx.cls)
+
+        with open(self.filename, 'rb') as f:
+            self.contents = f.read()
+
+    def it_should_have_written_the_suite_to_the_file(self):
+        assert(b'<testsuite name="When a context ends"' in self.contents)
+
+    def it_should_not_keep_the_results_in_memory(self):
+        assert(self.xml.ctx is None)
+
+    def cleanup_the_file(self):
+        self.xml.test_run_ended()
+
+
+class When_several_contexts_have_run(XmlOutputContext):
+
+    def because_several_contexts_run(self):
+        failing = lambda: None
+        failing.__name__ = 'it_should_be_counted_as_a_failure'
+        passing = lambda: None
+        passing.__name__ = 'it_should_be_counted_as_a_success'
+        exception = AssertionError("Gotcha")
+
+        self.xml.test_run_started()
+        for i in range(3):
+            ctx = tools.create_context('When_context_{}_runs'.format(i))
+            self.xml.context_started(ctx.cls)
+            self.xml.assertion_started(passing)
+            self.xml.assertion_passed(passing)
+            self.xml.assertion_started(failing)
+            self.xml.assertion_failed(failing, exception)
+            self.xml.context_ended(ctx.cls)
+        self.xml.test_run_ended()
+
+    def it_should_include_every_suite_in_the_output(self):
+        assert(len(self.test_suites.findall('testsuite')) == 3)
+
+    def the_suites_element_should_report_every_test(self):
+        assert(self.test_suites.get("tests") == "6")
+
+    def the_suites_element_should_report_every_failure(self):
+        assert(self.test_suites.get("failures") == "3")
+
+    def the_suites_element_should_report_zero_errors(self):
+        assert(self.test_suites.get("errors") == "0")
@@ -0,0 +1,164 @@
+import json
+import os
+import types
+from contexts.plugins.result_cache import ResultCache
+from .tools import initialise_plugin, TemporaryFolderSharedContext
+
+
+def make_module(name, *classes):
+    module = types.ModuleType(name)
+    for cls in classes:
+        cls.__module__ = name
+    return module
+
+
+def make_assertion(name):
+    f = lambda self: None
+    f.__name__ = name
+    return f
+
+
+class ResultCacheSharedContext(TemporaryFolderSharedContext):
+    def establish_that_there_is_a_cache_folder(self):
+        self.path = os.path.join(self.folder, 'results.json')
+
+    def write_results(self, modules, failures):
+        with open(self.path, 'w') as f:
+            json.dump({'modules': modules, 'failures': failures}, f)
+
+    def read_results(self):
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def make_plugin(self, *argv):
+        plugin, _ = initialise_plugin(ResultCache(), '--cache-dir', self.folder, *argv)
+        return plugin
+
+
+class WhenATestRunHasFailures(ResultCacheSharedContext):
+    def establish_that_some_tests_have_failed(self):
+        class WhenFailing:
+            pass
+
+        class WhenPassing:
+            pass
+        self.module = make_module('test_module', WhenFailing, WhenPassing)
+        self.plugin = self.make_plugin()
+        self.plugin.suite_started(self.module)
+        for cls in [WhenFailing, WhenPassing]:
+            self.plugin.test_class_started(cls)
+            self.plugin.context_started(cls, None)
+            if cls is WhenFailing:
+                self.plugin.assertion_failed(make_assertion('it_should_fail'), AssertionError())
+
+    def because_the_test_run_ends(self):
+        self.plugin.test_run_ended()
+
+    def it_should_remember_the_module(self):
+        assert self.read_results()['modules'] == ['test_module']
+
+    def it_should_remember_the_failing_assertion(self):
+        failures = self.read_results()['failures']
+        assert failures == {'test_module:WhenATestRunHasFailures.establish_that_some_tests_have_failed.<locals>.WhenFailing': ['it_should_fail']}
+
+
+class WhenATestThatFailedLastTimePasses(ResultCacheSharedContext):
+    def establish_that_two_classes_failed_last_time(self):
+        self.write_results(['test_module'], {'test_module:WhenFixed': ['it_should_work'], 'test_module:WhenNotRun': []})
+
+        self.cls = type('WhenFixed', (), {'__module__': 'test_module', '__qualname__': 'WhenFixed'})
+        self.plugin = self.make_plugin()
+        self.plugin.test_class_started(self.cls)
+        self.plugin.context_started(self.cls, None)
+
+    def because_the_test_run_ends(self):
+        self.plugin.test_run_ended()
+
+    def it_should_forget_about_the_class_that_passed(self):
+        assert 'test_module:WhenFixed' not in self.read_results()['failures']
+
+    def it_should_still_remember_the_class_that_did_not_run(self):
+        assert 'test_module:WhenNotRun' in self.read_results()['failures']
+
+
+class WhenRunningTheTestsThatFailedLastTime(ResultCacheSharedContext):
+    def establish_that_one_class_failed_last_time(self):
+        self.write_results(['test_failing', 'test_passing'], {'test_failing:WhenFailing': ['it_should_fail']})
+
+        self.failing = type('WhenFailing', (), {'__qualname__': 'WhenFailing'})
+        self.passing = type('WhenPassing', (), {'__qualname__': 'WhenPassing'})
+        self.failing_module = make_module('test_failing', self.failing, self.passing)
+        self.passing_module = make_module('test_passing')
+        self.new_module = make_module('test_new')
+
+        self.modules = [self.passing_module, self.failing_module, self.new_module]
+        self.classes = [self.passing, self.failing]
+        self.assertions = [make_assertion('it_should_pass'), make_assertion('it_should_fail')]
+
+        self.plugin = self.make_plugin('--last-failed')
+
+    def because_the_plugin_processes_the_lists(self):
+        self.plugin.process_module_list(self.modules)
+        self.plugin.process_class_list(self.failing_module, self.classes)
+        self.plugin.process_assertion_list(self.failing, self.assertions)
+
+    def it_should_only_run_the_failing_module_and_the_new_one(self):
+        assert self.modules == [self.failing_module, self.new_module]
+
+    def it_should_only_run_the_failing_class(self):
+        assert self.classes == [self.failing]
+
+    def it_should_run_the_failing_assertion_first(self):
+        assert [f.__name__ for f in self.assertions] == ['it_should_fail', 'it_should_pass']
+
+
+class WhenRunningTheTestsThatFailedLastTimeButNothingFailed(ResultCacheSharedContext):
+    def establish_that_nothing_failed_last_time(self):
+        self.write_results(['test_passing'], {})
+        self.module = make_module('test_passing')
+        self.modules = [self.module]
+        self.plugin = self.make_plugin('--last-failed')
+
+    def because_the_plugin_processes_the_module_list(self):
+        self.plugin.process_module_list(self.modules)
+
+    def it_should_run_everything(self):
+        assert self.modules == [self.module]
+
+
+class WhenRunningTheTestsThatFailedLastTimeFirst(ResultCacheSharedContext):
+    def establish_that_one_class_failed_last_time(self):
+        self.write_results(['test_failing', 'test_passing'], {'test_failing:WhenFailing': []})
+
+        self.failing = type('WhenFailing', (), {'__qualname__': 'WhenFailing'})
+        self.passing = type('WhenPassing', (), {'__qualname__': 'WhenPassing'})
+        self.failing_module = make_module('test_failing', self.failing, self.passing)
+        self.passing_module = make_module('test_passing')
+
+        self.modules = [self.passing_module, self.failing_module]
+        self.classes = [self.passing, self.failing]
+
+        self.plugin = self.make_plugin('--failed-first')
+
+    def because_the_plugin_processes_the_lists(self):
+        self.plugin.process_module_list(self.modules)
+        self.plugin.process_class_list(self.failing_module, self.classes)
+
+    def it_should_run_the_failing_module_first(self):
+        assert self.modules == [self.failing_module, self.passing_module]
+
+    def it_should_run_the_failing_class_first(self):
+        assert self.classes == [self.failing, self.passing]
+
+
+class WhenTheResultsFileIsCorrupt(ResultCacheSharedContext):
+    def establish_that_the_file_is_not_json(self):
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+
+    def because_we_initialise_the_plugin(self):
+        self.plugin = self.make_plugin('--last-failed')
+
+    def it_should_act_as_if_nothing_has_been_run(self):
+        assert self.plugin.previous_failures == {}
+        assert self.plugin.previous_modules == set()
@@ -0,0 +1,80 @@
+import argparse
+import itertools
+from contexts import catch, errors
+from contexts.plugins.sampling import ExampleSampler, parse_example_count
+from .tools import initialise_plugin
+
+
+class WhenLimitingTheNumberOfExamples:
+    def establish_that_the_cases_never_end(self):
+        self.sampler, self.enabled = initialise_plugin(ExampleSampler(), '--max-examples', '5')
+        self.examples = itertools.count()
+
+    def because_we_process_the_cases(self):
+        self.result = list(self.sampler.process_examples(None, self.examples))
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_take_the_first_ones(self):
+        assert self.result == [0, 1, 2, 3, 4]
+
+    def it_should_not_read_any_more_of_them(self):
+        assert next(self.examples) == 5
+
+
+class WhenSamplingExamplesAtRandom:
+    def establish_that_there_are_lots_of_cases(self):
+        self.sampler, _ = initialise_plugin(ExampleSampler(), '--max-examples', '5', '--random-examples')
+
+    def because_we_process_the_cases(self):
+        self.result = list(self.sampler.process_examples(None, iter(range(100000))))
+
+    def it_should_pick_the_right_number_of_them(self):
+        assert len(set(self.result)) == 5
+
+    def it_should_pick_from_all_of_them(self):
+        assert self.result != [0, 1, 2, 3, 4]
+        assert all(0 <= e < 100000 for e in self.result)
+
+
+class WhenSamplingFromFewerExamplesThanTheMaximum:
+    def establish_that_there_are_not_many_cases(self):
+        self.sampler, _ = initialise_plugin(ExampleSampler(), '--max-examples', '5', '--random-examples')
+
+    def because_we_process_the_cases(self):
+        self.result = list(self.sampler.process_examples(None, iter([1, 2])))
+
+    def it_should_use_all_of_them(self):
+        assert sorted(self.result) == [1, 2]
+
+
+class WhenTheNumberOfExamplesIsNotLimited:
+    def because_we_initialise_the_plugin(self):
+        self.sampler, self.enabled = initialise_plugin(ExampleSampler())
+
+    def it_should_switch_itself_off(self):
+        assert not self.enabled
+
+
+class WhenAskingForRandomExamplesWithoutAMaximum:
+    def because_we_initialise_the_plugin(self):
+        self.exception = catch(initialise_plugin, ExampleSampler(), '--random-examples')
+
+    def it_should_refuse(self):
+        assert isinstance(self.exception, errors.UsageError)
+        assert str(self.exception) == "--random-examples can only be used with --max-examples"
+
+
+class WhenTheMaximumNumberOfExamplesIsNotACount:
+    @classmethod
+    def examples(cls):
+        yield '-1'
+        yield 'five'
+        yield '2.5'
+
+    def because_we_parse_the_maximum(self, value):
+        self.exception = catch(parse_example_count, value)
+
+    def it_should_refuse(self, value):
+        assert isinstance(self.exception, argparse.ArgumentTypeError)
@@ -0,0 +1,21 @@
+from contexts.plugins.scanning import FolderScanner
+from .tools import initialise_plugin
+
+
+class WhenAskingForThreads:
+    def because_we_initialise_the_plugin(self):
+        self.scanner, self.enabled = initialise_plugin(FolderScanner(), '--discovery-threads', '4')
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_supply_the_number_of_threads(self):
+        assert self.scanner.get_discovery_threads() == 4
+
+
+class WhenThreadsAreNotAskedFor:
+    def because_we_initialise_the_plugin(self):
+        self.scanner, self.enabled = initialise_plugin(FolderScanner())
+
+    def it_should_switch_itself_off(self):
+        assert not self.enabled
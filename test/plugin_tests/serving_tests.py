@@ -0,0 +1,56 @@
+import argparse
+import sys
+from io import StringIO
+from contexts.plugins.serving import ServerOptions, parse_server_options
+from .tools import initialise_plugin
+
+
+class WhenAskingForTheHelp:
+    def establish_that_the_plugin_has_set_up_the_parser(self):
+        self.parser = argparse.ArgumentParser()
+        ServerOptions().setup_parser(self.parser)
+
+    def because_we_format_the_help(self):
+        self.help = self.parser.format_help()
+
+    def it_should_list_the_options(self):
+        assert '--serve' in self.help
+        assert '--client' in self.help
+
+
+class WhenRunningTheTestsAsUsual:
+    def because_we_initialise_the_plugin(self):
+        self.plugin, self.enabled = initialise_plugin(ServerOptions())
+
+    def it_should_switch_itself_off(self):
+        assert not self.enabled
+
+
+class WhenPickingOutTheClientOption:
+    def because_we_parse_the_command_line(self):
+        self.options, self.rest = parse_server_options(['--xml', 'results.xml', '--client', 'test_folder'])
+
+    def it_should_ask_for_the_client(self):
+        assert self.options.client
+        assert not self.options.serve
+
+    def it_should_leave_the_rest_of_the_command_line_for_the_server(self):
+        assert self.rest == ['--xml', 'results.xml', 'test_folder']
+
+
+class WhenAskingToServeAndBeAClientAtOnce:
+    def establish_that_stderr_is_redirected(self):
+        self.real_stderr = sys.stderr
+        sys.stderr = StringIO()
+
+    def because_we_parse_the_command_line(self):
+        try:
+            parse_server_options(['--serve', '--client'])
+        except SystemExit as e:
+            self.exit_code = e.code
+
+    def it_should_exit_with_a_usage_error(self):
+        assert self.exit_code == 2
+
+    def cleanup_stderr(self):
+        sys.stderr = self.real_stderr
@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import sys
+import types
+import contexts
+from contexts.plugins.identification import NameBasedIdentifier
+from contexts.plugins.importing import Importer
+from contexts.plugins.sharding import Sharder, parse_shard
+from contexts.plugins.test_target_suppliers import ObjectSupplier
+from .tools import initialise_plugin, TemporaryFolderSharedContext
+
+
+def make_specs(*names):
+    return [('/tests', name) for name in names]
+
+
+class WhenNotSharding:
+    def because_we_initialise_the_plugin(self):
+        _, self.enabled = initialise_plugin(Sharder())
+
+    def it_should_be_switched_off(self):
+        assert not self.enabled
+
+
+class WhenSplittingModulesBetweenShards:
+    def establish_that_there_are_some_test_modules(self):
+        self.names = ['test_{}'.format(i) for i in range(10)]
+
+    def because_each_shard_picks_its_modules(self):
+        self.shards = []
+        for index in range(1, 4):
+            sharder, _ = initialise_plugin(Sharder(), '--shard', '{}/3'.format(index))
+            specs = make_specs(*self.names)
+            sharder.process_module_specs(specs)
+            self.shards.append([name for _, name in specs])
+
+    def it_should_run_every_module_once(self):
+        assert sorted(name for shard in self.shards for name in shard) == self.names
+
+    def it_should_give_each_shard_the_same_number_of_modules(self):
+        assert sorted(len(shard) for shard in self.shards) == [3, 3, 4]
+
+    def it_should_keep_the_modules_in_order(self):
+        for shard in self.shards:
+            assert shard == sorted(shard, key=self.names.index)
+
+
+class WhenBalancingShardsByHowLongTheyTookLastTime(TemporaryFolderSharedContext):
+    def establish_that_one_module_is_much_slower_than_the_others(self):
+        self.timings = os.path.join(self.folder, 'durations.json')
+        contexts_json = [
+            {'name': 'test_slow.WhenDoingSomethingSlow', 'example': None, 'total_ns': 300},
+            {'name': 'test_quick_1.WhenDoingSomethingQuick', 'example': None, 'total_ns': 10},
+            {'name': 'test_quick_1.WhenDoingSomethingQuick', 'example': None, 'total_ns': 10},
+            {'name': 'test_quick_2.WhenDoingSomethingQuick', 'example': None, 'total_ns': 20},
+            {'name': 'pkg.WhenInThePackage', 'example': None, 'total_ns': 5},
+            {'name': 'test_gone.WhenDeleted', 'example': None, 'total_ns': 1000},
+        ]
+        with open(self.timings, 'w') as f:
+            json.dump({'contexts': contexts_json}, f)
+        self.names = ['pkg', 'pkg.test_new', 'test_quick_1', 'test_quick_2', 'test_slow']
+
+    def because_each_shard_picks_its_modules(self):
+        self.shards = []
+        for index in range(1, 3):
+            sharder, _ = initialise_plugin(Sharder(), '--shard', '{}/2'.format(index), '--shard-timings', self.timings)
+            specs = make_specs(*self.names)
+            sharder.process_module_specs(specs)
+            self.shards.append([name for _, name in specs])
+
+    def it_should_give_the_slow_module_a_shard_to_itself(self):
+        assert self.shards[0] == ['test_slow']
+
+    def it_should_give_the_rest_to_the_other_shard(self):
+        assert self.shards[1] == ['pkg', 'pkg.test_new', 'test_quick_1', 'test_quick_2']
+
+
+class WhenSplittingTheClassesOfAModuleBetweenShards:
+    def establish_that_a_module_has_some_test_classes(self):
+        self.module = types.ModuleType('test_sharded_classes')
+        self.classes = [
+            type('When{}'.format(i), (), {'__module__': self.module.__name__}) for i in range(5)
+        ]
+
+    def because_each_shard_picks_its_classes(self):
+        self.shards = []
+        for index in range(1, 3):
+            sharder, _ = initialise_plugin(Sharder(), '--shard', '{}/2'.format(index), '--shard-by', 'class')
+            classes = list(self.classes)
+            sharder.process_class_list(self.module, classes)
+            self.shards.append(classes)
+
+    def it_should_run_every_class_once(self):
+        assert sorted(self.shards[0] + self.shards[1], key=self.classes.index) == self.classes
+
+    def it_should_give_each_shard_about_the_same_number(self):
+        assert sorted(len(shard) for shard in self.shards) == [2, 3]
+
+
+class WhenShardingByClassInsteadOfModule:
+    def establish_that_the_sharder_splits_classes(self):
+        self.sharder, _ = initialise_plugin(Sharder(), '--shard', '2/2', '--shard-by', 'class')
+        self.specs = make_specs('test_one', 'test_two')
+
+    def because_the_modules_are_found(self):
+        self.sharder.process_module_specs(self.specs)
+
+    def it_should_not_leave_any_modules_out(self):
+        assert self.specs == make_specs('test_one', 'test_two')
+
+
+class WhenAShardIsOutOfRange:
+    @classmethod
+    def examples(cls):
+        yield '0/2'
+        yield '3/2'
+        yield 'two/four'
+        yield '2'
+
+    def because_we_parse_the_shard(self, shard):
+        self.exception = contexts.catch(parse_shard, shard)
+
+    def it_should_refuse(self, shard):
+        assert isinstance(self.exception, argparse.ArgumentTypeError)
+
+
+class WhenRunningOneShardOfAFolder(TemporaryFolderSharedContext):
+    def establish_that_there_is_a_folder_of_test_modules(self):
+        for name in ['test_shard_one', 'test_shard_two']:
+            self.write_file(name + '.py', "class WhenRunning:\n    def it_should_pass(self):\n        pass\n")
+        self.sharder, _ = initialise_plugin(Sharder(), '--shard', '1/2')
+        self.log = SuiteLog()
+
+    def because_we_run_the_folder(self):
+        contexts.run_with_plugins([ObjectSupplier(self.folder), self.sharder, Importer(), NameBasedIdentifier(), self.log])
+
+    def it_should_run_one_of_the_modules(self):
+        assert self.log.suites == ['test_shard_one']
+
+    def it_should_not_import_the_other(self):
+        assert 'test_shard_two' not in sys.modules
+
+    def cleanup_the_module(self):
+        sys.modules.pop('test_shard_one', None)
+
+
+class WhenShardingATreeOfPackages(TemporaryFolderSharedContext):
+    def establish_that_there_are_test_modules_in_nested_packages(self):
+        source = "class WhenRunning:\n    def it_should_pass(self):\n        pass\n"
+        self.write_file('test_top_level.py', source)
+        self.write_file(os.path.join('shard_tests', '__init__.py'), '')
+        self.write_file(os.path.join('shard_tests', 'inner_tests', '__init__.py'), '')
+        self.write_file(os.path.join('shard_tests', 'inner_tests', 'tools.py'), '')
+        # like most test packages, the tests use some helpers from their package
+        source = "from . import tools\n" + source
+        outer_source = source.replace('from . import', 'from .inner_tests import')
+        for i in range(3):
+            self.write_file(os.path.join('shard_tests', 'test_outer_{}.py'.format(i)), outer_source)
+            self.write_file(os.path.join('shard_tests', 'inner_tests', 'test_inner_{}.py'.format(i)), source)
+
+    def because_we_run_the_whole_tree_and_each_shard(self):
+        self.full_run = self.run_tree()
+        self.shards = [self.run_tree('--shard', '{}/3'.format(i)) for i in range(1, 4)]
+
+    def it_should_run_every_test_on_exactly_one_shard(self):
+        all_sharded = [name for shard in self.shards for name in shard.classes]
+        assert sorted(all_sharded) == sorted(self.full_run.classes)
+        assert len(self.full_run.classes) == 7
+
+    def it_should_not_have_any_errors(self):
+        assert [log.errors for log in self.shards] == [[], [], []]
+
+    def cleanup_the_modules(self):
+        self.forget_modules()
+
+    def run_tree(self, *argv):
+        self.forget_modules()
+        sharder, enabled = initialise_plugin(Sharder(), *argv)
+        log = SuiteLog()
+        plugins = [ObjectSupplier(self.folder), Importer(), NameBasedIdentifier(), log]
+        if enabled:
+            plugins.insert(1, sharder)
+        contexts.run_with_plugins(plugins)
+        return log
+
+    def forget_modules(self):
+        for name in list(sys.modules):
+            if name == 'test_top_level' or name.startswith('shard_tests'):
+                del sys.modules[name]
+
+
+class SuiteLog(object):
+    def __init__(self):
+        self.suites = []
+        self.classes = []
+        self.errors = []
+
+    def initialise(self, args, env):
+        return True
+
+    def suite_started(self, module):
+        self.suites.append(module.__name__)
+
+    def context_started(self, cls, example):
+        self.classes.append(cls.__module__)
+
+    def unexpected_error(self, exception):
+        self.errors.append(exception)
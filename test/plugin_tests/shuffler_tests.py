@@ -1,4 +1,5 @@
-from contexts.plugins.shuffling import Shuffler
+import itertools
+from contexts.plugins.shuffling import Shuffler, EXAMPLE_WINDOW
 from contexts import action
 
 
@@ -44,3 +45,36 @@ class WhenProcessingAnAssertionListAndShuffleIsTrue(ShufflerSharedContext):
 
     def it_should_not_change_the_contents_of_the_list(self):
         assert set(self.list) == set(self.original_list)
+
+
+class WhenProcessingExamplesAndShuffleIsTrue(ShufflerSharedContext):
+    @action
+    def because_we_ask_it_to_process_the_cases(self):
+        self.result = list(self.shuffler.process_examples(None, iter(self.list)))
+
+    def it_should_shuffle_them(self):
+        assert self.result != self.original_list
+
+    def it_should_not_change_the_cases(self):
+        assert sorted(self.result) == self.original_list
+
+
+class WhenProcessingMoreExamplesThanFitInMemory(ShufflerSharedContext):
+    def establish_that_the_cases_never_end(self):
+        self.generated = 0
+
+        def generate():
+            for i in itertools.count():
+                self.generated = i + 1
+                yield i
+        self.examples = generate()
+
+    @action
+    def because_we_take_the_first_few_shuffled_cases(self):
+        self.result = list(itertools.islice(self.shuffler.process_examples(None, self.examples), 10))
+
+    def it_should_not_read_every_case(self):
+        assert self.generated <= EXAMPLE_WINDOW + 10
+
+    def it_should_shuffle_them(self):
+        assert self.result != list(range(10))
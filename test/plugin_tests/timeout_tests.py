@@ -0,0 +1,60 @@
+from contexts.plugins.timeouts import TimeLimiter, timeout
+from .tools import initialise_plugin
+
+
+class WhenSettingATimeLimitOnTheCommandLine:
+    def establish_a_test_class(self):
+        class Spec:
+            pass
+        self.spec = Spec
+        self.limiter, self.enabled = initialise_plugin(TimeLimiter(), '--timeout', '2.5')
+
+    def because_the_limiter_is_asked_for_the_time_limit(self):
+        self.result = self.limiter.get_timeout(self.spec)
+
+    def it_should_be_switched_on(self):
+        assert self.enabled
+
+    def it_should_give_the_time_limit(self):
+        assert self.result == 2.5
+
+
+class WhenATestClassOverridesTheTimeLimit:
+    def establish_decorated_test_classes(self):
+        @timeout(30)
+        class SlowSpec:
+            pass
+
+        class SlowSubclass(SlowSpec):
+            pass
+
+        @timeout(None)
+        class UnlimitedSpec:
+            pass
+        self.subclass = SlowSubclass
+        self.unlimited = UnlimitedSpec
+        self.limiter, _ = initialise_plugin(TimeLimiter(), '--timeout', '1')
+
+    def because_the_limiter_is_asked_for_the_time_limits(self):
+        self.subclass_result = self.limiter.get_timeout(self.subclass)
+        self.unlimited_result = self.limiter.get_timeout(self.unlimited)
+
+    def it_should_apply_the_decorator_to_subclasses(self):
+        assert self.subclass_result == 30
+
+    def it_should_let_the_class_switch_the_limit_off(self):
+        assert self.unlimited_result is None
+
+
+class WhenThereIsNoTimeLimit:
+    def establish_a_test_class(self):
+        class Spec:
+            pass
+        self.spec = Spec
+        self.limiter, _ = initialise_plugin(TimeLimiter())
+
+    def because_the_limiter_is_asked_for_the_time_limit(self):
+        self.result = self.limiter.get_timeout(self.spec)
+
+    def it_should_not_set_one(self):
+        assert self.result is None
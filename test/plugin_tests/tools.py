@@ -1,5 +1,8 @@
 import argparse
 import collections
+import os
+import shutil
+import tempfile
 from contexts.plugin_interface import NO_EXAMPLE
 
 
@@ -96,3 +99,44 @@ def create_context(name='context', example=NO_EXAMPLE):
 class ExceptionThrowingArgumentParser(argparse.ArgumentParser):
     def error(self, message):
         raise Exception(message)
+
+
+def initialise_plugin(plugin, *argv, plugins=(), options_from=()):
+    """
+    Set a plugin up the way the test runner would: parse `argv` with its options
+    (and those of the plugins in `options_from`), initialise it,
+    and give it whichever of `plugins` it asks for.
+    """
+    parser = argparse.ArgumentParser()
+    for p in (plugin,) + tuple(options_from):
+        p.setup_parser(parser)
+    enabled = plugin.initialise(parser.parse_args(list(argv)), {})
+    if hasattr(plugin, 'request_plugins'):
+        send_plugins(plugin, plugins)
+    return plugin, enabled
+
+
+def send_plugins(plugin, plugins):
+    requests = plugin.request_plugins()
+    if requests is None:
+        return
+    requested = next(requests)
+    try:
+        requests.send({cls: p for cls in requested for p in plugins if isinstance(p, cls)})
+    except StopIteration:
+        pass
+
+
+class TemporaryFolderSharedContext:
+    def establish_that_there_is_a_temporary_folder(self):
+        self.folder = os.path.realpath(tempfile.mkdtemp())
+
+    def write_file(self, name, source):
+        path = os.path.join(self.folder, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(source)
+        return path
+
+    def cleanup_the_temporary_folder(self):
+        shutil.rmtree(self.folder)
@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import sys
+from xml.etree import ElementTree
+from contexts import core
+from contexts.plugins.dependencies import DependencyTracker
+from contexts.plugins.identification import NameBasedIdentifier
+from contexts.plugins.importing import Importer
+from contexts.plugins.reporting.xml import XmlReporter
+from contexts.plugins.result_cache import ResultCache
+from contexts.plugins.test_target_suppliers import ObjectSupplier
+from contexts.plugins.watching import Watcher
+from .tools import send_plugins, TemporaryFolderSharedContext
+
+
+class WhenAFileChangesWhileWatching(TemporaryFolderSharedContext):
+    def establish_that_the_tests_have_run_once(self):
+        self.log_file = os.path.join(self.folder, 'log.txt')
+        self.write_file('watched_source.py', "VALUE = 1\n")
+        self.write_file('test_watch_uses_source.py', """
+from watched_source import VALUE
+class WhenUsingTheSource:
+    def it_should_run(self):
+        with open({!r}, 'a') as f:
+            f.write('uses source {{}}\\n'.format(VALUE))
+""".format(self.log_file))
+        self.write_file('test_watch_independent.py', """
+class WhenNotUsingTheSource:
+    def it_should_run(self):
+        with open({!r}, 'a') as f:
+            f.write('independent\\n')
+""".format(self.log_file))
+        sys.path.insert(0, self.folder)
+
+        args = argparse.Namespace(cache_dir=self.folder, only_changed=False, changed_files=None, watch=True)
+        importer = Importer()
+        self.tracker = DependencyTracker()
+        self.tracker.initialise(args, {})
+        send_plugins(self.tracker, [importer])
+        self.watcher = Watcher()
+        self.watcher.initialise(args, {})
+        self.watcher.interval = 0.01
+        send_plugins(self.watcher, [self.tracker])
+
+        self.composite = core.PluginComposite([
+            ObjectSupplier(self.folder), self.tracker, self.watcher, importer, NameBasedIdentifier()
+        ])
+        core.TestRun(self.folder, self.composite).run()
+
+        self.write_file('watched_source.py', "VALUE = 2\n")
+        # make sure the modification time moves on, however coarse the file system's clock is
+        mtime = os.stat(self.log_file).st_mtime_ns + 10**9
+        os.utime(os.path.join(self.folder, 'watched_source.py'), ns=(mtime, mtime))
+
+    def because_the_watcher_notices_and_the_tests_run_again(self):
+        self.run_again = self.watcher.wait_to_run_again()
+        core.TestRun(self.folder, self.composite).run()
+
+    def it_should_ask_for_the_tests_to_run_again(self):
+        assert self.run_again is True
+
+    def it_should_only_run_the_affected_tests_again_with_the_new_code(self):
+        with open(self.log_file) as f:
+            log = sorted(f.read().splitlines())
+        assert log == ['independent', 'uses source 1', 'uses source 2']
+
+    def cleanup_the_modules(self):
+        sys.path.remove(self.folder)
+        for name in ['watched_source', 'test_watch_uses_source', 'test_watch_independent']:
+            sys.modules.pop(name, None)
+
+
+class WhenATestIsFixedWhileWatching(TemporaryFolderSharedContext):
+    def establish_that_a_failing_test_has_been_run_and_fixed(self):
+        self.test_file = os.path.join(self.folder, 'test_watch_fixed.py')
+        self.xml_path = os.path.join(self.folder, 'results.xml')
+        self.write_test("assert False")
+
+        args = argparse.Namespace(cache_dir=self.folder, only_changed=False, changed_files=None, watch=True,
+                                  xml_path=self.xml_path, last_failed=False, failed_first=False)
+        importer = Importer()
+        self.result_cache = ResultCache()
+        self.result_cache.initialise(args, {})
+        self.xml = XmlReporter()
+        self.xml.initialise(args, {})
+        tracker = DependencyTracker()
+        tracker.initialise(args, {})
+        send_plugins(tracker, [importer, self.result_cache])
+        self.watcher = Watcher()
+        self.watcher.initialise(args, {})
+        self.watcher.interval = 0.01
+        send_plugins(self.watcher, [tracker])
+
+        self.composite = core.PluginComposite([
+            ObjectSupplier(self.folder), tracker, self.result_cache, self.watcher, importer, NameBasedIdentifier(), self.xml
+        ])
+        core.TestRun(self.folder, self.composite).run()
+
+        self.write_test("pass")
+        mtime = os.stat(self.xml_path).st_mtime_ns + 10**9
+        os.utime(self.test_file, ns=(mtime, mtime))
+
+    def because_the_tests_run_again(self):
+        self.watcher.wait_to_run_again()
+        core.TestRun(self.folder, self.composite).run()
+
+    def it_should_write_a_fresh_xml_report(self):
+        root = ElementTree.parse(self.xml_path).getroot()
+        assert (root.get('tests'), root.get('failures')) == ('1', '0')
+
+    def it_should_forget_that_the_test_failed(self):
+        assert self.result_cache.previous_failures == {}
+        with open(os.path.join(self.folder, 'results.json')) as f:
+            assert json.load(f)['failures'] == {}
+
+    def cleanup_the_module(self):
+        sys.modules.pop('test_watch_fixed', None)
+
+    def write_test(self, body):
+        self.write_file('test_watch_fixed.py', "class WhenFixingATest:\n    def it_should_pass(self):\n        {}\n".format(body))
+
+
+class WhenStoppingWatching:
+    def establish_that_the_watcher_is_waiting(self):
+        self.watcher = Watcher()
+        self.watcher.initialise(argparse.Namespace(watch=True), {})
+
+        def interrupt():
+            raise KeyboardInterrupt
+        self.watcher.wait_for_changes = interrupt
+
+    def because_the_user_presses_ctrl_c(self):
+        self.result = self.watcher.wait_to_run_again()
+
+    def it_should_let_the_test_runner_exit(self):
+        assert self.result is False